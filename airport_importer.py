@@ -0,0 +1,227 @@
+"""Bulk import of a worldwide airport list (OurAirports airports.csv layout) into the airport table.
+
+Usage: python airport_importer.py airports.csv [--countries countries.csv] [--batch-size 1000]
+                                               [--types large_airport,medium_airport] [--restart]
+
+Rows are streamed, validated and deduplicated by ICAO and IATA code, then written in executemany
+batches, one transaction per batch. A checkpoint file next to the CSV records the last committed
+line, so a failed or interrupted import continues where it stopped when run again.
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from models import DatabaseConnection
+from text_utils import fold_name
+
+CONTINENTS = {'EU', 'NA', 'AS', 'AF', 'SA', 'OC', 'AN'}
+DEFAULT_TYPES = ('large_airport', 'medium_airport')
+ICAO_PATTERN = re.compile(r'^[A-Z0-9]{4}$')
+IATA_PATTERN = re.compile(r'^[A-Z]{3}$')
+
+INSERT_AIRPORT = """INSERT INTO airport (icao_code, iata_code, name, city, country_code,
+                                         latitude, longitude, elevation_ft, continent, is_major_hub, name_folded)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+INSERT_COUNTRY = """INSERT IGNORE INTO country (code, name, continent, name_folded) VALUES (%s, %s, %s, %s)"""
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    skipped: Counter = field(default_factory=Counter)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def rows_per_second(self) -> float:
+        elapsed = time.perf_counter() - self.started_at
+        return self.read / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        lines = [f"read {self.read} rows, inserted {self.inserted}, {self.rows_per_second():.0f} rows/s"]
+        for reason, count in self.skipped.most_common():
+            lines.append(f"  skipped {count:>7} {reason}")
+        return "\n".join(lines)
+
+
+class Checkpoint:
+    """Last committed CSV line, tied to the size and mtime of the source file"""
+
+    def __init__(self, source_path: str):
+        self.source_path = os.path.abspath(source_path)
+        self.path = self.source_path + '.import-checkpoint.json'
+        stat = os.stat(self.source_path)
+        self.source_id = {'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+    def load(self) -> int:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return 0
+        if data.get('source') != self.source_id:
+            return 0
+        return int(data.get('line', 0))
+
+    def save(self, line: int):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'source': self.source_id, 'line': line}, f)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def read_countries_csv(path: str) -> Iterator[tuple[str, str, str, str]]:
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            code = (row.get('code') or '').strip().upper()
+            name = (row.get('name') or '').strip()
+            continent = (row.get('continent') or '').strip().upper()
+            if len(code) == 2 and name and continent in CONTINENTS:
+                yield code, name[:100], continent, fold_name(name[:100])
+
+
+class AirportImporter:
+    def __init__(self, db: DatabaseConnection, batch_size: int = 1000, types: tuple[str, ...] = DEFAULT_TYPES):
+        self.db = db
+        self.batch_size = batch_size
+        self.types = set(types)
+        self.country_continents: dict[str, str] = {}
+        self.seen_icao: set[str] = set()
+        self.seen_iata: set[str] = set()
+        self.stats = ImportStats()
+
+    def load_existing(self):
+        countries = self.db.execute_query("SELECT code, continent FROM country") or []
+        self.country_continents = {row['code']: row['continent'] for row in countries}
+        airports = self.db.execute_query("SELECT icao_code, iata_code FROM airport") or []
+        self.seen_icao = {row['icao_code'] for row in airports}
+        self.seen_iata = {row['iata_code'] for row in airports}
+
+    def import_countries(self, path: str) -> int:
+        rows = list(read_countries_csv(path))
+        written = 0
+        for start in range(0, len(rows), self.batch_size):
+            written += self.db.execute_batch(INSERT_COUNTRY, rows[start:start + self.batch_size])
+        return written
+
+    def validate(self, row: dict) -> tuple[Optional[tuple], Optional[str]]:
+        """Returns (insert parameters, None) for a usable row or (None, skip reason)"""
+        if row.get('type') not in self.types:
+            return None, 'airport type not imported'
+
+        icao = (row.get('icao_code') or row.get('gps_code') or row.get('ident') or '').strip().upper()
+        iata = (row.get('iata_code') or '').strip().upper()
+        if not ICAO_PATTERN.match(icao):
+            return None, 'missing or invalid ICAO code'
+        if not IATA_PATTERN.match(iata):
+            return None, 'missing or invalid IATA code'
+        if icao in self.seen_icao:
+            return None, 'duplicate ICAO code'
+        if iata in self.seen_iata:
+            return None, 'duplicate IATA code'
+
+        name = (row.get('name') or '').strip()
+        city = (row.get('municipality') or '').strip()
+        if not name or not city:
+            return None, 'missing name or city'
+
+        try:
+            latitude = float(row.get('latitude_deg') or '')
+            longitude = float(row.get('longitude_deg') or '')
+        except ValueError:
+            return None, 'invalid coordinates'
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            return None, 'invalid coordinates'
+
+        country_code = (row.get('iso_country') or '').strip().upper()
+        country_continent = self.country_continents.get(country_code)
+        if not country_continent:
+            return None, 'unknown country'
+        continent = (row.get('continent') or '').strip().upper()
+        if continent not in CONTINENTS:
+            continent = country_continent
+
+        elevation = row.get('elevation_ft') or ''
+        elevation_ft = int(float(elevation)) if re.match(r'^-?\d+(\.\d+)?$', elevation) else None
+
+        self.seen_icao.add(icao)
+        self.seen_iata.add(iata)
+        return (icao, iata, name[:150], city[:100], country_code, round(latitude, 7), round(longitude, 7),
+                elevation_ft, continent, row.get('type') == 'large_airport', fold_name(name[:150])), None
+
+    def run(self, csv_path: str, restart: bool = False) -> bool:
+        checkpoint = Checkpoint(csv_path)
+        if restart:
+            checkpoint.clear()
+        resume_line = checkpoint.load()
+        if resume_line:
+            print(f"Resuming after line {resume_line}")
+
+        self.load_existing()
+        batch: list[tuple] = []
+        line = 0
+        with open(csv_path, encoding='utf-8', newline='') as f:
+            for line, row in enumerate(csv.DictReader(f), start=1):
+                if line <= resume_line:
+                    continue
+                self.stats.read += 1
+                params, reason = self.validate(row)
+                if reason:
+                    self.stats.skipped[reason] += 1
+                    continue
+                batch.append(params)
+                if len(batch) >= self.batch_size:
+                    if not self._flush(batch, line, checkpoint):
+                        return False
+                    batch = []
+        if batch and not self._flush(batch, line, checkpoint):
+            return False
+        checkpoint.clear()
+        return True
+
+    def _flush(self, batch: list[tuple], line: int, checkpoint: Checkpoint) -> bool:
+        if not self.db.execute_batch(INSERT_AIRPORT, batch):
+            print(f"\nImport stopped, run again to resume after line {checkpoint.load()}")
+            return False
+        checkpoint.save(line)
+        self.stats.inserted += len(batch)
+        print(f"\r{self.stats.inserted} inserted, {self.stats.rows_per_second():.0f} rows/s", end='', flush=True)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import airports from an OurAirports style CSV file.")
+    parser.add_argument('csv_path')
+    parser.add_argument('--countries', help="countries.csv with code, name and continent columns")
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--types', default=','.join(DEFAULT_TYPES), help="comma separated airport types to import")
+    parser.add_argument('--restart', action='store_true', help="ignore any saved checkpoint")
+    args = parser.parse_args()
+
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        importer = AirportImporter(db, args.batch_size, tuple(t.strip() for t in args.types.split(',') if t.strip()))
+        if args.countries:
+            print(f"{importer.import_countries(args.countries)} countries processed")
+        ok = importer.run(args.csv_path, restart=args.restart)
+        print()
+        print(importer.stats.summary())
+        if not ok:
+            raise SystemExit(1)
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
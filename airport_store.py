@@ -0,0 +1,220 @@
+import sys
+from array import array
+from typing import Iterator, Optional
+
+from data import AirportDto
+from text_utils import fold_name
+
+
+class AirportView:
+    """Read-only view of one airport inside an AirportStore, usable wherever an AirportDto is read"""
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'AirportStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self) -> int:
+        return self._store.ids[self._index]
+
+    @property
+    def icao_code(self) -> str:
+        return self._store.icao_codes[self._index]
+
+    @property
+    def iata_code(self) -> str:
+        return self._store.iata_codes[self._index]
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._index]
+
+    @property
+    def city(self) -> str:
+        return self._store.cities[self._index]
+
+    @property
+    def country_code(self) -> str:
+        return self._store.country_codes[self._store.country_indexes[self._index]]
+
+    @property
+    def latitude(self) -> float:
+        return self._store.latitudes[self._index]
+
+    @property
+    def longitude(self) -> float:
+        return self._store.longitudes[self._index]
+
+    @property
+    def elevation_ft(self) -> int:
+        return self._store.elevations[self._index]
+
+    @property
+    def continent(self) -> str:
+        return self._store.continents[self._store.continent_indexes[self._index]]
+
+    @property
+    def is_major_hub(self) -> bool:
+        return bool(self._store.hub_flags[self._index])
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    def to_dto(self) -> AirportDto:
+        return AirportDto(
+            id=self.id,
+            icao_code=self.icao_code,
+            iata_code=self.iata_code,
+            name=self.name,
+            city=self.city,
+            country_code=self.country_code,
+            latitude=self.latitude,
+            longitude=self.longitude,
+            elevation_ft=self.elevation_ft,
+            continent=self.continent
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, AirportView):
+            return self.id == other.id
+        if isinstance(other, AirportDto):
+            return self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"AirportView(id={self.id}, icao_code={self.icao_code!r}, name={self.name!r})"
+
+
+class AirportStore:
+    """Columnar airport catalog: parallel arrays plus interned code tables"""
+
+    def __init__(self):
+        self.ids = array('q')
+        self.latitudes = array('d')
+        self.longitudes = array('d')
+        self.elevations = array('i')
+        self.hub_flags = array('b')
+        self.country_indexes = array('H')
+        self.continent_indexes = array('B')
+        self.icao_codes: list[str] = []
+        self.iata_codes: list[str] = []
+        self.names: list[str] = []
+        self.cities: list[str] = []
+        self.country_codes: list[str] = []
+        self.continents: list[str] = []
+        self._country_lookup: dict[str, int] = {}
+        self._continent_lookup: dict[str, int] = {}
+        self._index_by_id: dict[int, int] = {}
+        self._index_by_name: dict[str, int] | None = None
+
+    @classmethod
+    def from_rows(cls, rows) -> 'AirportStore':
+        store = cls()
+        for row in rows:
+            store.add_row(row)
+        return store
+
+    def add_row(self, row: dict) -> int:
+        return self.add(
+            airport_id=row['id'],
+            icao_code=row['icao_code'],
+            iata_code=row['iata_code'],
+            name=row['name'],
+            city=row['city'],
+            country_code=row['country_code'],
+            latitude=row['latitude'],
+            longitude=row['longitude'],
+            elevation_ft=row.get('elevation_ft'),
+            continent=row['continent'],
+            is_major_hub=row.get('is_major_hub', False)
+        )
+
+    def add(self, airport_id: int, icao_code: str, iata_code: str, name: str, city: str, country_code: str,
+            latitude, longitude, elevation_ft: int | None, continent: str, is_major_hub: bool = False) -> int:
+        index = len(self.ids)
+        self.ids.append(airport_id)
+        self.latitudes.append(float(latitude))
+        self.longitudes.append(float(longitude))
+        self.elevations.append(elevation_ft or 0)
+        self.hub_flags.append(1 if is_major_hub else 0)
+        self.country_indexes.append(self._intern_code(country_code, self.country_codes, self._country_lookup))
+        self.continent_indexes.append(self._intern_code(continent, self.continents, self._continent_lookup))
+        self.icao_codes.append(sys.intern(icao_code))
+        self.iata_codes.append(sys.intern(iata_code))
+        self.names.append(name)
+        self.cities.append(sys.intern(city))
+        self._index_by_id[airport_id] = index
+        if self._index_by_name is not None:
+            self._index_by_name[fold_name(name)] = index
+        return index
+
+    @staticmethod
+    def _intern_code(code: str, table: list[str], lookup: dict[str, int]) -> int:
+        index = lookup.get(code)
+        if index is None:
+            index = len(table)
+            table.append(sys.intern(code))
+            lookup[code] = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[AirportView]:
+        for index in range(len(self.ids)):
+            yield AirportView(self, index)
+
+    def view(self, index: int) -> AirportView:
+        return AirportView(self, index)
+
+    def index_of(self, airport_id: int) -> Optional[int]:
+        return self._index_by_id.get(airport_id)
+
+    def get_by_id(self, airport_id: int) -> Optional[AirportView]:
+        index = self._index_by_id.get(airport_id)
+        return AirportView(self, index) if index is not None else None
+
+    def get_by_name(self, name: str) -> Optional[AirportView]:
+        if self._index_by_name is None:
+            # Built on first use, most consumers only look airports up by id
+            self._index_by_name = {fold_name(n): i for i, n in enumerate(self.names)}
+        index = self._index_by_name.get(fold_name(name))
+        return AirportView(self, index) if index is not None else None
+
+    def get_by_country(self, country_code: str) -> list[AirportView]:
+        """Airports of a country, major hubs first then by name"""
+        country_index = self._country_lookup.get(country_code)
+        if country_index is None:
+            return []
+        indexes = [i for i, c in enumerate(self.country_indexes) if c == country_index]
+        indexes.sort(key=lambda i: (-self.hub_flags[i], self.names[i]))
+        return [AirportView(self, i) for i in indexes]
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the store, including the strings it references"""
+        total = sum(sys.getsizeof(column) for column in (
+            self.ids, self.latitudes, self.longitudes, self.elevations, self.hub_flags,
+            self.country_indexes, self.continent_indexes, self.icao_codes, self.iata_codes,
+            self.names, self.cities, self.country_codes, self.continents,
+            self._country_lookup, self._continent_lookup, self._index_by_id))
+        seen: set[int] = set()
+        for column in (self.icao_codes, self.iata_codes, self.names, self.cities,
+                       self.country_codes, self.continents):
+            for value in column:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+        if self._index_by_name is not None:
+            total += sys.getsizeof(self._index_by_name)
+            total += sum(sys.getsizeof(key) for key in self._index_by_name)
+        return total
+
+    def memory_per_10k(self) -> float:
+        if not self.ids:
+            return 0.0
+        return self.memory_bytes() / len(self.ids) * 10_000
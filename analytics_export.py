@@ -0,0 +1,176 @@
+"""Streams game history out of the database into CSV files for analysis.
+
+Usage: python analytics_export.py [sessions|players|saves|all] [--out DIR] [--chunk-size N]
+
+Rows are streamed with DatabaseConnection.iter_query in chunks of --chunk-size and written straight
+to the file, so memory use stays flat however large the tables are.
+"""
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+import save_delta
+from models import DatabaseConnection, mysql_connector
+
+DEFAULT_CHUNK_SIZE = 1000
+
+SESSION_COLUMNS = ['id', 'player_id', 'difficulty_level', 'starting_airport_id', 'boss_airport_id',
+                   'boss_country_code', 'current_airport_id', 'battery_level', 'puzzles_solved',
+                   'countries_guessed', 'status', 'score', 'started_at', 'completed_at']
+PLAYER_COLUMNS = ['id', 'name', 'difficulty_level', 'battery_level', 'total_score', 'games_played',
+                  'games_won', 'created_at', 'last_login']
+SAVE_COLUMNS = ['id', 'player_id', 'save_name', 'game_data', 'created_at', 'updated_at']
+
+# Keys of game_save.game_data that are exported as their own columns
+SAVE_DATA_KEYS = ['session_id', 'difficulty_level', 'boss_airport_id', 'current_airport_id',
+                  'battery_level', 'puzzles_solved', 'countries_guessed', 'status', 'score']
+
+
+def decode_codes(value) -> List[str]:
+    if not value:
+        return []
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    try:
+        codes = json.loads(value)
+    except ValueError:
+        return []
+    return codes if isinstance(codes, list) else []
+
+
+class AnalyticsExporter:
+    def __init__(self, db: DatabaseConnection, out_dir: str = '.', chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db = db
+        self.out_dir = out_dir
+        self.chunk_size = chunk_size
+        self._country_names: dict[str, str] | None = None
+
+    def country_names(self) -> dict[str, str]:
+        """Code to name for the guessed-countries column; the country table is small enough to hold"""
+        if self._country_names is None:
+            rows = self.db.iter_query("SELECT code, name FROM country", as_tuples=True, raise_errors=True)
+            self._country_names = {code: name for code, name in rows}
+        return self._country_names
+
+    def _write(self, file_name: str, header: List[str], query: str,
+               convert: Callable[[tuple], list], grouped: bool = False) -> Tuple[str, int]:
+        """grouped passes convert the list of consecutive rows sharing their first column instead of one row"""
+        path = os.path.join(self.out_dir, file_name)
+        temp_path = path + '.tmp'
+        count = 0
+        try:
+            with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                rows = self.db.iter_query(query, chunk_size=self.chunk_size, as_tuples=True, raise_errors=True)
+                if grouped:
+                    rows = (list(group) for _, group in itertools.groupby(rows, key=lambda row: row[0]))
+                for row in rows:
+                    writer.writerow(convert(row))
+                    count += 1
+        except BaseException:
+            # A failed read must not replace the previous export with a partial one
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+        return path, count
+
+    def export_sessions(self) -> Tuple[str, int]:
+        names = self.country_names()
+        guessed_at = SESSION_COLUMNS.index('countries_guessed')
+
+        def convert(row: tuple) -> list:
+            row = list(row)
+            codes = decode_codes(row[guessed_at])
+            row[guessed_at] = ';'.join(codes)
+            return row + [len(codes), ';'.join(names.get(code, code) for code in codes)]
+
+        query = f"SELECT {', '.join(SESSION_COLUMNS)} FROM game_session ORDER BY id"
+        header = SESSION_COLUMNS + ['countries_guessed_count', 'countries_guessed_names']
+        return self._write('sessions.csv', header, query, convert)
+
+    def export_players(self) -> Tuple[str, int]:
+        query = f"SELECT {', '.join(PLAYER_COLUMNS)} FROM player ORDER BY id"
+        return self._write('players.csv', PLAYER_COLUMNS, query, list)
+
+    def export_saves(self) -> Tuple[str, int]:
+        data_at = SAVE_COLUMNS.index('game_data')
+        blob_at, delta_at = len(SAVE_COLUMNS), len(SAVE_COLUMNS) + 1
+
+        def convert(rows: List[tuple]) -> list:
+            # One row per delta newer than the base; a delta-mode save is rebuilt from them
+            row = list(rows[0][:len(SAVE_COLUMNS)])
+            raw = row.pop(data_at)
+            deltas = [r[delta_at] for r in rows if r[delta_at] is not None]
+            try:
+                game_data = save_delta.replay(raw, rows[0][blob_at], deltas) if raw or rows[0][blob_at] else {}
+            except (ValueError, zlib.error):
+                game_data = {}
+            values = [game_data.get(key) for key in SAVE_DATA_KEYS]
+            values[SAVE_DATA_KEYS.index('countries_guessed')] = ';'.join(game_data.get('countries_guessed') or [])
+            return row + values
+
+        columns = ', '.join(f's.{c}' for c in SAVE_COLUMNS)
+        query = (f"SELECT {columns}, s.base_blob, d.delta FROM game_save s "
+                 f"LEFT JOIN game_save_delta d ON d.save_id = s.id AND d.seq > s.base_seq ORDER BY s.id, d.seq")
+        header = [c for c in SAVE_COLUMNS if c != 'game_data'] + SAVE_DATA_KEYS
+        return self._write('saves.csv', header, query, convert, grouped=True)
+
+    def export(self, tables: List[str]) -> List[Tuple[str, int]]:
+        exports = {'sessions': self.export_sessions, 'players': self.export_players, 'saves': self.export_saves}
+        return [exports[table]() for table in tables]
+
+
+def parse_args(args: List[str]) -> Optional[Tuple[List[str], str, int]]:
+    tables = ['sessions', 'players', 'saves']
+    selected = []
+    out_dir = '.'
+    chunk_size = DEFAULT_CHUNK_SIZE
+    i = 0
+    while i < len(args):
+        if args[i] == '--out' and i + 1 < len(args):
+            out_dir = args[i + 1]
+            i += 1
+        elif args[i] == '--chunk-size' and i + 1 < len(args):
+            chunk_size = int(args[i + 1])
+            i += 1
+        elif args[i] == 'all':
+            selected = tables
+        elif args[i] in tables:
+            selected.append(args[i])
+        else:
+            return None
+        i += 1
+    return selected or tables, out_dir, chunk_size
+
+
+def main():
+    parsed = parse_args(sys.argv[1:])
+    if parsed is None:
+        print("Usage: python analytics_export.py [sessions|players|saves|all] [--out DIR] [--chunk-size N]")
+        return
+    tables, out_dir, chunk_size = parsed
+    os.makedirs(out_dir, exist_ok=True)
+
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        start = time.perf_counter()
+        for path, count in AnalyticsExporter(db, out_dir, chunk_size).export(tables):
+            print(f"Wrote {count} rows to {path}")
+        print(f"Done in {time.perf_counter() - start:.2f}s")
+    except mysql_connector.Error as e:
+        print(f"Export failed: {e}")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
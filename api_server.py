@@ -0,0 +1,557 @@
+"""HTTP/JSON API in front of BossFlightGameDriver, for a web client.
+
+Usage: python api_server.py [--host HOST] [--port PORT] [--workers N]
+
+Requests are parsed on an asyncio server; every driver call (they all block on MySQL) runs on a
+bounded thread pool, and each pilot's calls are serialised by a per-session lock. Pilots get a
+token from POST /players and send it as "Authorization: Bearer <token>". A pilot that sends nothing
+for API_SESSION_IDLE_SECONDS is logged out and its driver terminated; at most API_MAX_SESSIONS pilots
+are logged in at a time. A login only opens that pilot's own connection; the catalog snapshot, the
+airport store, the writer thread and the turn journal are set up once when the server starts.
+
+    POST /players                      {"name"}                 -> {"token", "name"}
+    GET  /countries                                             -> country list (ETag)
+    GET  /countries/<name>/airports                             -> airport names (ETag)
+    POST /games                        {"difficulty", "starting_airport", "daily"}
+    GET  /game                                                  -> navigation state
+    POST /game/fly                     {"airport"}              -> flight result + navigation
+    GET  /game/challenge                                        -> the next question
+    POST /game/challenge               {"answer"}               -> correct?, battery change
+    GET  /game/route/<airport>                                  -> flights from here to airport, each in range
+    POST /game/quit
+    GET  /saves
+    POST /saves/<name>/load
+    POST /races                                                 -> {"race_id"}, the caller has joined
+    POST /races/<id>/join                                       -> the next POST /games flies this race
+    POST /races/<id>/close                                      (only the pilot that opened it)
+    GET  /race                                                  -> other pilots' latest moves since last call
+
+Races run on one process-wide RaceHub: every pilot in a race chases the same boss, and each flight and
+finish is broadcast to the others.
+"""
+import asyncio
+import hashlib
+import json
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import unquote
+
+from config import Config
+from data import *
+from game import BossFlightGameDriver
+from race_hub import RaceHub
+
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> dict:
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON.")
+        if not isinstance(data, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object.")
+        return data
+
+    def token(self) -> str:
+        scheme, _, token = self.headers.get('authorization', '').partition(' ')
+        return token.strip() if scheme.lower() == 'bearer' else ''
+
+
+@dataclass
+class Response:
+    status: HTTPStatus
+    body: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def json(cls, data: Any, status: HTTPStatus = HTTPStatus.OK) -> 'Response':
+        return cls(status, json.dumps(data).encode('utf-8'), {'Content-Type': 'application/json'})
+
+    @classmethod
+    def cacheable(cls, body: bytes, etag: str, request: Request) -> 'Response':
+        """200 with an ETag, or 304 without a body when the client already has this version"""
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if etag in (tag.strip() for tag in request.headers.get('if-none-match', '').split(',')):
+            return cls(HTTPStatus.NOT_MODIFIED, b'', headers)
+        headers['Content-Type'] = 'application/json'
+        return cls(HTTPStatus.OK, body, headers)
+
+
+@dataclass
+class PilotSession:
+    driver: BossFlightGameDriver
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    challenge: OpenQuestion | MultipleChoiceQuestion | None = None
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def navigation_json(driver: BossFlightGameDriver) -> Optional[dict]:
+    navigation = driver.get_navigation()
+    if not navigation:
+        return None
+    return {
+        'airport': navigation.airport_name,
+        'country': navigation.country_name,
+        'continent': navigation.continent,
+        'distance_km': round(navigation.distance_km, 1),
+        'direction': navigation.direction.value,
+        'battery': navigation.battery,
+        'closest_percent': navigation.closest_percent,
+        'status': driver.current_session.status.value if driver.current_session else None,
+    }
+
+
+class ApiServer:
+    def __init__(self, workers: int = Config.API_WORKERS, max_sessions: int = Config.API_MAX_SESSIONS,
+                 idle_seconds: float = Config.API_SESSION_IDLE_SECONDS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='api-worker')
+        self.sessions: Dict[str, PilotSession] = {}
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        # Players being set up count against the cap before they have a token
+        self._pending_players = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        # Serves the static lists, which are the same for every pilot, and owns the catalog, writer and
+        # journal that the pilots' drivers borrow
+        self.catalog = BossFlightGameDriver()
+        self.catalog_lock = asyncio.Lock()
+        self._static_cache: Dict[str, Tuple[bytes, str]] = {}
+        self.race_hub = RaceHub()
+        # race id -> token of the pilot that opened it
+        self.race_owners: Dict[str, str] = {}
+        self.routes: list[Tuple[str, list[str], Callable]] = [
+            ('POST', ['players'], self.create_player),
+            ('GET', ['countries'], self.list_countries),
+            ('GET', ['countries', None, 'airports'], self.list_airports),
+            ('POST', ['games'], self.new_game),
+            ('GET', ['game'], self.game_state),
+            ('POST', ['game', 'fly'], self.fly),
+            ('GET', ['game', 'challenge'], self.get_challenge),
+            ('POST', ['game', 'challenge'], self.answer_challenge),
+            ('GET', ['game', 'route', None], self.plan_route),
+            ('POST', ['game', 'quit'], self.quit_game),
+            ('GET', ['saves'], self.list_saves),
+            ('POST', ['saves', None, 'load'], self.load_save),
+            ('POST', ['races'], self.create_race),
+            ('POST', ['races', None, 'join'], self.join_race),
+            ('POST', ['races', None, 'close'], self.close_race),
+            ('GET', ['race'], self.race_updates),
+        ]
+
+    async def blocking(self, function: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.pool, function, *args)
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        result = await self.blocking(self.catalog.initialize)
+        if result.is_error():
+            raise RuntimeError(result.error)
+        # Loaded once here; every pilot's driver borrows it through initialize_pilot
+        await self.blocking(self.catalog.get_airport_store)
+        self.race_hub.start()
+        self._sweeper = asyncio.create_task(self.sweep_idle_sessions())
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def close(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+        # Pilots first: they borrow the catalog driver's writer and journal
+        for session in self.sessions.values():
+            await self.blocking(session.driver.terminate)
+        await self.blocking(self.catalog.terminate)
+        self.race_hub.stop()
+        self.pool.shutdown()
+
+    # HTTP
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await self.read_request(reader)
+                if request is None:
+                    break
+                response = await self.dispatch(request)
+                keep_alive = request.headers.get('connection', '').lower() != 'close'
+                self.write_response(writer, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ApiError as e:
+            # The stream position is unknown after a malformed request, so answer and hang up
+            self.write_response(writer, Response.json({'error': e.message}, e.status), keep_alive=False)
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[Request]:
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise ConnectionError("Request head too large")
+        lines = head.decode('latin1').split('\r\n')
+        try:
+            method, target, _ = lines[0].split(' ', 2)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Malformed request line.")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', '0') or 0)
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Content-Length is not a number.")
+        if length < 0:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Content-Length is negative.")
+        if length > MAX_BODY_BYTES:
+            raise ConnectionError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return Request(method.upper(), target.split('?', 1)[0], headers, body)
+
+    @staticmethod
+    def write_response(writer: asyncio.StreamWriter, response: Response, keep_alive: bool):
+        status = response.status
+        headers = dict(response.headers)
+        headers['Content-Length'] = str(len(response.body))
+        headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+        head = f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        head += ''.join(f"{name}: {value}\r\n" for name, value in headers.items())
+        writer.write(head.encode('latin1') + b'\r\n' + response.body)
+
+    async def dispatch(self, request: Request) -> Response:
+        parts = [unquote(part) for part in request.path.strip('/').split('/') if part]
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            if len(pattern) != len(parts) or any(p is not None and p != part for p, part in zip(pattern, parts)):
+                continue
+            path_matched = True
+            if method != request.method:
+                continue
+            args = [part for p, part in zip(pattern, parts) if p is None]
+            try:
+                return await handler(request, *args)
+            except ApiError as e:
+                return Response.json({'error': e.message}, e.status)
+            except Exception as e:
+                print(f"API error on {request.method} {request.path}: {e!r}")
+                return Response.json({'error': "Internal server error."}, HTTPStatus.INTERNAL_SERVER_ERROR)
+        if path_matched:
+            return Response.json({'error': "Method not allowed."}, HTTPStatus.METHOD_NOT_ALLOWED)
+        return Response.json({'error': "Not found."}, HTTPStatus.NOT_FOUND)
+
+    # Sessions
+
+    def session(self, request: Request) -> PilotSession:
+        session = self.sessions.get(request.token())
+        if session is None:
+            raise ApiError(HTTPStatus.UNAUTHORIZED, "Unknown or missing token.")
+        session.last_used = time.monotonic()
+        return session
+
+    async def sweep_idle_sessions(self):
+        while True:
+            await asyncio.sleep(min(60.0, self.idle_seconds / 2))
+            await self.evict_idle_sessions()
+
+    async def evict_idle_sessions(self):
+        now = time.monotonic()
+        for token, session in list(self.sessions.items()):
+            if now - session.last_used < self.idle_seconds:
+                continue
+            async with session.lock:
+                # A request that found the session before the lock was taken has refreshed last_used
+                if time.monotonic() - session.last_used < self.idle_seconds or self.sessions.get(token) is not session:
+                    continue
+                del self.sessions[token]
+                await self.blocking(session.driver.terminate)
+            # Nobody else can close the races this pilot opened
+            for race_id in [race_id for race_id, owner in self.race_owners.items() if owner == token]:
+                del self.race_owners[race_id]
+                await self.blocking(self.race_hub.close_race, race_id)
+
+    def active_game(self, session: PilotSession):
+        if not session.driver.current_session or session.driver.current_session.status is not SessionStatus.ACTIVE:
+            raise ApiError(HTTPStatus.CONFLICT, "No game in progress.")
+
+    async def cached_static(self, key: str, request: Request, build: Callable[[], Any]) -> Response:
+        cached = self._static_cache.get(key)
+        if cached is None:
+            async with self.catalog_lock:
+                data = await self.blocking(build)
+            body = json.dumps(data).encode('utf-8')
+            cached = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+            self._static_cache[key] = cached
+        body, etag = cached
+        return Response.cacheable(body, etag, request)
+
+    # Handlers
+
+    async def create_player(self, request: Request) -> Response:
+        name = str(request.json().get('name', '')).strip()
+        if not name:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "A pilot name is required.")
+        if len(self.sessions) + self._pending_players >= self.max_sessions:
+            await self.evict_idle_sessions()
+            if len(self.sessions) + self._pending_players >= self.max_sessions:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "Too many pilots are playing, try again later.")
+        driver = BossFlightGameDriver()
+
+        def setup() -> ResultNoValue:
+            result = driver.initialize_pilot(self.catalog)
+            if result.is_success() and not driver.setup_player(name):
+                return ResultNoValue.failure("Could not create player profile.")
+            return result
+
+        self._pending_players += 1
+        try:
+            result = await self.blocking(setup)
+        finally:
+            self._pending_players -= 1
+        if result.is_error():
+            await self.blocking(driver.terminate)
+            raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, result.error)
+        token = secrets.token_urlsafe(24)
+        self.sessions[token] = PilotSession(driver)
+        return Response.json({'token': token, 'name': driver.player.name}, HTTPStatus.CREATED)
+
+    async def list_countries(self, request: Request) -> Response:
+        def build():
+            return [{'code': c.code, 'name': c.name, 'continent': c.continent}
+                    for c in self.catalog._countries().get_all_countries()]
+        return await self.cached_static('countries', request, build)
+
+    async def list_airports(self, request: Request, country_name: str) -> Response:
+        async with self.catalog_lock:
+            country = await self.blocking(self.catalog.get_country_by_name, country_name)
+        if country.is_error():
+            raise ApiError(HTTPStatus.NOT_FOUND, country.error)
+        return await self.cached_static(f'airports:{country.value.code}', request,
+                                        lambda: self.catalog.get_airport_names(country.value.name))
+
+    async def new_game(self, request: Request) -> Response:
+        session = self.session(request)
+        data = request.json()
+        try:
+            difficulty = Difficulty(data.get('difficulty', 'easy'))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "difficulty must be easy, medium or hard.")
+        daily = bool(data.get('daily', False))
+        starting_airport = data.get('starting_airport')
+        if not daily and not starting_airport:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "starting_airport is required.")
+        async with session.lock:
+            result = await self.blocking(session.driver.start_new_game, starting_airport, difficulty, daily)
+            if result.is_error():
+                raise ApiError(HTTPStatus.CONFLICT, result.error)
+            session.challenge = None
+            return Response.json(navigation_json(session.driver), HTTPStatus.CREATED)
+
+    async def game_state(self, request: Request) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            self.active_game(session)
+            return Response.json(navigation_json(session.driver))
+
+    async def fly(self, request: Request) -> Response:
+        session = self.session(request)
+        airport = str(request.json().get('airport', '')).strip()
+        if not airport:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "airport is required.")
+        async with session.lock:
+            self.active_game(session)
+            driver = session.driver
+            try:
+                flight_result = await self.blocking(driver.change_airport, airport)
+            except ValueError as e:
+                raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+            if flight_result is FlightResult.CORRECT_AIRPORT:
+                navigation = navigation_json(driver)
+                await self.blocking(driver.end_game, GameResult.VICTORY)
+                return Response.json({'result': flight_result.value, 'navigation': navigation, 'game_over': 'won'})
+            return Response.json({'result': flight_result.value, 'navigation': navigation_json(driver)})
+
+    async def get_challenge(self, request: Request) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            self.active_game(session)
+            if session.challenge is None:
+                session.challenge = await self.blocking(session.driver.get_challenge)
+            challenge = session.challenge
+            if challenge is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, "No challenge available.")
+            if isinstance(challenge, MultipleChoiceQuestion):
+                return Response.json({'type': ChallengeType.MULTIPLE_CHOICE.value, 'question': challenge.question,
+                                      'options': [option.name for option in challenge.options]})
+            return Response.json({'type': ChallengeType.OPEN_QUESTION.value, 'question': challenge.question})
+
+    async def answer_challenge(self, request: Request) -> Response:
+        session = self.session(request)
+        answer = str(request.json().get('answer', '')).strip()
+        async with session.lock:
+            self.active_game(session)
+            challenge = session.challenge
+            if challenge is None:
+                raise ApiError(HTTPStatus.CONFLICT, "No challenge has been asked.")
+            if isinstance(challenge, MultipleChoiceQuestion):
+                correct_answer = next((o.name for o in challenge.options if o.is_correct), "")
+            else:
+                correct_answer = challenge.answer
+            is_correct = answer.lower() == correct_answer.lower()
+            result = ChallengeResult.CORRECT if is_correct else ChallengeResult.INCORRECT
+            battery_change = await self.blocking(session.driver.challenge_completed, result)
+            session.challenge = None
+            body = {'correct': is_correct, 'correct_answer': correct_answer, 'battery_change': battery_change,
+                    'navigation': navigation_json(session.driver)}
+            if session.driver.current_session.battery_level <= 0:
+                await self.blocking(session.driver.end_game, GameResult.DEFEAT)
+                body['game_over'] = 'lost'
+            return Response.json(body)
+
+    async def plan_route(self, request: Request, airport_name: str) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            self.active_game(session)
+            driver = session.driver
+            airport = await self.blocking(driver._airports().get_airport_by_name, airport_name)
+            if airport is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Airport '{airport_name}' not found.")
+            route = await self.blocking(driver.plan_route, airport.id)
+            if route is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"No route to '{airport_name}' within range.")
+            return Response.json({'airports': [a.name for a in route.airports],
+                                  'distance_km': round(route.distance_km, 1), 'hops': route.hops})
+
+    async def quit_game(self, request: Request) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            self.active_game(session)
+            await self.blocking(session.driver.end_game, GameResult.QUIT)
+            session.challenge = None
+            return Response.json({'status': SessionStatus.ABANDONED.value})
+
+    async def list_saves(self, request: Request) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            saves = await self.blocking(session.driver.get_saves)
+            return Response.json([{'id': s.id, 'name': s.save_name} for s in saves])
+
+    async def load_save(self, request: Request, save_name: str) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            saves = await self.blocking(session.driver.get_saves)
+            save = next((s for s in saves if s.save_name == save_name), None)
+            if save is None:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Save '{save_name}' not found.")
+            result = await self.blocking(session.driver.load_save, save)
+            if result.is_error():
+                raise ApiError(HTTPStatus.CONFLICT, result.error)
+            session.challenge = None
+            return Response.json(navigation_json(session.driver))
+
+    async def create_race(self, request: Request) -> Response:
+        session = self.session(request)
+        async with self.catalog_lock:
+            boss = await self.blocking(self.catalog.pick_boss_airport)
+        if boss is None:
+            raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, "No airports available in the database.")
+        race_id = secrets.token_urlsafe(6)
+        await self.blocking(self.race_hub.open_race, race_id, boss.id)
+        self.race_owners[race_id] = request.token()
+        async with session.lock:
+            result = await self.blocking(session.driver.join_race, self.race_hub, race_id)
+            if result.is_error():
+                raise ApiError(HTTPStatus.CONFLICT, result.error)
+        return Response.json({'race_id': race_id}, HTTPStatus.CREATED)
+
+    async def join_race(self, request: Request, race_id: str) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            if session.driver.race_id and session.driver.race_id != race_id:
+                await self.blocking(session.driver.leave_race)
+            result = await self.blocking(session.driver.join_race, self.race_hub, race_id)
+            if result.is_error():
+                raise ApiError(HTTPStatus.NOT_FOUND, result.error)
+            return Response.json({'race_id': race_id})
+
+    async def close_race(self, request: Request, race_id: str) -> Response:
+        self.session(request)
+        if self.race_owners.get(race_id) != request.token():
+            raise ApiError(HTTPStatus.FORBIDDEN, "Only the pilot that opened a race can close it.")
+        del self.race_owners[race_id]
+        await self.blocking(self.race_hub.close_race, race_id)
+        return Response.json({'race_id': race_id, 'closed': True})
+
+    async def race_updates(self, request: Request) -> Response:
+        session = self.session(request)
+        async with session.lock:
+            if not session.driver.race_id:
+                raise ApiError(HTTPStatus.CONFLICT, "Not in a race.")
+            events = await self.blocking(session.driver.get_race_updates)
+            return Response.json([{'pilot': e.pilot, 'kind': e.kind, 'airport': e.airport_name,
+                                   'country_code': e.country_code, 'distance_km': round(e.distance_km, 1),
+                                   'battery': e.battery, 'result': e.result} for e in events])
+
+
+def parse_args(args: list[str]) -> Tuple[str, int, int]:
+    host, port, workers = Config.API_HOST, Config.API_PORT, Config.API_WORKERS
+    for flag, value in zip(args[::2], args[1::2]):
+        if flag == '--host':
+            host = value
+        elif flag == '--port':
+            port = int(value)
+        elif flag == '--workers':
+            workers = int(value)
+    return host, port, workers
+
+
+async def serve(host: str, port: int, workers: int):
+    api = ApiServer(workers)
+    server = await api.start(host, port)
+    print(f"Listening on http://{host}:{port} with {workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await api.close()
+
+
+def main():
+    try:
+        asyncio.run(serve(*parse_args(sys.argv[1:])))
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Memory per 10k airports: list of AirportDto vs AirportStore.
+
+Run from the repository root: python benchmarks/airport_store_memory.py [count]
+"""
+import os
+import random
+import sys
+import tracemalloc
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from airport_store import AirportStore
+from data import AirportDto
+
+CONTINENTS = ['EU', 'NA', 'AS', 'AF', 'SA', 'OC', 'AN']
+
+
+def synthetic_rows(count: int) -> list[dict]:
+    rng = random.Random(42)
+    countries = [f"{chr(65 + i // 26)}{chr(65 + i % 26)}" for i in range(200)]
+    rows = []
+    for i in range(count):
+        country = rng.choice(countries)
+        rows.append({
+            'id': i + 1,
+            'icao_code': f"{country}{i % 100:02d}",
+            'iata_code': f"{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}{chr(65 + i // 676 % 26)}",
+            'name': f"Airport number {i}",
+            'city': f"City {i % 5000}",
+            'country_code': country,
+            'latitude': Decimal(f"{rng.uniform(-90, 90):.7f}"),
+            'longitude': Decimal(f"{rng.uniform(-180, 180):.7f}"),
+            'elevation_ft': rng.randint(0, 12000),
+            'continent': rng.choice(CONTINENTS),
+            'is_major_hub': rng.random() < 0.01,
+        })
+    return rows
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    # Rows are copied so both variants pay for their own strings and numbers
+    dto_bytes = measure(lambda: [AirportDto.create(dict(row)) for row in synthetic_rows(count)])
+    store_bytes = measure(lambda: AirportStore.from_rows(synthetic_rows(count)))
+    store = AirportStore.from_rows(synthetic_rows(count))
+
+    scale = 10_000 / count
+    print(f"airports:                 {count}")
+    print(f"AirportDto list / 10k:    {dto_bytes * scale / 1024:10.1f} KiB")
+    print(f"AirportStore / 10k:       {store_bytes * scale / 1024:10.1f} KiB")
+    print(f"AirportStore self-report: {store.memory_per_10k() / 1024:10.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Load test for api_server.py on localhost.
+
+Each virtual pilot signs up, fetches the country list twice (the second time with If-None-Match, so
+it should get a 304), lists airports, starts a game and then alternates challenges and flights.
+Needs the server running against a local database: python api_server.py
+Run from the repository root: python benchmarks/api_load_test.py [pilots] [turns] [--port PORT]
+"""
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+
+HOST = '127.0.0.1'
+
+
+class Client:
+    def __init__(self, port: int, stats, lock: threading.Lock):
+        self.connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        self.token = ''
+        self.stats = stats
+        self.lock = lock
+
+    def request(self, method: str, path: str, body: dict | None = None, label: str | None = None,
+                headers: dict | None = None):
+        headers = dict(headers or {})
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        payload = json.dumps(body).encode('utf-8') if body is not None else None
+        if payload is not None:
+            headers['Content-Type'] = 'application/json'
+        start = time.perf_counter()
+        self.connection.request(method, path, payload, headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.stats[label or f"{method} {path}"].append((elapsed, response.status))
+        return response.status, response.getheader('ETag'), json.loads(data) if data else None
+
+
+def run_pilot(index: int, turns: int, port: int, stats, lock: threading.Lock, rng: random.Random):
+    client = Client(port, stats, lock)
+    status, _, body = client.request('POST', '/players', {'name': f"load-{index}-{rng.randrange(10 ** 6)}"})
+    if status != 201:
+        return
+    client.token = body['token']
+
+    _, etag, countries = client.request('GET', '/countries')
+    client.request('GET', '/countries', label='GET /countries (etag)', headers={'If-None-Match': etag or ''})
+    airports_by_country = {}
+    for country in rng.sample(countries, min(5, len(countries))):
+        status, _, airports = client.request('GET', f"/countries/{country['name']}/airports",
+                                             label='GET /countries/<name>/airports')
+        if status == 200 and airports:
+            airports_by_country[country['name']] = airports
+    if not airports_by_country:
+        return
+    every_airport = [name for names in airports_by_country.values() for name in names]
+
+    status, _, _ = client.request('POST', '/games', {'difficulty': 'easy', 'starting_airport': every_airport[0]})
+    if status != 201:
+        return
+    for _ in range(turns):
+        status, _, body = client.request('POST', '/game/fly', {'airport': rng.choice(every_airport)})
+        if status != 200 or body.get('game_over'):
+            return
+        status, _, challenge = client.request('GET', '/game/challenge')
+        if status == 200:
+            answer = rng.choice(challenge['options']) if challenge.get('options') else 'unknown'
+            status, _, body = client.request('POST', '/game/challenge', {'answer': answer})
+            if status != 200 or body.get('game_over'):
+                return
+    client.request('POST', '/game/quit')
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+def main():
+    args = sys.argv[1:]
+    port = 8080
+    if '--port' in args:
+        i = args.index('--port')
+        port = int(args[i + 1])
+        del args[i:i + 2]
+    pilots = int(args[0]) if args else 20
+    turns = int(args[1]) if len(args) > 1 else 5
+
+    stats = defaultdict(list)
+    lock = threading.Lock()
+    threads = [threading.Thread(target=run_pilot, args=(i, turns, port, stats, lock, random.Random(i)))
+               for i in range(pilots)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(samples) for samples in stats.values())
+    print(f"{pilots} pilots, {total} requests in {elapsed:.2f}s ({total / elapsed:.0f} req/s)")
+    print(f"{'endpoint':<34} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'statuses'}")
+    for label, samples in sorted(stats.items()):
+        times = [seconds for seconds, _ in samples]
+        statuses = defaultdict(int)
+        for _, status in samples:
+            statuses[status] += 1
+        status_text = ' '.join(f"{status}x{count}" for status, count in sorted(statuses.items()))
+        print(f"{label:<34} {len(samples):>6} {percentile(times, 0.5) * 1000:>8.1f} "
+              f"{percentile(times, 0.95) * 1000:>8.1f} {status_text}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""UI-thread time per write: committing on the calling thread vs handing writes to db_writer.DbWriter.
+
+Writes the battery level of a dedicated "Benchmark Pilot" player in the configured database.
+Run from the repository root: python benchmarks/db_writer.py [writes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db_writer import DbWriter
+from models import DatabaseConnection, Player
+from statements import StatementStats
+
+
+def main():
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    writer = DbWriter()
+    if not writer.start():
+        db.disconnect()
+        return
+    try:
+        player = Player(db)
+        if not player.create_or_get_player("Benchmark Pilot"):
+            return
+
+        inline = StatementStats()
+        start = time.perf_counter()
+        for i in range(writes):
+            call_start = time.perf_counter()
+            db.update_named('player.set_battery', (i % 100, player.id))
+            inline.record(time.perf_counter() - call_start)
+        inline_total = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(writes):
+            writer.submit('player.set_battery', (i % 100, player.id))
+        queued = time.perf_counter() - start
+        ok = writer.flush()
+        writer_total = time.perf_counter() - start
+        submitted = writer.submit_stats['player.set_battery']
+        applied = writer.apply_stats['player.set_battery']
+
+        print(f"inline  {inline.mean_ms * 1000:9.1f} us/write on the UI thread  (max {inline.max_seconds * 1000:.2f} ms), "
+              f"{inline_total:.2f}s total")
+        print(f"writer  {submitted.mean_ms * 1000:9.1f} us/write on the UI thread  (max {submitted.max_seconds * 1000:.2f} ms), "
+              f"{queued * 1000:.1f} ms to queue, {writer_total:.2f}s until flushed{'' if ok else ', with errors'}")
+        print(f"writer  {applied.mean_ms:9.1f} ms mean from submit to commit")
+    finally:
+        writer.stop()
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
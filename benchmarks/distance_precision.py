@@ -0,0 +1,69 @@
+"""Cost and accuracy of each airport_util.DistancePrecision tier on random coordinate pairs.
+
+Errors are relative to ELLIPSOIDAL, and FAST is also compared with STANDARD, which is how the
+DistancePrecision docstring states its bounds. Run from the repository root: python benchmarks/distance_precision.py [pairs]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from airport_util import DistancePrecision, distance_km
+
+# Upper bounds (km) of the distance bands errors are reported for
+BANDS = [100, 1000, 5000, 20100]
+
+
+def random_pairs(count: int, rng: random.Random) -> list[tuple[float, float, float, float]]:
+    pairs = []
+    while len(pairs) < count:
+        lat1, lon1 = rng.uniform(-70, 70), rng.uniform(-180, 180)
+        # Bias towards short hops, which is what ranking mostly sees
+        spread = rng.choice((1, 10, 60, 180))
+        lat2 = max(-80.0, min(80.0, lat1 + rng.uniform(-spread, spread) / 2))
+        lon2 = (lon1 + rng.uniform(-spread, spread) + 180) % 360 - 180
+        pairs.append((lat1, lon1, lat2, lon2))
+    return pairs
+
+
+def time_tier(pairs, precision: DistancePrecision) -> tuple[float, list[float]]:
+    start = time.perf_counter()
+    results = [distance_km(*pair, precision) for pair in pairs]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    pairs = random_pairs(count, random.Random(42))
+
+    timings = {}
+    results = {}
+    for precision in DistancePrecision:
+        time_tier(pairs[:1000], precision)
+        timings[precision], results[precision] = time_tier(pairs, precision)
+
+    reference = results[DistancePrecision.ELLIPSOIDAL]
+    print(f"{'tier':<12} {'ns/pair':>8}   " + "   ".join(f"max err <{band} km" for band in BANDS))
+    for precision in DistancePrecision:
+        columns = "   ".join(f"{error * 100:>14.3f}%" for error in worst_errors(results[precision], reference))
+        print(f"{precision.value:<12} {timings[precision] / count * 1e9:8.0f}   {columns}")
+    columns = "   ".join(f"{error * 100:>14.3f}%"
+                         for error in worst_errors(results[DistancePrecision.FAST], results[DistancePrecision.STANDARD]))
+    print(f"{'fast/std':<12} {'':>8}   {columns}")
+
+
+def worst_errors(values: list[float], reference: list[float]) -> list[float]:
+    """Largest relative error in each distance band"""
+    worst = [0.0] * len(BANDS)
+    for value, expected in zip(values, reference):
+        if expected <= 0:
+            continue
+        band = next(i for i, limit in enumerate(BANDS) if expected < limit or i == len(BANDS) - 1)
+        worst[band] = max(worst[band], abs(value - expected) / expected)
+    return worst
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Text vs server-side prepared execution of the model statements against the configured database.
+
+Run from the repository root: python benchmarks/prepared_statements.py [iterations]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from models import DatabaseConnection
+from statements import StatementRegistry
+
+# Read-only statements that are run every turn, with representative parameters
+WORKLOAD = [
+    ('country.by_code', ('FI',)),
+    ('country.by_name', ('finland',)),
+    ('airport.by_id', (1,)),
+    ('airport.by_name', ('helsinki airport',)),
+    ('airport.by_country', ('FI',)),
+]
+
+
+def run(registry: StatementRegistry, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for name, params in WORKLOAD:
+            registry.query(name, params)
+    return time.perf_counter() - start
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        results = {}
+        for label, prepared in (('text', False), ('prepared', True)):
+            registry = StatementRegistry(db.connection, prepared=prepared)
+            run(registry, 10)
+            registry.stats.clear()
+            results[label] = run(registry, iterations)
+            print(f"--- {label} ---")
+            print(registry.report())
+            registry.close()
+
+        calls = iterations * len(WORKLOAD)
+        for label, seconds in results.items():
+            print(f"{label:<9} {calls / seconds:10.0f} statements/s  {seconds / calls * 1e6:8.1f} us/statement")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Fan-out latency of race_hub.RaceHub with many concurrent races, no database needed.
+
+Every pilot publishes a flight event from a plain thread (as the drivers do) and reads its mailbox
+from a task on the hub loop. Reports publish-to-read latency and how many updates were coalesced.
+Run from the repository root: python benchmarks/race_fanout.py [races] [pilots per race] [flights per pilot]
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from race_hub import RaceEvent, RaceHub
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+async def reader(mailbox, latencies: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        for event in await mailbox.next_batch(timeout=0.05):
+            latencies.append(time.perf_counter() - event.published_at)
+
+
+def main():
+    races = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pilots = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    flights = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    hub = RaceHub(max_pilots_per_race=pilots).start()
+    mailboxes = []
+    for race in range(races):
+        race_id = f"race-{race}"
+        hub.open_race(race_id, race + 1)
+        mailboxes.extend(hub.join(race_id, f"pilot-{pilot}") for pilot in range(pilots))
+
+    latencies: list[float] = []
+    stop = asyncio.Event()
+
+    async def start_readers():
+        return [asyncio.ensure_future(reader(mailbox, latencies, stop)) for mailbox in mailboxes]
+    asyncio.run_coroutine_threadsafe(start_readers(), hub.loop).result()
+
+    def publisher(race_ids: list[str]):
+        for flight in range(flights):
+            for race_id in race_ids:
+                for pilot in range(pilots):
+                    hub.publish(RaceEvent(race_id, f"pilot-{pilot}", 'flight', distance_km=flight))
+            time.sleep(0.001)
+
+    race_ids = [f"race-{race}" for race in range(races)]
+    threads = [threading.Thread(target=publisher, args=(race_ids[i::4],)) for i in range(4)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    time.sleep(0.2)
+    elapsed = time.perf_counter() - start
+    hub.loop.call_soon_threadsafe(stop.set)
+    time.sleep(0.1)
+
+    published = races * pilots * flights
+    sent = published * (pilots - 1)
+    coalesced = sum(mailbox.coalesced for mailbox in mailboxes)
+    print(f"{races} races x {pilots} pilots, {published} events published, {sent} deliveries due, "
+          f"{len(latencies)} read, {coalesced} coalesced, in {elapsed:.2f}s")
+    print(f"latency ms  p50 {percentile(latencies, 0.5) * 1000:.2f}  p95 {percentile(latencies, 0.95) * 1000:.2f}  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}  max {max(latencies, default=0) * 1000:.2f}")
+    hub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Time per RoutePlanner query on a synthetic catalog: plan (through hubs) and plan_exact (every airport).
+
+Run from the repository root: python benchmarks/route_planner.py [airports] [max hop km] [queries]
+
+Also prints how much longer the hub routes are than the exact shortest routes for the same queries.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from airport_store import AirportStore
+from airport_store_memory import synthetic_rows
+from route_planner import RoutePlanner
+
+
+def run(plan, pairs: list[tuple[int, int]]) -> tuple[list[float], list]:
+    times, routes = [], []
+    for from_id, to_id in pairs:
+        start = time.perf_counter()
+        routes.append(plan(from_id, to_id))
+        times.append((time.perf_counter() - start) * 1000)
+    return sorted(times), routes
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def report(label: str, times: list[float]):
+    print(f"{label:<12} p50 {statistics.median(times):8.2f} ms   p90 {percentile(times, 0.9):8.2f} ms   "
+          f"p99 {percentile(times, 0.99):8.2f} ms   max {times[-1]:8.2f} ms")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    max_hop_km = float(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    queries = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    store = AirportStore.from_rows(synthetic_rows(count))
+    rng = random.Random(7)
+    pairs = [(rng.randint(1, count), rng.randint(1, count)) for _ in range(queries)]
+
+    start = time.perf_counter()
+    planner = RoutePlanner(store, max_hop_km)
+    print(f"airports: {count}, max hop: {max_hop_km:.0f} km, queries: {queries}, "
+          f"planner built in {(time.perf_counter() - start) * 1000:.0f} ms")
+    times, hub_routes = run(planner.plan, pairs)
+    report("plan", times)
+    # Same queries again: the end airports' hub lists are cached now
+    report("plan warm", run(planner.plan, pairs)[0])
+
+    exact_pairs = pairs[:min(queries, 50)]
+    times, exact_routes = run(planner.plan_exact, exact_pairs)
+    report("plan_exact", times)
+    stretch = sorted((hub.distance_km / exact.distance_km - 1) * 100
+                     for hub, exact in zip(hub_routes, exact_routes) if hub and exact and exact.distance_km)
+    if stretch:
+        print(f"hub routes longer than exact: median {statistics.median(stretch):.2f} %, max {stretch[-1]:.2f} %")
+
+
+if __name__ == "__main__":
+    main()
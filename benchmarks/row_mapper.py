@@ -0,0 +1,63 @@
+"""Rows/s for turning airport rows into DTOs: dict rows + AirportDto.create vs. the positional RowMapper.
+
+Uses synthetic rows shaped like the airport.by_country result, so no database is needed.
+Run from the repository root: python benchmarks/row_mapper.py [rows]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from data import AirportDto
+from row_mapper import AIRPORT_MAPPER
+
+COLUMNS = ('id', 'icao_code', 'iata_code', 'name', 'city', 'country_code', 'latitude', 'longitude',
+           'elevation_ft', 'continent', 'is_major_hub', 'name_folded', 'created_at', 'country_name')
+
+
+def make_rows(count: int) -> list[tuple]:
+    return [(i + 1, f'K{i:03d}', f'{i:03d}', f'Airport {i}', f'City {i}', 'US', 40.0 + i % 10, -80.0 - i % 10,
+             i % 3000, 'NA', i % 20 == 0, f'airport {i}', None, 'United States') for i in range(count)]
+
+
+def dict_rows_create(rows: list[tuple]) -> list:
+    # What a dictionary cursor plus Dto.create did per row
+    return [AirportDto.create(dict(zip(COLUMNS, row))) for row in rows]
+
+
+def mapper(rows: list[tuple]) -> list:
+    return AIRPORT_MAPPER.map_rows(COLUMNS, rows)
+
+
+def mapper_slots(rows: list[tuple]) -> list:
+    return AIRPORT_MAPPER.map_rows(COLUMNS, rows, slots=True)
+
+
+def measure(label: str, build, rows: list[tuple], repeats: int = 5):
+    build(rows[:1000])
+    best = min(_timed(build, rows) for _ in range(repeats))
+    tracemalloc.start()
+    result = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"{label:<22} {len(rows) / best:12,.0f} rows/s   {size / len(rows):6.0f} bytes/row")
+
+
+def _timed(build, rows: list[tuple]) -> float:
+    start = time.perf_counter()
+    build(rows)
+    return time.perf_counter() - start
+
+
+def main():
+    rows = make_rows(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    measure("dict + create", dict_rows_create, rows)
+    measure("row mapper", mapper, rows)
+    measure("row mapper, slots", mapper_slots, rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import random
+from collections import deque
+from typing import Generic, Iterable, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted sample"""
+
+    def __init__(self, weights: list[float]):
+        count = len(weights)
+        total = sum(weights)
+        self.probabilities = [0.0] * count
+        self.aliases = [0] * count
+        if count == 0 or total <= 0:
+            return
+
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.probabilities[low] = scaled[low]
+            self.aliases[low] = high
+            scaled[high] = scaled[high] + scaled[low] - 1.0
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is 1.0 up to rounding error
+        for i in small + large:
+            self.probabilities[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.probabilities)
+
+    def sample(self, rng: random.Random) -> int:
+        column = rng.randrange(len(self.probabilities))
+        return column if rng.random() < self.probabilities[column] else self.aliases[column]
+
+
+class _Bucket(Generic[T]):
+    def __init__(self):
+        self.airports: list[T] = []
+        self.table: AliasTable | None = None
+
+
+class BossSampler(Generic[T]):
+    """Picks boss airports with every continent equally likely, and airports picked recently less likely.
+
+    Candidates are bucketed by continent, each with its own alias table. Adding or removing an airport,
+    or an airport entering or leaving the recent-picks window, only rebuilds the tables it touches.
+    """
+
+    def __init__(self, balance_continents: bool = True, recent_window: int = 10, recent_weight: float = 0.25,
+                 rng: random.Random | None = None):
+        self.balance_continents = balance_continents
+        self.recent_weight = recent_weight
+        self.rng = rng or random.Random()
+        self._buckets: dict[str, _Bucket[T]] = {}
+        self._recent: deque[int] = deque(maxlen=max(0, recent_window))
+        self._recent_counts: dict[int, int] = {}
+        self._continent_of: dict[int, str] = {}
+        self._continents: list[str] = []
+        self._continent_table: AliasTable | None = None
+        self._dirty: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._continent_of)
+
+    def add_airport(self, airport: T):
+        if airport.id in self._continent_of:
+            self.remove_airport(airport.id)
+        bucket = self._buckets.setdefault(airport.continent, _Bucket())
+        bucket.airports.append(airport)
+        self._continent_of[airport.id] = airport.continent
+        self._mark_dirty(airport.continent)
+
+    def remove_airport(self, airport_id: int):
+        continent = self._continent_of.pop(airport_id, None)
+        if continent is None:
+            return
+        bucket = self._buckets[continent]
+        bucket.airports = [airport for airport in bucket.airports if airport.id != airport_id]
+        if not bucket.airports:
+            del self._buckets[continent]
+        self._mark_dirty(continent)
+
+    def sync(self, airports: Iterable[T]):
+        """Bring the candidate set in line with airports, touching only the continents that changed"""
+        incoming = {airport.id: airport for airport in airports}
+        for airport_id in [i for i in self._continent_of if i not in incoming]:
+            self.remove_airport(airport_id)
+        for airport_id, airport in incoming.items():
+            if self._continent_of.get(airport_id) != airport.continent:
+                self.add_airport(airport)
+
+    def record_usage(self, airport_id: int):
+        if not self._recent.maxlen:
+            # A window of 0 turns recency weighting off
+            return
+        if len(self._recent) == self._recent.maxlen:
+            expired = self._recent[0]
+            self._recent_counts[expired] -= 1
+            if not self._recent_counts[expired]:
+                del self._recent_counts[expired]
+            self._mark_dirty(self._continent_of.get(expired))
+        self._recent.append(airport_id)
+        self._recent_counts[airport_id] = self._recent_counts.get(airport_id, 0) + 1
+        self._mark_dirty(self._continent_of.get(airport_id))
+
+    def sample(self) -> Optional[T]:
+        self._rebuild_dirty()
+        if not self._continents:
+            return None
+        bucket = self._buckets[self._continents[self._continent_table.sample(self.rng)]]
+        return bucket.airports[bucket.table.sample(self.rng)]
+
+    def _mark_dirty(self, continent: str | None):
+        if continent is not None:
+            self._dirty.add(continent)
+
+    def _weight(self, airport: T) -> float:
+        return self.recent_weight ** self._recent_counts.get(airport.id, 0)
+
+    def _rebuild_dirty(self):
+        if not self._dirty:
+            return
+        for continent in self._dirty:
+            bucket = self._buckets.get(continent)
+            if bucket:
+                bucket.table = AliasTable([self._weight(airport) for airport in bucket.airports])
+        self._dirty.clear()
+
+        # At most one bucket per continent, so the top level table is always cheap to rebuild
+        self._continents = sorted(self._buckets)
+        if self.balance_continents:
+            weights = [1.0] * len(self._continents)
+        else:
+            weights = [sum(self._weight(a) for a in self._buckets[c].airports) for c in self._continents]
+        self._continent_table = AliasTable(weights)
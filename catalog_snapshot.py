@@ -0,0 +1,309 @@
+"""Precompiled, memory-mapped copy of the country and airport tables.
+
+Build it with:  python catalog_snapshot.py build [path]
+
+File layout (little-endian):
+    header
+    country records      fixed width, sorted by name
+    airport records      fixed width, grouped by country (hubs first, then name)
+    country code index   (code, record) sorted by code
+    country name index   (string ref, record) sorted by folded name
+    airport id index     (id, record) sorted by id
+    airport name index   (string ref, record) sorted by folded name
+    string table         utf-8, deduplicated
+"""
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Callable, List, Optional
+
+from airport_store import AirportStore
+from config import Config
+from data import AirportDto, CountryDto
+from text_utils import fold_name
+
+MAGIC = b'BFCS'
+FORMAT_VERSION = 3
+
+HEADER = struct.Struct('<4sHHdIIIIQQQQQQQQQ')
+COUNTRY_RECORD = struct.Struct('<2s2sIHII')
+AIRPORT_RECORD = struct.Struct('<i4s3s2s2sddiBIHIH')
+CODE_INDEX_ENTRY = struct.Struct('<2sI')
+NAME_INDEX_ENTRY = struct.Struct('<IHI')
+ID_INDEX_ENTRY = struct.Struct('<iI')
+
+
+def _code(raw: bytes) -> str:
+    return raw.rstrip(b'\0').decode('ascii')
+
+
+class _StringTable:
+    def __init__(self):
+        self.data = bytearray()
+        self.refs: dict[str, tuple[int, int]] = {}
+
+    def add(self, text: str) -> tuple[int, int]:
+        ref = self.refs.get(text)
+        if ref is None:
+            encoded = text.encode('utf-8')
+            ref = (len(self.data), len(encoded))
+            self.data += encoded
+            self.refs[text] = ref
+        return ref
+
+
+def write_snapshot(path: str, countries: List[CountryDto], airports: AirportStore, fingerprint: tuple[int, int, int, int]) -> None:
+    """Write countries and airports to path, replacing any previous snapshot atomically"""
+    strings = _StringTable()
+    countries = sorted(countries, key=lambda c: fold_name(c.name))
+    country_position = {country.code: i for i, country in enumerate(countries)}
+
+    airport_order = sorted(range(len(airports)), key=lambda i: (
+        country_position.get(airports.country_codes[airports.country_indexes[i]], len(countries)),
+        -airports.hub_flags[i],
+        airports.names[i]))
+
+    airport_ranges: dict[str, list[int]] = {}
+    airport_blob = bytearray()
+    for record, i in enumerate(airport_order):
+        view = airports.view(i)
+        first_count = airport_ranges.setdefault(view.country_code, [record, 0])
+        first_count[1] += 1
+        name_off, name_len = strings.add(view.name)
+        city_off, city_len = strings.add(view.city)
+        airport_blob += AIRPORT_RECORD.pack(
+            view.id, view.icao_code.encode('ascii'), view.iata_code.encode('ascii'),
+            view.country_code.encode('ascii'), view.continent.encode('ascii'),
+            view.latitude, view.longitude, view.elevation_ft, 1 if view.is_major_hub else 0,
+            name_off, name_len, city_off, city_len)
+
+    country_blob = bytearray()
+    for country in countries:
+        name_off, name_len = strings.add(country.name)
+        first, count = airport_ranges.get(country.code, (0, 0))
+        country_blob += COUNTRY_RECORD.pack(
+            country.code.encode('ascii'), country.continent.encode('ascii'), name_off, name_len, first, count)
+
+    country_code_index = bytearray()
+    for code, record in sorted((c.code, i) for i, c in enumerate(countries)):
+        country_code_index += CODE_INDEX_ENTRY.pack(code.encode('ascii'), record)
+
+    country_name_index = bytearray()
+    for folded, record in sorted((fold_name(c.name), i) for i, c in enumerate(countries)):
+        off, length = strings.add(folded)
+        country_name_index += NAME_INDEX_ENTRY.pack(off, length, record)
+
+    airport_id_index = bytearray()
+    airport_name_index = bytearray()
+    id_entries = []
+    name_entries = []
+    for record, i in enumerate(airport_order):
+        id_entries.append((airports.ids[i], record))
+        name_entries.append((fold_name(airports.names[i]), record))
+    for airport_id, record in sorted(id_entries):
+        airport_id_index += ID_INDEX_ENTRY.pack(airport_id, record)
+    for folded, record in sorted(name_entries):
+        off, length = strings.add(folded)
+        airport_name_index += NAME_INDEX_ENTRY.pack(off, length, record)
+
+    sections = [country_blob, airport_blob, country_code_index, country_name_index,
+                airport_id_index, airport_name_index, strings.data]
+    offsets = []
+    position = HEADER.size
+    for section in sections:
+        offsets.append(position)
+        position += len(section)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, time.time(), len(countries), len(airport_order),
+                         fingerprint[1], fingerprint[2], *offsets, len(strings.data), fingerprint[3])
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    os.replace(temp_path, path)
+
+
+class CatalogSnapshot:
+    """Read-only catalog backed by an mmap'd snapshot file; answers the same lookups as the Country and Airport models"""
+
+    def __init__(self, path: str, file, data: mmap.mmap):
+        self.path = path
+        self._file = file
+        self._data = data
+        (magic, version, _, self.built_at, self.country_count, self.airport_count,
+         max_airport_id, source_country_count, self._countries_at, self._airports_at,
+         self._country_codes_at, self._country_names_at, self._airport_ids_at,
+         self._airport_names_at, self._strings_at, _, content_checksum) = HEADER.unpack_from(data, 0)
+        self.fingerprint = (self.airport_count, max_airport_id, source_country_count, content_checksum)
+
+    @classmethod
+    def open(cls, path: str) -> Optional['CatalogSnapshot']:
+        """Map the snapshot at path, or return None if it is missing or from another format version"""
+        try:
+            file = open(path, 'rb')
+        except OSError:
+            return None
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            file.close()
+            return None
+        if len(data) < HEADER.size or data[:4] != MAGIC or \
+                struct.unpack_from('<H', data, 4)[0] != FORMAT_VERSION:
+            data.close()
+            file.close()
+            return None
+        return cls(path, file, data)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def is_stale(self, max_age_seconds: float, fingerprint: tuple[int, int, int, int] | None = None) -> bool:
+        if time.time() - self.built_at > max_age_seconds:
+            return True
+        return fingerprint is not None and tuple(fingerprint) != self.fingerprint
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_at + offset
+        return self._data[start:start + length].decode('utf-8')
+
+    def _country(self, record: int) -> CountryDto:
+        code, continent, name_off, name_len, _, _ = COUNTRY_RECORD.unpack_from(
+            self._data, self._countries_at + record * COUNTRY_RECORD.size)
+        return CountryDto(code=_code(code), name=self._string(name_off, name_len), continent=_code(continent))
+
+    def _airport_fields(self, record: int) -> tuple:
+        return AIRPORT_RECORD.unpack_from(self._data, self._airports_at + record * AIRPORT_RECORD.size)
+
+    def _airport(self, record: int) -> AirportDto:
+        (airport_id, icao, iata, country_code, continent, latitude, longitude, elevation, _,
+         name_off, name_len, city_off, city_len) = self._airport_fields(record)
+        return AirportDto(
+            id=airport_id,
+            icao_code=_code(icao),
+            iata_code=_code(iata),
+            name=self._string(name_off, name_len),
+            city=self._string(city_off, city_len),
+            country_code=_code(country_code),
+            latitude=latitude,
+            longitude=longitude,
+            elevation_ft=elevation,
+            continent=_code(continent)
+        )
+
+    def _search(self, index_at: int, entry: struct.Struct, count: int, key, key_of: Callable) -> Optional[int]:
+        """Binary search a sorted index section, returning the matching record number"""
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            fields = entry.unpack_from(self._data, index_at + middle * entry.size)
+            current = key_of(fields)
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return fields[-1]
+        return None
+
+    def _name_key(self, fields) -> str:
+        return self._string(fields[0], fields[1])
+
+    def get_all_countries(self) -> List[CountryDto]:
+        return [self._country(record) for record in range(self.country_count)]
+
+    def get_country_by_name(self, name: str) -> Optional[CountryDto]:
+        record = self._search(self._country_names_at, NAME_INDEX_ENTRY, self.country_count,
+                              fold_name(name), self._name_key)
+        return self._country(record) if record is not None else None
+
+    def get_country_by_code(self, code: str) -> Optional[CountryDto]:
+        record = self._search(self._country_codes_at, CODE_INDEX_ENTRY, self.country_count,
+                              code.encode('ascii', 'replace'), lambda fields: fields[0])
+        return self._country(record) if record is not None else None
+
+    def get_airports_by_country(self, country: CountryDto) -> List[AirportDto]:
+        record = self._search(self._country_codes_at, CODE_INDEX_ENTRY, self.country_count,
+                              country.code.encode('ascii', 'replace'), lambda fields: fields[0])
+        if record is None:
+            return []
+        _, _, _, _, first, count = COUNTRY_RECORD.unpack_from(
+            self._data, self._countries_at + record * COUNTRY_RECORD.size)
+        return [self._airport(i) for i in range(first, first + count)]
+
+    def get_airport_by_name(self, name: str) -> Optional[AirportDto]:
+        record = self._search(self._airport_names_at, NAME_INDEX_ENTRY, self.airport_count,
+                              fold_name(name), self._name_key)
+        return self._airport(record) if record is not None else None
+
+    def get_airport_by_id(self, airport_id: int) -> Optional[AirportDto]:
+        record = self._search(self._airport_ids_at, ID_INDEX_ENTRY, self.airport_count,
+                              airport_id, lambda fields: fields[0])
+        return self._airport(record) if record is not None else None
+
+    def to_airport_store(self) -> AirportStore:
+        store = AirportStore()
+        for record in range(self.airport_count):
+            (airport_id, icao, iata, country_code, continent, latitude, longitude, elevation, hub,
+             name_off, name_len, city_off, city_len) = self._airport_fields(record)
+            store.add(airport_id, _code(icao), _code(iata), self._string(name_off, name_len),
+                      self._string(city_off, city_len), _code(country_code), latitude, longitude,
+                      elevation, _code(continent), bool(hub))
+        return store
+
+
+def build_snapshot(db, path: str = Config.CATALOG_SNAPSHOT_PATH,
+                   fingerprint: tuple[int, int, int, int] | None = None) -> bool:
+    """Write a fresh snapshot; False if the tables are empty or the file cannot be written.
+
+    Pass the fingerprint if it is already known: it scans the whole airport table. Taken before the
+    rows are read, a change made meanwhile leaves the snapshot stale instead of wrongly fresh.
+    """
+    from models import Airport, Country
+
+    if fingerprint is None:
+        fingerprint = Airport(db).get_catalog_fingerprint()
+    countries = Country(db).get_all_countries()
+    airports = Airport(db).load_airport_store()
+    if not countries or not len(airports):
+        return False
+    try:
+        write_snapshot(path, countries, airports, fingerprint)
+    except OSError as e:
+        # e.g. disk full, or on Windows another process still has the old snapshot mapped
+        print(f"Could not write catalog snapshot {path}: {e}")
+        if os.path.exists(path + '.tmp'):
+            os.remove(path + '.tmp')
+        return False
+    return True
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("Usage: python catalog_snapshot.py build [path]")
+        return
+    from models import DatabaseConnection
+
+    path = sys.argv[2] if len(sys.argv) > 2 else Config.CATALOG_SNAPSHOT_PATH
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        start = time.perf_counter()
+        if build_snapshot(db, path):
+            snapshot = CatalogSnapshot.open(path)
+            print(f"Wrote {snapshot.country_count} countries and {snapshot.airport_count} airports "
+                  f"to {path} in {time.perf_counter() - start:.2f}s")
+            snapshot.close()
+        else:
+            print("Nothing to write, the catalog tables are empty.")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
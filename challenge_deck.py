@@ -0,0 +1,45 @@
+import random
+from typing import Optional
+
+# (ChallengeType value, question id)
+Card = tuple[str, int]
+
+
+class ChallengeDeck:
+    """Questions for one session, shuffled once and dealt in order so none repeats until the deck runs out"""
+
+    def __init__(self, cards: list[Card], seed: int | None = None, cursor: int = 0):
+        self.cards: list[Card] = sorted(cards)
+        self.seed: int = seed if seed is not None else random.getrandbits(63)
+        self.cursor: int = cursor
+        self.order: list[Card] = self._shuffled(self.seed)
+
+    def _shuffled(self, seed: int) -> list[Card]:
+        order = list(self.cards)
+        random.Random(seed).shuffle(order)
+        return order
+
+    def draw(self) -> Optional[Card]:
+        if not self.order:
+            return None
+        if self.cursor >= len(self.order):
+            self.reshuffle()
+        card = self.order[self.cursor]
+        self.cursor += 1
+        return card
+
+    def reshuffle(self):
+        # Derived from the previous seed so a restored deck reshuffles the same way
+        self.seed = random.Random(self.seed).getrandbits(63)
+        self.order = self._shuffled(self.seed)
+        self.cursor = 0
+
+    def remaining(self) -> int:
+        return len(self.order) - self.cursor
+
+    def to_state(self) -> dict:
+        return {'seed': self.seed, 'cursor': self.cursor}
+
+    @classmethod
+    def from_state(cls, cards: list[Card], state: dict) -> 'ChallengeDeck':
+        return cls(cards, seed=state.get('seed'), cursor=state.get('cursor', 0))
@@ -1,8 +1,8 @@
 import os
-from dotenv import load_dotenv
 from data import Difficulty
+from startup_profile import timed_import
 
-load_dotenv()
+timed_import('dotenv').load_dotenv()
 
 
 class Config:
@@ -11,10 +11,64 @@ class Config:
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'project_03')
     DB_PORT = int(os.getenv('DB_PORT', '3306'))
+    DB_PREPARED_STATEMENTS = os.getenv('DB_PREPARED_STATEMENTS', 'true').lower() == 'true'
+
+    # Read replicas for static data, comma separated host[:port][/database]; empty means primary only
+    DB_REPLICA_HOSTS = os.getenv('DB_REPLICA_HOSTS', '')
+    DB_REPLICA_USER = os.getenv('DB_REPLICA_USER', '')
+    DB_REPLICA_PASSWORD = os.getenv('DB_REPLICA_PASSWORD', '')
+    # Also read player, session and save rows from replicas, except right after this process wrote
+    DB_REPLICA_SESSION_READS = os.getenv('DB_REPLICA_SESSION_READS', 'false').lower() == 'true'
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', '5'))
+
+    CATALOG_SNAPSHOT_PATH = os.getenv('CATALOG_SNAPSHOT_PATH', 'catalog.snapshot')
+    CATALOG_SNAPSHOT_MAX_AGE_HOURS = float(os.getenv('CATALOG_SNAPSHOT_MAX_AGE_HOURS', '168'))
+    CATALOG_SNAPSHOT_AUTO_REBUILD = os.getenv('CATALOG_SNAPSHOT_AUTO_REBUILD', 'true').lower() == 'true'
+    DISTANCE_MATRIX_PATH = os.getenv('DISTANCE_MATRIX_PATH', 'distances.npy')
+
+    API_HOST = os.getenv('API_HOST', '127.0.0.1')
+    API_PORT = int(os.getenv('API_PORT', '8080'))
+    API_WORKERS = int(os.getenv('API_WORKERS', '8'))
+    # Each pilot holds a driver with its own connections; idle ones are terminated, and past the cap
+    # POST /players answers 503
+    API_MAX_SESSIONS = int(os.getenv('API_MAX_SESSIONS', '200'))
+    API_SESSION_IDLE_SECONDS = float(os.getenv('API_SESSION_IDLE_SECONDS', '1800'))
+
+    # 'json' rewrites the whole save every turn, 'delta' appends only what changed
+    SAVE_STORAGE_MODE = os.getenv('SAVE_STORAGE_MODE', 'json').lower()
+    SAVE_DELTA_COMPACT_EVERY = int(os.getenv('SAVE_DELTA_COMPACT_EVERY', '20'))
+
+    # Local write-ahead journal of session changes; an empty path turns it off
+    TURN_JOURNAL_PATH = os.getenv('TURN_JOURNAL_PATH', 'turns.journal')
+    TURN_JOURNAL_SYNC_MS = float(os.getenv('TURN_JOURNAL_SYNC_MS', '50'))
+    TURN_JOURNAL_DRAIN_SECONDS = float(os.getenv('TURN_JOURNAL_DRAIN_SECONDS', '1'))
+
+    # Play from local snapshots when the database is unreachable, synced on the next connected start
+    OFFLINE_MODE = os.getenv('OFFLINE_MODE', 'true').lower() == 'true'
+    QUESTION_SNAPSHOT_PATH = os.getenv('QUESTION_SNAPSHOT_PATH', 'questions.snapshot')
+    OFFLINE_STORE_PATH = os.getenv('OFFLINE_STORE_PATH', 'offline_store.json')
+    OFFLINE_SYNC_BATCH_SIZE = int(os.getenv('OFFLINE_SYNC_BATCH_SIZE', '50'))
+
+    # Apply session and save writes on a background thread instead of the UI thread
+    DB_WRITER_ENABLED = os.getenv('DB_WRITER_ENABLED', 'true').lower() == 'true'
+    # Longest a flush waits for queued writes before the game carries on without them
+    DB_WRITER_FLUSH_SECONDS = float(os.getenv('DB_WRITER_FLUSH_SECONDS', '10'))
+
+    # maintenance.py: how long finished sessions stay in game_session, and how hard the job pushes
+    MAINTENANCE_RETENTION_DAYS = int(os.getenv('MAINTENANCE_RETENTION_DAYS', '90'))
+    MAINTENANCE_BATCH_SIZE = int(os.getenv('MAINTENANCE_BATCH_SIZE', '200'))
+    MAINTENANCE_PAUSE_SECONDS = float(os.getenv('MAINTENANCE_PAUSE_SECONDS', '0.2'))
 
     # Game settings ?
     DEFAULT_BATTERY = int(os.getenv('DEFAULT_BATTERY', '100'))
 
+    BOSS_BALANCE_CONTINENTS = os.getenv('BOSS_BALANCE_CONTINENTS', 'true').lower() == 'true'
+    BOSS_RECENT_WINDOW = int(os.getenv('BOSS_RECENT_WINDOW', '10'))
+    BOSS_RECENT_WEIGHT = float(os.getenv('BOSS_RECENT_WEIGHT', '0.25'))
+
+    # Longest single flight the route planner will use
+    ROUTE_MAX_HOP_KM = float(os.getenv('ROUTE_MAX_HOP_KM', '2500'))
+
     BATTERY_CONSUMPTION_PER_GUESS = int(os.getenv('BATTERY_CONSUMPTION_PER_GUESS', '10'))
     BATTERY_REWARD_PER_PUZZLE = int(os.getenv('BATTERY_REWARD_PER_PUZZLE', '15'))
 
@@ -54,6 +108,12 @@ class Config:
         Difficulty.HARD: os.getenv('SHOW_CORRECT_COUNTRY_HARD', 'false').lower() == 'true'
     }
 
+    SHOW_PROXIMITY_HINT_BY_DIFFICULTY = {
+        Difficulty.EASY: os.getenv('SHOW_PROXIMITY_HINT_EASY', 'true').lower() == 'true',
+        Difficulty.MEDIUM: os.getenv('SHOW_PROXIMITY_HINT_MEDIUM', 'true').lower() == 'true',
+        Difficulty.HARD: os.getenv('SHOW_PROXIMITY_HINT_HARD', 'false').lower() == 'true'
+    }
+
     DIFFICULTY_LEVELS = ['easy', 'medium', 'hard']
 
     @classmethod
@@ -80,6 +140,10 @@ class Config:
     def allow_show_correct_country(cls, difficulty: Difficulty) -> bool:
         return cls.SHOW_CORRECT_COUNTRY_BY_DIFFICULTY.get(difficulty, False)
 
+    @classmethod
+    def allow_show_proximity_hint(cls, difficulty: Difficulty) -> bool:
+        return cls.SHOW_PROXIMITY_HINT_BY_DIFFICULTY.get(difficulty, False)
+
     @classmethod
     def get_db_config(cls):
         return {
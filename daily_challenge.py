@@ -0,0 +1,37 @@
+import hashlib
+import random
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from airport_store import AirportStore
+from data import DailyChallengeDto, Difficulty
+
+
+def today() -> date:
+    """Days roll over at midnight UTC so every player shares the same challenge"""
+    return datetime.now(timezone.utc).date()
+
+
+def daily_seed(day: date, difficulty: Difficulty) -> int:
+    digest = hashlib.sha256(f"{day.isoformat()}:{difficulty.value}".encode('ascii')).digest()
+    return int.from_bytes(digest[:8], 'big') >> 1
+
+
+def derive_daily_challenge(day: date, difficulty: Difficulty, store: AirportStore) -> Optional[DailyChallengeDto]:
+    """Boss, starting airport and deck seed for a day, the same on every machine with the same catalog.
+
+    The boss is a major hub and the start is a hub on another continent where there is one.
+    """
+    hubs = sorted((airport for airport in store if airport.is_major_hub), key=lambda airport: airport.id)
+    if not hubs:
+        hubs = sorted(store, key=lambda airport: airport.id)
+    if not hubs:
+        return None
+
+    rng = random.Random(daily_seed(day, difficulty))
+    boss = rng.choice(hubs)
+    starts = [airport for airport in hubs if airport.continent != boss.continent] or \
+             [airport for airport in hubs if airport.id != boss.id] or hubs
+    start = rng.choice(starts)
+    return DailyChallengeDto(challenge_date=day, difficulty=difficulty, boss_airport_id=boss.id,
+                             starting_airport_id=start.id, deck_seed=rng.getrandbits(63))
@@ -1,4 +1,5 @@
 ﻿from dataclasses import dataclass
+from datetime import date
 from enum import Enum, auto
 from typing import Generic, TypeVar, Optional
 
@@ -49,6 +50,7 @@ class GameResult(Enum):
 class MainMenuResult(Enum):
     NEW_GAME = auto()
     CONTINUE = auto()
+    DAILY = auto()
     CHANGE_PILOT = auto()
     QUIT = auto()
 
@@ -156,6 +158,44 @@ class CountryDto:
         )
 
 
+@dataclass
+class DailyChallengeDto:
+    challenge_date: date
+    difficulty: Difficulty
+    boss_airport_id: int
+    starting_airport_id: int
+    deck_seed: int
+
+    @classmethod
+    def create(cls, Dict) -> 'DailyChallengeDto':
+        return cls(
+            challenge_date=Dict['challenge_date'],
+            difficulty=Difficulty(Dict['difficulty_level']),
+            boss_airport_id=Dict['boss_airport_id'],
+            starting_airport_id=Dict['starting_airport_id'],
+            deck_seed=int(Dict['deck_seed']),
+        )
+
+
+@dataclass
+class DailyResultDto:
+    player_name: str
+    status: SessionStatus
+    countries_visited: int
+    puzzles_solved: int
+    battery_level: int
+
+    @classmethod
+    def create(cls, Dict) -> 'DailyResultDto':
+        return cls(
+            player_name=Dict.get('player_name', ''),
+            status=SessionStatus(Dict.get('status', 'lost')),
+            countries_visited=Dict.get('countries_visited', 0),
+            puzzles_solved=Dict.get('puzzles_solved', 0),
+            battery_level=Dict.get('battery_level', 0),
+        )
+
+
 @dataclass
 class GameSaveDto:
     id: int
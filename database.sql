@@ -1,9 +1,14 @@
 
 USE project_03;
 
+DROP TABLE IF EXISTS game_session_archive;
+DROP TABLE IF EXISTS offline_sync;
+DROP TABLE IF EXISTS daily_result;
+DROP TABLE IF EXISTS daily_challenge;
 DROP TABLE IF EXISTS multiple_choice_answer;
 DROP TABLE IF EXISTS multiple_choice_question;
 DROP TABLE IF EXISTS question_task;
+DROP TABLE IF EXISTS game_save_delta;
 DROP TABLE IF EXISTS game_save;
 DROP TABLE IF EXISTS game_session;
 DROP TABLE IF EXISTS airport;
@@ -14,9 +19,11 @@ CREATE TABLE `country` (
   `code` varchar(2) NOT NULL,
   `name` varchar(100) NOT NULL,
   `continent` enum('EU','NA','AS','AF','SA','OC','AN') NOT NULL,
+  `name_folded` varchar(100) DEFAULT NULL,
   `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`code`),
-  INDEX `idx_country_continent` (`continent`)
+  INDEX `idx_country_continent` (`continent`),
+  INDEX `idx_country_name_folded` (`name_folded`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 CREATE TABLE `airport` (
@@ -31,12 +38,14 @@ CREATE TABLE `airport` (
   `elevation_ft` int(11) DEFAULT NULL,
   `continent` varchar(2) NOT NULL,
   `is_major_hub` boolean DEFAULT false,
+  `name_folded` varchar(150) DEFAULT NULL,
   `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
   UNIQUE KEY `uq_airport_icao` (`icao_code`),
   UNIQUE KEY `uq_airport_iata` (`iata_code`),
   KEY `idx_airport_country` (`country_code`),
   KEY `idx_airport_hub` (`is_major_hub`),
+  KEY `idx_airport_name_folded` (`name_folded`),
   FOREIGN KEY (`country_code`) REFERENCES `country` (`code`) ON UPDATE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -117,6 +126,8 @@ CREATE TABLE `game_save` (
   `player_id` int(11) NOT NULL,
   `save_name` varchar(100) NOT NULL DEFAULT 'autosave',
   `game_data` json NOT NULL,
+  `base_blob` mediumblob NULL,
+  `base_seq` int(11) NOT NULL DEFAULT 0,
   `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
   `updated_at` timestamp DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
   PRIMARY KEY (`id`),
@@ -124,219 +135,279 @@ CREATE TABLE `game_save` (
   FOREIGN KEY (`player_id`) REFERENCES `player` (`id`) ON DELETE CASCADE
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
-INSERT INTO `country` (`code`, `name`, `continent`) VALUES
-('AD', 'Andorra', 'EU'),
-('AL', 'Albania', 'EU'),
-('AT', 'Austria', 'EU'),
-('BA', 'Bosnia and Herzegovina', 'EU'),
-('BE', 'Belgium', 'EU'),
-('BG', 'Bulgaria', 'EU'),
-('BY', 'Belarus', 'EU'),
-('CH', 'Switzerland', 'EU'),
-('CZ', 'Czech Republic', 'EU'),
-('DE', 'Germany', 'EU'),
-('DK', 'Denmark', 'EU'),
-('EE', 'Estonia', 'EU'),
-('ES', 'Spain', 'EU'),
-('FI', 'Finland', 'EU'),
-('FR', 'France', 'EU'),
-('GB', 'United Kingdom', 'EU'),
-('GR', 'Greece', 'EU'),
-('HR', 'Croatia', 'EU'),
-('HU', 'Hungary', 'EU'),
-('IE', 'Ireland', 'EU'),
-('IS', 'Iceland', 'EU'),
-('IT', 'Italy', 'EU'),
-('LT', 'Lithuania', 'EU'),
-('LU', 'Luxembourg', 'EU'),
-('LV', 'Latvia', 'EU'),
-('MT', 'Malta', 'EU'),
-('NL', 'Netherlands', 'EU'),
-('NO', 'Norway', 'EU'),
-('PL', 'Poland', 'EU'),
-('PT', 'Portugal', 'EU'),
-('RO', 'Romania', 'EU'),
-('RS', 'Serbia', 'EU'),
-('RU', 'Russia', 'EU'),
-('SE', 'Sweden', 'EU'),
-('SI', 'Slovenia', 'EU'),
-('SK', 'Slovakia', 'EU'),
-('UA', 'Ukraine', 'EU'),
-('AE', 'United Arab Emirates', 'AS'),
-('AF', 'Afghanistan', 'AS'),
-('BD', 'Bangladesh', 'AS'),
-('BH', 'Bahrain', 'AS'),
-('BN', 'Brunei', 'AS'),
-('CN', 'China', 'AS'),
-('ID', 'Indonesia', 'AS'),
-('IL', 'Israel', 'AS'),
-('IN', 'India', 'AS'),
-('IQ', 'Iraq', 'AS'),
-('IR', 'Iran', 'AS'),
-('JO', 'Jordan', 'AS'),
-('JP', 'Japan', 'AS'),
-('KH', 'Cambodia', 'AS'),
-('KR', 'South Korea', 'AS'),
-('KW', 'Kuwait', 'AS'),
-('LA', 'Laos', 'AS'),
-('LB', 'Lebanon', 'AS'),
-('LK', 'Sri Lanka', 'AS'),
-('MM', 'Myanmar', 'AS'),
-('MN', 'Mongolia', 'AS'),
-('MY', 'Malaysia', 'AS'),
-('NP', 'Nepal', 'AS'),
-('OM', 'Oman', 'AS'),
-('PH', 'Philippines', 'AS'),
-('PK', 'Pakistan', 'AS'),
-('QA', 'Qatar', 'AS'),
-('SA', 'Saudi Arabia', 'AS'),
-('SG', 'Singapore', 'AS'),
-('TH', 'Thailand', 'AS'),
-('TR', 'Turkey', 'AS'),
-('TW', 'Taiwan', 'AS'),
-('UZ', 'Uzbekistan', 'AS'),
-('VN', 'Vietnam', 'AS'),
-('CA', 'Canada', 'NA'),
-('MX', 'Mexico', 'NA'),
-('US', 'United States', 'NA'),
-('AR', 'Argentina', 'SA'),
-('BO', 'Bolivia', 'SA'),
-('BR', 'Brazil', 'SA'),
-('CL', 'Chile', 'SA'),
-('CO', 'Colombia', 'SA'),
-('EC', 'Ecuador', 'SA'),
-('PE', 'Peru', 'SA'),
-('UY', 'Uruguay', 'SA'),
-('VE', 'Venezuela', 'SA'),
-('DZ', 'Algeria', 'AF'),
-('EG', 'Egypt', 'AF'),
-('ET', 'Ethiopia', 'AF'),
-('GH', 'Ghana', 'AF'),
-('KE', 'Kenya', 'AF'),
-('MA', 'Morocco', 'AF'),
-('NG', 'Nigeria', 'AF'),
-('TN', 'Tunisia', 'AF'),
-('ZA', 'South Africa', 'AF'),
-('AU', 'Australia', 'OC'),
-('FJ', 'Fiji', 'OC'),
-('NZ', 'New Zealand', 'OC');
+CREATE TABLE `game_save_delta` (
+  `save_id` int(11) NOT NULL,
+  `seq` int(11) NOT NULL,
+  `delta` blob NOT NULL,
+  `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`save_id`, `seq`),
+  FOREIGN KEY (`save_id`) REFERENCES `game_save` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `daily_challenge` (
+  `challenge_date` date NOT NULL,
+  `difficulty_level` enum('easy','medium','hard') NOT NULL,
+  `boss_airport_id` int(11) NOT NULL,
+  `starting_airport_id` int(11) NOT NULL,
+  `deck_seed` bigint NOT NULL,
+  `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`challenge_date`, `difficulty_level`),
+  FOREIGN KEY (`boss_airport_id`) REFERENCES `airport` (`id`),
+  FOREIGN KEY (`starting_airport_id`) REFERENCES `airport` (`id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `daily_result` (
+  `challenge_date` date NOT NULL,
+  `difficulty_level` enum('easy','medium','hard') NOT NULL,
+  `player_id` int(11) NOT NULL,
+  `session_id` int(11) NOT NULL,
+  `status` enum('won','lost','abandoned') NOT NULL,
+  `countries_visited` int(11) NOT NULL,
+  `puzzles_solved` int(11) NOT NULL,
+  `battery_level` int(11) NOT NULL,
+  `completed_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`challenge_date`, `difficulty_level`, `player_id`),
+  KEY `idx_daily_result_board` (`challenge_date`, `difficulty_level`, `status`, `countries_visited`),
+  FOREIGN KEY (`player_id`) REFERENCES `player` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `offline_sync` (
+  `op_id` char(32) NOT NULL,
+  `entity` varchar(16) NOT NULL,
+  `remote_id` int(11) NOT NULL,
+  `synced_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`op_id`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE `game_session_archive` (
+  `id` int(11) NOT NULL,
+  `player_id` int(11) NOT NULL,
+  `status` enum('active','won','lost','abandoned') NOT NULL,
+  `difficulty_level` enum('easy','medium','hard') NOT NULL,
+  `score` int(11) NOT NULL DEFAULT 0,
+  `started_at` timestamp NULL DEFAULT NULL,
+  `completed_at` timestamp NULL DEFAULT NULL,
+  `session_blob` blob NOT NULL,
+  `archived_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_session_archive_player` (`player_id`),
+  FOREIGN KEY (`player_id`) REFERENCES `player` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+INSERT INTO `country` (`code`, `name`, `continent`, `name_folded`) VALUES
+('AD', 'Andorra', 'EU', 'andorra'),
+('AL', 'Albania', 'EU', 'albania'),
+('AT', 'Austria', 'EU', 'austria'),
+('BA', 'Bosnia and Herzegovina', 'EU', 'bosnia and herzegovina'),
+('BE', 'Belgium', 'EU', 'belgium'),
+('BG', 'Bulgaria', 'EU', 'bulgaria'),
+('BY', 'Belarus', 'EU', 'belarus'),
+('CH', 'Switzerland', 'EU', 'switzerland'),
+('CZ', 'Czech Republic', 'EU', 'czech republic'),
+('DE', 'Germany', 'EU', 'germany'),
+('DK', 'Denmark', 'EU', 'denmark'),
+('EE', 'Estonia', 'EU', 'estonia'),
+('ES', 'Spain', 'EU', 'spain'),
+('FI', 'Finland', 'EU', 'finland'),
+('FR', 'France', 'EU', 'france'),
+('GB', 'United Kingdom', 'EU', 'united kingdom'),
+('GR', 'Greece', 'EU', 'greece'),
+('HR', 'Croatia', 'EU', 'croatia'),
+('HU', 'Hungary', 'EU', 'hungary'),
+('IE', 'Ireland', 'EU', 'ireland'),
+('IS', 'Iceland', 'EU', 'iceland'),
+('IT', 'Italy', 'EU', 'italy'),
+('LT', 'Lithuania', 'EU', 'lithuania'),
+('LU', 'Luxembourg', 'EU', 'luxembourg'),
+('LV', 'Latvia', 'EU', 'latvia'),
+('MT', 'Malta', 'EU', 'malta'),
+('NL', 'Netherlands', 'EU', 'netherlands'),
+('NO', 'Norway', 'EU', 'norway'),
+('PL', 'Poland', 'EU', 'poland'),
+('PT', 'Portugal', 'EU', 'portugal'),
+('RO', 'Romania', 'EU', 'romania'),
+('RS', 'Serbia', 'EU', 'serbia'),
+('RU', 'Russia', 'EU', 'russia'),
+('SE', 'Sweden', 'EU', 'sweden'),
+('SI', 'Slovenia', 'EU', 'slovenia'),
+('SK', 'Slovakia', 'EU', 'slovakia'),
+('UA', 'Ukraine', 'EU', 'ukraine'),
+('AE', 'United Arab Emirates', 'AS', 'united arab emirates'),
+('AF', 'Afghanistan', 'AS', 'afghanistan'),
+('BD', 'Bangladesh', 'AS', 'bangladesh'),
+('BH', 'Bahrain', 'AS', 'bahrain'),
+('BN', 'Brunei', 'AS', 'brunei'),
+('CN', 'China', 'AS', 'china'),
+('ID', 'Indonesia', 'AS', 'indonesia'),
+('IL', 'Israel', 'AS', 'israel'),
+('IN', 'India', 'AS', 'india'),
+('IQ', 'Iraq', 'AS', 'iraq'),
+('IR', 'Iran', 'AS', 'iran'),
+('JO', 'Jordan', 'AS', 'jordan'),
+('JP', 'Japan', 'AS', 'japan'),
+('KH', 'Cambodia', 'AS', 'cambodia'),
+('KR', 'South Korea', 'AS', 'south korea'),
+('KW', 'Kuwait', 'AS', 'kuwait'),
+('LA', 'Laos', 'AS', 'laos'),
+('LB', 'Lebanon', 'AS', 'lebanon'),
+('LK', 'Sri Lanka', 'AS', 'sri lanka'),
+('MM', 'Myanmar', 'AS', 'myanmar'),
+('MN', 'Mongolia', 'AS', 'mongolia'),
+('MY', 'Malaysia', 'AS', 'malaysia'),
+('NP', 'Nepal', 'AS', 'nepal'),
+('OM', 'Oman', 'AS', 'oman'),
+('PH', 'Philippines', 'AS', 'philippines'),
+('PK', 'Pakistan', 'AS', 'pakistan'),
+('QA', 'Qatar', 'AS', 'qatar'),
+('SA', 'Saudi Arabia', 'AS', 'saudi arabia'),
+('SG', 'Singapore', 'AS', 'singapore'),
+('TH', 'Thailand', 'AS', 'thailand'),
+('TR', 'Turkey', 'AS', 'turkey'),
+('TW', 'Taiwan', 'AS', 'taiwan'),
+('UZ', 'Uzbekistan', 'AS', 'uzbekistan'),
+('VN', 'Vietnam', 'AS', 'vietnam'),
+('CA', 'Canada', 'NA', 'canada'),
+('MX', 'Mexico', 'NA', 'mexico'),
+('US', 'United States', 'NA', 'united states'),
+('AR', 'Argentina', 'SA', 'argentina'),
+('BO', 'Bolivia', 'SA', 'bolivia'),
+('BR', 'Brazil', 'SA', 'brazil'),
+('CL', 'Chile', 'SA', 'chile'),
+('CO', 'Colombia', 'SA', 'colombia'),
+('EC', 'Ecuador', 'SA', 'ecuador'),
+('PE', 'Peru', 'SA', 'peru'),
+('UY', 'Uruguay', 'SA', 'uruguay'),
+('VE', 'Venezuela', 'SA', 'venezuela'),
+('DZ', 'Algeria', 'AF', 'algeria'),
+('EG', 'Egypt', 'AF', 'egypt'),
+('ET', 'Ethiopia', 'AF', 'ethiopia'),
+('GH', 'Ghana', 'AF', 'ghana'),
+('KE', 'Kenya', 'AF', 'kenya'),
+('MA', 'Morocco', 'AF', 'morocco'),
+('NG', 'Nigeria', 'AF', 'nigeria'),
+('TN', 'Tunisia', 'AF', 'tunisia'),
+('ZA', 'South Africa', 'AF', 'south africa'),
+('AU', 'Australia', 'OC', 'australia'),
+('FJ', 'Fiji', 'OC', 'fiji'),
+('NZ', 'New Zealand', 'OC', 'new zealand');
 
-INSERT INTO `airport` (`icao_code`, `iata_code`, `name`, `city`, `country_code`, `latitude`, `longitude`, `elevation_ft`, `continent`, `is_major_hub`) VALUES
-('LEPA', 'LAD', 'La Seu Airport', 'Andorra la Vella', 'AD', 42.5063000, 1.5213000, 3566, 'EU', false),
-('LATI', 'TIA', 'Tirana International Airport', 'Tirana', 'AL', 41.4146700, 19.7206400, 126, 'EU', true),
-('LOWW', 'VIE', 'Vienna International Airport', 'Vienna', 'AT', 48.1102982, 16.5697002, 600, 'EU', true),
-('LOWS', 'SZG', 'Salzburg Airport', 'Salzburg', 'AT', 47.7933018, 13.0043001, 1411, 'EU', false),
-('LQSA', 'SJJ', 'Sarajevo International Airport', 'Sarajevo', 'BA', 43.8246002, 18.3314991, 1708, 'EU', true),
-('EBBR', 'BRU', 'Brussels Airport', 'Brussels', 'BE', 50.9014015, 4.4844398, 184, 'EU', true),
-('LBBG', 'SOF', 'Sofia Airport', 'Sofia', 'BG', 42.6968002, 23.4114990, 1742, 'EU', true),
-('UMMS', 'MSQ', 'Minsk National Airport', 'Minsk', 'BY', 53.8895000, 28.0307000, 748, 'EU', true),
-('LSZH', 'ZUR', 'Zurich Airport', 'Zurich', 'CH', 47.4646990, 8.5491700, 1416, 'EU', true),
-('LSGG', 'GVA', 'Geneva Airport', 'Geneva', 'CH', 46.2380981, 6.1089401, 1411, 'EU', false),
-('LKPR', 'PRG', 'Prague Airport', 'Prague', 'CZ', 50.1007996, 14.2600002, 1247, 'EU', true),
-('EDDF', 'FRA', 'Frankfurt am Main Airport', 'Frankfurt', 'DE', 50.0333333, 8.5705560, 364, 'EU', true),
-('EDDM', 'MUC', 'Munich Airport', 'Munich', 'DE', 48.3538017, 11.7861004, 1487, 'EU', true),
-('EDDB', 'BER', 'Berlin Brandenburg Airport', 'Berlin', 'DE', 52.3666992, 13.5032997, 178, 'EU', true),
-('EKCH', 'CPH', 'Copenhagen Kastrup Airport', 'Copenhagen', 'DK', 55.6179008, 12.6560001, 17, 'EU', true),
-('EETN', 'TLL', 'Tallinn Airport', 'Tallinn', 'EE', 59.4132996, 24.8328009, 131, 'EU', true),
-('LEMD', 'MAD', 'Madrid Barajas Airport', 'Madrid', 'ES', 40.4719260, -3.5626400, 1998, 'EU', true),
-('LEBL', 'BCN', 'Barcelona Airport', 'Barcelona', 'ES', 41.2971000, 2.0784800, 12, 'EU', true),
-('EFHK', 'HEL', 'Helsinki Vantaa Airport', 'Helsinki', 'FI', 60.3171997, 24.9633007, 179, 'EU', true),
-('LFPG', 'CDG', 'Charles de Gaulle International Airport', 'Paris', 'FR', 49.0128010, 2.5500000, 392, 'EU', true),
-('LFPO', 'ORY', 'Paris Orly Airport', 'Paris', 'FR', 48.7233009, 2.3794400, 291, 'EU', false),
-('EGLL', 'LHR', 'London Heathrow Airport', 'London', 'GB', 51.4706000, -0.4619410, 83, 'EU', true),
-('EGKK', 'LGW', 'London Gatwick Airport', 'London', 'GB', 51.1481018, -0.1902780, 202, 'EU', false),
-('LGAV', 'ATH', 'Athens International Airport', 'Athens', 'GR', 37.9364013, 23.9445000, 266, 'EU', true),
-('LDZA', 'ZAG', 'Zagreb Airport', 'Zagreb', 'HR', 45.7429008, 16.0687999, 548, 'EU', true),
-('LHBP', 'BUD', 'Budapest Ferenc Liszt International Airport', 'Budapest', 'HU', 47.4369010, 19.2556000, 495, 'EU', true),
-('EIDW', 'DUB', 'Dublin Airport', 'Dublin', 'IE', 53.4213009, -6.2700200, 242, 'EU', true),
-('BIKF', 'KEF', 'Keflavik International Airport', 'Reykjavik', 'IS', 63.9850006, -22.6056004, 171, 'EU', true),
-('LIRF', 'FCO', 'Leonardo da Vinci International Airport', 'Rome', 'IT', 41.8002778, 12.2388889, 13, 'EU', true),
-('LIMC', 'MXP', 'Milan Malpensa Airport', 'Milan', 'IT', 45.6306000, 8.7281100, 768, 'EU', false),
-('EYVI', 'VNO', 'Vilnius Airport', 'Vilnius', 'LT', 54.6341019, 25.2858009, 648, 'EU', true),
-('ELLX', 'LUX', 'Luxembourg Airport', 'Luxembourg', 'LU', 49.6233330, 6.2044400, 1234, 'EU', true),
-('EVRA', 'RIX', 'Riga International Airport', 'Riga', 'LV', 56.9235992, 23.9710999, 36, 'EU', true),
-('LMML', 'MLA', 'Malta International Airport', 'Valletta', 'MT', 35.8575020, 14.4775000, 300, 'EU', true),
-('EHAM', 'AMS', 'Amsterdam Airport Schiphol', 'Amsterdam', 'NL', 52.3086014, 4.7638998, 13, 'EU', true),
-('ENGM', 'OSL', 'Oslo Airport', 'Oslo', 'NO', 60.2939987, 11.1004009, 681, 'EU', true),
-('EPWA', 'WAW', 'Warsaw Chopin Airport', 'Warsaw', 'PL', 52.1656990, 20.9671001, 362, 'EU', true),
-('LPPT', 'LIS', 'Lisbon Airport', 'Lisbon', 'PT', 38.7742996, -9.1342800, 374, 'EU', true),
-('LROP', 'OTP', 'Henri Coanda International Airport', 'Bucharest', 'RO', 44.5711975, 26.0850000, 314, 'EU', true),
-('LYBE', 'BEG', 'Belgrade Nikola Tesla Airport', 'Belgrade', 'RS', 44.8184013, 20.3091011, 335, 'EU', true),
-('UUEE', 'SVO', 'Sheremetyevo International Airport', 'Moscow', 'RU', 55.9726028, 37.4146004, 622, 'EU', true),
-('UUWW', 'VKO', 'Vnukovo International Airport', 'Moscow', 'RU', 55.5914993, 37.2615013, 685, 'EU', false),
-('ARSS', 'ARN', 'Stockholm Arlanda Airport', 'Stockholm', 'SE', 59.6498985, 18.0077999, 137, 'EU', true),
-('LJLJ', 'LJU', 'Ljubljana Joze Pucnik Airport', 'Ljubljana', 'SI', 46.2237015, 14.4576998, 1273, 'EU', true),
-('LZIB', 'BTS', 'Bratislava Airport', 'Bratislava', 'SK', 48.1701012, 17.2126999, 436, 'EU', true),
-('UKBB', 'KBP', 'Kyiv Boryspil International Airport', 'Kyiv', 'UA', 50.3450012, 30.8946991, 427, 'EU', true),
-('OMDB', 'DXB', 'Dubai International Airport', 'Dubai', 'AE', 25.2527999, 55.3643989, 62, 'AS', true),
-('OMAA', 'AUH', 'Abu Dhabi International Airport', 'Abu Dhabi', 'AE', 24.4330006, 54.6511002, 88, 'AS', false),
-('OAKB', 'KBL', 'Hamid Karzai International Airport', 'Kabul', 'AF', 34.5658989, 69.2123032, 5877, 'AS', true),
-('VGHS', 'DAC', 'Hazrat Shahjalal International Airport', 'Dhaka', 'BD', 23.8433018, 90.3977966, 30, 'AS', true),
-('OBBI', 'BAH', 'Bahrain International Airport', 'Manama', 'BH', 26.2708340, 50.6336060, 6, 'AS', true),
-('WBSB', 'BWN', 'Brunei International Airport', 'Bandar Seri Begawan', 'BN', 4.9442200, 114.9283371, 73, 'AS', true),
-('ZBAA', 'PEK', 'Beijing Capital International Airport', 'Beijing', 'CN', 40.0800018, 116.5849991, 116, 'AS', true),
-('ZSPD', 'PVG', 'Shanghai Pudong International Airport', 'Shanghai', 'CN', 31.1434002, 121.8052979, 13, 'AS', false),
-('WIII', 'CGK', 'Soekarno-Hatta International Airport', 'Jakarta', 'ID', -6.1255698, 106.6558990, 34, 'AS', true),
-('LLBG', 'TLV', 'Ben Gurion Airport', 'Tel Aviv', 'IL', 32.0114021, 34.8866997, 135, 'AS', true),
-('VIDP', 'DEL', 'Indira Gandhi International Airport', 'New Delhi', 'IN', 28.5665035, 77.1031036, 777, 'AS', true),
-('VABB', 'BOM', 'Chhatrapati Shivaji Maharaj International Airport', 'Mumbai', 'IN', 19.0886993, 72.8678970, 39, 'AS', false),
-('ORBI', 'BGW', 'Baghdad International Airport', 'Baghdad', 'IQ', 33.2625008, 44.2347984, 114, 'AS', true),
-('OIII', 'IKA', 'Imam Khomeini International Airport', 'Tehran', 'IR', 35.4161987, 51.1521988, 3305, 'AS', true),
-('OJAI', 'AMM', 'Queen Alia International Airport', 'Amman', 'JO', 31.7226009, 35.9931984, 2395, 'AS', true),
-('RJTT', 'HND', 'Tokyo Haneda Airport', 'Tokyo', 'JP', 35.5522995, 139.7799988, 35, 'AS', true),
-('RJAA', 'NRT', 'Narita International Airport', 'Tokyo', 'JP', 35.7647018, 140.3864441, 141, 'AS', false),
-('VDPP', 'PNH', 'Phnom Penh International Airport', 'Phnom Penh', 'KH', 11.5465999, 104.8440018, 40, 'AS', true),
-('RKSI', 'ICN', 'Seoul Incheon International Airport', 'Seoul', 'KR', 37.4691010, 126.4510040, 23, 'AS', true),
-('OKBK', 'KWI', 'Kuwait International Airport', 'Kuwait City', 'KW', 29.2266006, 47.9689026, 206, 'AS', true),
-('VDPS', 'VTE', 'Wattay International Airport', 'Vientiane', 'LA', 17.9883003, 102.5633011, 564, 'AS', true),
-('OLBA', 'BEY', 'Beirut Rafic Hariri International Airport', 'Beirut', 'LB', 33.8209000, 35.4883003, 87, 'AS', true),
-('VCBI', 'CMB', 'Bandaranaike International Airport', 'Colombo', 'LK', 7.1807699, 79.8841019, 30, 'AS', true),
-('VYYY', 'RGN', 'Yangon International Airport', 'Yangon', 'MM', 16.9073009, 96.1332016, 109, 'AS', true),
-('ZMUB', 'ULN', 'Ulaanbaatar Chinggis Khaan International Airport', 'Ulaanbaatar', 'MN', 47.8430023, 106.7666016, 4364, 'AS', true),
-('WMKK', 'KUL', 'Kuala Lumpur International Airport', 'Kuala Lumpur', 'MY', 2.7455600, 101.7099991, 69, 'AS', true),
-('VNKT', 'KTM', 'Tribhuvan International Airport', 'Kathmandu', 'NP', 27.6965942, 85.3591003, 4390, 'AS', true),
-('OOMS', 'MCT', 'Muscat International Airport', 'Muscat', 'OM', 23.5933018, 58.2844009, 48, 'AS', true),
-('RPLL', 'MNL', 'Ninoy Aquino International Airport', 'Manila', 'PH', 14.5086002, 121.0199966, 75, 'AS', true),
-('OPKC', 'KHI', 'Jinnah International Airport', 'Karachi', 'PK', 24.9065018, 67.1608963, 100, 'AS', true),
-('OTHH', 'DOH', 'Hamad International Airport', 'Doha', 'QA', 25.2731018, 51.6080017, 13, 'AS', true),
-('OERK', 'RUH', 'King Khalid International Airport', 'Riyadh', 'SA', 24.9575996, 46.6987991, 2049, 'AS', true),
-('WSSS', 'SIN', 'Singapore Changi Airport', 'Singapore', 'SG', 1.3501900, 103.9940033, 22, 'AS', true),
-('VTBS', 'BKK', 'Suvarnabhumi Airport', 'Bangkok', 'TH', 13.6810999, 100.7472000, 5, 'AS', true),
-('LTBA', 'IST', 'Istanbul Airport', 'Istanbul', 'TR', 41.2753982, 28.7519989, 325, 'AS', true),
-('RCTP', 'TPE', 'Taiwan Taoyuan International Airport', 'Taipei', 'TW', 25.0777000, 121.2328033, 106, 'AS', true),
-('UTTT', 'TAS', 'Tashkent International Airport', 'Tashkent', 'UZ', 41.2578010, 69.2811966, 1417, 'AS', true),
-('VVNB', 'SGN', 'Tan Son Nhat International Airport', 'Ho Chi Minh City', 'VN', 10.8187008, 106.6519012, 33, 'AS', true),
-('CYYZ', 'YYZ', 'Toronto Pearson International Airport', 'Toronto', 'CA', 43.6772003, -79.6305999, 569, 'NA', true),
-('CYVR', 'YVR', 'Vancouver International Airport', 'Vancouver', 'CA', 49.1938972, -123.1840057, 14, 'NA', false),
-('MMMX', 'MEX', 'Mexico City International Airport', 'Mexico City', 'MX', 19.4363003, -99.0720978, 7340, 'NA', true),
-('KJFK', 'JFK', 'John F Kennedy International Airport', 'New York', 'US', 40.6398010, -73.7789001, 13, 'NA', true),
-('KLAX', 'LAX', 'Los Angeles International Airport', 'Los Angeles', 'US', 33.9424973, -118.4089966, 125, 'NA', true),
-('KORD', 'ORD', 'Chicago O\'Hare International Airport', 'Chicago', 'US', 41.9786000, -87.9048004, 672, 'NA', false),
-('SAEZ', 'EZE', 'Ezeiza International Airport', 'Buenos Aires', 'AR', -34.8222008, -58.5358009, 67, 'SA', true),
-('SLLP', 'LPB', 'El Alto International Airport', 'La Paz', 'BO', -16.5132999, -68.1923981, 13323, 'SA', true),
-('SBGR', 'GRU', 'São Paulo/Guarulhos International Airport', 'São Paulo', 'BR', -23.4355564, -46.4730835, 2459, 'SA', true),
-('SBGL', 'GIG', 'Rio de Janeiro/Galeão International Airport', 'Rio de Janeiro', 'BR', -22.8099995, -43.2505569, 28, 'SA', false),
-('SCEL', 'SCL', 'Santiago International Airport', 'Santiago', 'CL', -33.3930016, -70.7858048, 1555, 'SA', true),
-('SKBO', 'BOG', 'El Dorado International Airport', 'Bogotá', 'CO', 4.7016201, -74.1469040, 8361, 'SA', true),
-('SEQM', 'UIO', 'Mariscal Sucre International Airport', 'Quito', 'EC', -0.1295500, -78.3576965, 9228, 'SA', true),
-('SPJC', 'LIM', 'Jorge Chávez International Airport', 'Lima', 'PE', -12.0218992, -77.1142960, 113, 'SA', true),
-('SUMU', 'MVD', 'Montevideo Airport', 'Montevideo', 'UY', -34.8384018, -56.0308037, 105, 'SA', true),
-('SVMI', 'CCS', 'Simón Bolívar International Airport', 'Caracas', 'VE', 10.6013002, -66.9906006, 235, 'SA', true),
-('DAAG', 'ALG', 'Houari Boumediene Airport', 'Algiers', 'DZ', 36.6910019, 3.2154300, 82, 'AF', true),
-('HECA', 'CAI', 'Cairo International Airport', 'Cairo', 'EG', 30.1219006, 31.4055996, 382, 'AF', true),
-('HAAB', 'ADD', 'Addis Ababa Bole International Airport', 'Addis Ababa', 'ET', 8.9778004, 38.7996979, 7625, 'AF', true),
-('DGAA', 'ACC', 'Kotoka International Airport', 'Accra', 'GH', 5.6052198, -0.1669870, 205, 'AF', true),
-('HKJK', 'NBO', 'Jomo Kenyatta International Airport', 'Nairobi', 'KE', -1.3192400, 36.9277992, 5327, 'AF', true),
-('GMMN', 'CMN', 'Mohammed V International Airport', 'Casablanca', 'MA', 33.3675003, -7.5899701, 656, 'AF', true),
-('DNMM', 'LOS', 'Murtala Muhammed International Airport', 'Lagos', 'NG', 6.5773702, 3.3213201, 135, 'AF', true),
-('DTTA', 'TUN', 'Tunis Carthage International Airport', 'Tunis', 'TN', 36.8510017, 10.2271996, 22, 'AF', true),
-('FAOR', 'JNB', 'O.R. Tambo International Airport', 'Johannesburg', 'ZA', -26.1392002, 28.2460003, 5558, 'AF', true),
-('YSSY', 'SYD', 'Sydney Kingsford Smith Airport', 'Sydney', 'AU', -33.9468994, 151.1770020, 21, 'OC', true),
-('YMML', 'MEL', 'Melbourne Airport', 'Melbourne', 'AU', -37.6733017, 144.8430023, 434, 'OC', false),
-('NFFN', 'NAN', 'Nadi International Airport', 'Nadi', 'FJ', -17.7553997, 177.4429016, 59, 'OC', true),
-('NZAA', 'AKL', 'Auckland International Airport', 'Auckland', 'NZ', -37.0080986, 174.7919922, 23, 'OC', true);
+INSERT INTO `airport` (`icao_code`, `iata_code`, `name`, `city`, `country_code`, `latitude`, `longitude`, `elevation_ft`, `continent`, `is_major_hub`, `name_folded`) VALUES
+('LEPA', 'LAD', 'La Seu Airport', 'Andorra la Vella', 'AD', 42.5063000, 1.5213000, 3566, 'EU', false, 'la seu airport'),
+('LATI', 'TIA', 'Tirana International Airport', 'Tirana', 'AL', 41.4146700, 19.7206400, 126, 'EU', true, 'tirana international airport'),
+('LOWW', 'VIE', 'Vienna International Airport', 'Vienna', 'AT', 48.1102982, 16.5697002, 600, 'EU', true, 'vienna international airport'),
+('LOWS', 'SZG', 'Salzburg Airport', 'Salzburg', 'AT', 47.7933018, 13.0043001, 1411, 'EU', false, 'salzburg airport'),
+('LQSA', 'SJJ', 'Sarajevo International Airport', 'Sarajevo', 'BA', 43.8246002, 18.3314991, 1708, 'EU', true, 'sarajevo international airport'),
+('EBBR', 'BRU', 'Brussels Airport', 'Brussels', 'BE', 50.9014015, 4.4844398, 184, 'EU', true, 'brussels airport'),
+('LBBG', 'SOF', 'Sofia Airport', 'Sofia', 'BG', 42.6968002, 23.4114990, 1742, 'EU', true, 'sofia airport'),
+('UMMS', 'MSQ', 'Minsk National Airport', 'Minsk', 'BY', 53.8895000, 28.0307000, 748, 'EU', true, 'minsk national airport'),
+('LSZH', 'ZUR', 'Zurich Airport', 'Zurich', 'CH', 47.4646990, 8.5491700, 1416, 'EU', true, 'zurich airport'),
+('LSGG', 'GVA', 'Geneva Airport', 'Geneva', 'CH', 46.2380981, 6.1089401, 1411, 'EU', false, 'geneva airport'),
+('LKPR', 'PRG', 'Prague Airport', 'Prague', 'CZ', 50.1007996, 14.2600002, 1247, 'EU', true, 'prague airport'),
+('EDDF', 'FRA', 'Frankfurt am Main Airport', 'Frankfurt', 'DE', 50.0333333, 8.5705560, 364, 'EU', true, 'frankfurt am main airport'),
+('EDDM', 'MUC', 'Munich Airport', 'Munich', 'DE', 48.3538017, 11.7861004, 1487, 'EU', true, 'munich airport'),
+('EDDB', 'BER', 'Berlin Brandenburg Airport', 'Berlin', 'DE', 52.3666992, 13.5032997, 178, 'EU', true, 'berlin brandenburg airport'),
+('EKCH', 'CPH', 'Copenhagen Kastrup Airport', 'Copenhagen', 'DK', 55.6179008, 12.6560001, 17, 'EU', true, 'copenhagen kastrup airport'),
+('EETN', 'TLL', 'Tallinn Airport', 'Tallinn', 'EE', 59.4132996, 24.8328009, 131, 'EU', true, 'tallinn airport'),
+('LEMD', 'MAD', 'Madrid Barajas Airport', 'Madrid', 'ES', 40.4719260, -3.5626400, 1998, 'EU', true, 'madrid barajas airport'),
+('LEBL', 'BCN', 'Barcelona Airport', 'Barcelona', 'ES', 41.2971000, 2.0784800, 12, 'EU', true, 'barcelona airport'),
+('EFHK', 'HEL', 'Helsinki Vantaa Airport', 'Helsinki', 'FI', 60.3171997, 24.9633007, 179, 'EU', true, 'helsinki vantaa airport'),
+('LFPG', 'CDG', 'Charles de Gaulle International Airport', 'Paris', 'FR', 49.0128010, 2.5500000, 392, 'EU', true, 'charles de gaulle international airport'),
+('LFPO', 'ORY', 'Paris Orly Airport', 'Paris', 'FR', 48.7233009, 2.3794400, 291, 'EU', false, 'paris orly airport'),
+('EGLL', 'LHR', 'London Heathrow Airport', 'London', 'GB', 51.4706000, -0.4619410, 83, 'EU', true, 'london heathrow airport'),
+('EGKK', 'LGW', 'London Gatwick Airport', 'London', 'GB', 51.1481018, -0.1902780, 202, 'EU', false, 'london gatwick airport'),
+('LGAV', 'ATH', 'Athens International Airport', 'Athens', 'GR', 37.9364013, 23.9445000, 266, 'EU', true, 'athens international airport'),
+('LDZA', 'ZAG', 'Zagreb Airport', 'Zagreb', 'HR', 45.7429008, 16.0687999, 548, 'EU', true, 'zagreb airport'),
+('LHBP', 'BUD', 'Budapest Ferenc Liszt International Airport', 'Budapest', 'HU', 47.4369010, 19.2556000, 495, 'EU', true, 'budapest ferenc liszt international airport'),
+('EIDW', 'DUB', 'Dublin Airport', 'Dublin', 'IE', 53.4213009, -6.2700200, 242, 'EU', true, 'dublin airport'),
+('BIKF', 'KEF', 'Keflavik International Airport', 'Reykjavik', 'IS', 63.9850006, -22.6056004, 171, 'EU', true, 'keflavik international airport'),
+('LIRF', 'FCO', 'Leonardo da Vinci International Airport', 'Rome', 'IT', 41.8002778, 12.2388889, 13, 'EU', true, 'leonardo da vinci international airport'),
+('LIMC', 'MXP', 'Milan Malpensa Airport', 'Milan', 'IT', 45.6306000, 8.7281100, 768, 'EU', false, 'milan malpensa airport'),
+('EYVI', 'VNO', 'Vilnius Airport', 'Vilnius', 'LT', 54.6341019, 25.2858009, 648, 'EU', true, 'vilnius airport'),
+('ELLX', 'LUX', 'Luxembourg Airport', 'Luxembourg', 'LU', 49.6233330, 6.2044400, 1234, 'EU', true, 'luxembourg airport'),
+('EVRA', 'RIX', 'Riga International Airport', 'Riga', 'LV', 56.9235992, 23.9710999, 36, 'EU', true, 'riga international airport'),
+('LMML', 'MLA', 'Malta International Airport', 'Valletta', 'MT', 35.8575020, 14.4775000, 300, 'EU', true, 'malta international airport'),
+('EHAM', 'AMS', 'Amsterdam Airport Schiphol', 'Amsterdam', 'NL', 52.3086014, 4.7638998, 13, 'EU', true, 'amsterdam airport schiphol'),
+('ENGM', 'OSL', 'Oslo Airport', 'Oslo', 'NO', 60.2939987, 11.1004009, 681, 'EU', true, 'oslo airport'),
+('EPWA', 'WAW', 'Warsaw Chopin Airport', 'Warsaw', 'PL', 52.1656990, 20.9671001, 362, 'EU', true, 'warsaw chopin airport'),
+('LPPT', 'LIS', 'Lisbon Airport', 'Lisbon', 'PT', 38.7742996, -9.1342800, 374, 'EU', true, 'lisbon airport'),
+('LROP', 'OTP', 'Henri Coanda International Airport', 'Bucharest', 'RO', 44.5711975, 26.0850000, 314, 'EU', true, 'henri coanda international airport'),
+('LYBE', 'BEG', 'Belgrade Nikola Tesla Airport', 'Belgrade', 'RS', 44.8184013, 20.3091011, 335, 'EU', true, 'belgrade nikola tesla airport'),
+('UUEE', 'SVO', 'Sheremetyevo International Airport', 'Moscow', 'RU', 55.9726028, 37.4146004, 622, 'EU', true, 'sheremetyevo international airport'),
+('UUWW', 'VKO', 'Vnukovo International Airport', 'Moscow', 'RU', 55.5914993, 37.2615013, 685, 'EU', false, 'vnukovo international airport'),
+('ARSS', 'ARN', 'Stockholm Arlanda Airport', 'Stockholm', 'SE', 59.6498985, 18.0077999, 137, 'EU', true, 'stockholm arlanda airport'),
+('LJLJ', 'LJU', 'Ljubljana Joze Pucnik Airport', 'Ljubljana', 'SI', 46.2237015, 14.4576998, 1273, 'EU', true, 'ljubljana joze pucnik airport'),
+('LZIB', 'BTS', 'Bratislava Airport', 'Bratislava', 'SK', 48.1701012, 17.2126999, 436, 'EU', true, 'bratislava airport'),
+('UKBB', 'KBP', 'Kyiv Boryspil International Airport', 'Kyiv', 'UA', 50.3450012, 30.8946991, 427, 'EU', true, 'kyiv boryspil international airport'),
+('OMDB', 'DXB', 'Dubai International Airport', 'Dubai', 'AE', 25.2527999, 55.3643989, 62, 'AS', true, 'dubai international airport'),
+('OMAA', 'AUH', 'Abu Dhabi International Airport', 'Abu Dhabi', 'AE', 24.4330006, 54.6511002, 88, 'AS', false, 'abu dhabi international airport'),
+('OAKB', 'KBL', 'Hamid Karzai International Airport', 'Kabul', 'AF', 34.5658989, 69.2123032, 5877, 'AS', true, 'hamid karzai international airport'),
+('VGHS', 'DAC', 'Hazrat Shahjalal International Airport', 'Dhaka', 'BD', 23.8433018, 90.3977966, 30, 'AS', true, 'hazrat shahjalal international airport'),
+('OBBI', 'BAH', 'Bahrain International Airport', 'Manama', 'BH', 26.2708340, 50.6336060, 6, 'AS', true, 'bahrain international airport'),
+('WBSB', 'BWN', 'Brunei International Airport', 'Bandar Seri Begawan', 'BN', 4.9442200, 114.9283371, 73, 'AS', true, 'brunei international airport'),
+('ZBAA', 'PEK', 'Beijing Capital International Airport', 'Beijing', 'CN', 40.0800018, 116.5849991, 116, 'AS', true, 'beijing capital international airport'),
+('ZSPD', 'PVG', 'Shanghai Pudong International Airport', 'Shanghai', 'CN', 31.1434002, 121.8052979, 13, 'AS', false, 'shanghai pudong international airport'),
+('WIII', 'CGK', 'Soekarno-Hatta International Airport', 'Jakarta', 'ID', -6.1255698, 106.6558990, 34, 'AS', true, 'soekarno-hatta international airport'),
+('LLBG', 'TLV', 'Ben Gurion Airport', 'Tel Aviv', 'IL', 32.0114021, 34.8866997, 135, 'AS', true, 'ben gurion airport'),
+('VIDP', 'DEL', 'Indira Gandhi International Airport', 'New Delhi', 'IN', 28.5665035, 77.1031036, 777, 'AS', true, 'indira gandhi international airport'),
+('VABB', 'BOM', 'Chhatrapati Shivaji Maharaj International Airport', 'Mumbai', 'IN', 19.0886993, 72.8678970, 39, 'AS', false, 'chhatrapati shivaji maharaj international airport'),
+('ORBI', 'BGW', 'Baghdad International Airport', 'Baghdad', 'IQ', 33.2625008, 44.2347984, 114, 'AS', true, 'baghdad international airport'),
+('OIII', 'IKA', 'Imam Khomeini International Airport', 'Tehran', 'IR', 35.4161987, 51.1521988, 3305, 'AS', true, 'imam khomeini international airport'),
+('OJAI', 'AMM', 'Queen Alia International Airport', 'Amman', 'JO', 31.7226009, 35.9931984, 2395, 'AS', true, 'queen alia international airport'),
+('RJTT', 'HND', 'Tokyo Haneda Airport', 'Tokyo', 'JP', 35.5522995, 139.7799988, 35, 'AS', true, 'tokyo haneda airport'),
+('RJAA', 'NRT', 'Narita International Airport', 'Tokyo', 'JP', 35.7647018, 140.3864441, 141, 'AS', false, 'narita international airport'),
+('VDPP', 'PNH', 'Phnom Penh International Airport', 'Phnom Penh', 'KH', 11.5465999, 104.8440018, 40, 'AS', true, 'phnom penh international airport'),
+('RKSI', 'ICN', 'Seoul Incheon International Airport', 'Seoul', 'KR', 37.4691010, 126.4510040, 23, 'AS', true, 'seoul incheon international airport'),
+('OKBK', 'KWI', 'Kuwait International Airport', 'Kuwait City', 'KW', 29.2266006, 47.9689026, 206, 'AS', true, 'kuwait international airport'),
+('VDPS', 'VTE', 'Wattay International Airport', 'Vientiane', 'LA', 17.9883003, 102.5633011, 564, 'AS', true, 'wattay international airport'),
+('OLBA', 'BEY', 'Beirut Rafic Hariri International Airport', 'Beirut', 'LB', 33.8209000, 35.4883003, 87, 'AS', true, 'beirut rafic hariri international airport'),
+('VCBI', 'CMB', 'Bandaranaike International Airport', 'Colombo', 'LK', 7.1807699, 79.8841019, 30, 'AS', true, 'bandaranaike international airport'),
+('VYYY', 'RGN', 'Yangon International Airport', 'Yangon', 'MM', 16.9073009, 96.1332016, 109, 'AS', true, 'yangon international airport'),
+('ZMUB', 'ULN', 'Ulaanbaatar Chinggis Khaan International Airport', 'Ulaanbaatar', 'MN', 47.8430023, 106.7666016, 4364, 'AS', true, 'ulaanbaatar chinggis khaan international airport'),
+('WMKK', 'KUL', 'Kuala Lumpur International Airport', 'Kuala Lumpur', 'MY', 2.7455600, 101.7099991, 69, 'AS', true, 'kuala lumpur international airport'),
+('VNKT', 'KTM', 'Tribhuvan International Airport', 'Kathmandu', 'NP', 27.6965942, 85.3591003, 4390, 'AS', true, 'tribhuvan international airport'),
+('OOMS', 'MCT', 'Muscat International Airport', 'Muscat', 'OM', 23.5933018, 58.2844009, 48, 'AS', true, 'muscat international airport'),
+('RPLL', 'MNL', 'Ninoy Aquino International Airport', 'Manila', 'PH', 14.5086002, 121.0199966, 75, 'AS', true, 'ninoy aquino international airport'),
+('OPKC', 'KHI', 'Jinnah International Airport', 'Karachi', 'PK', 24.9065018, 67.1608963, 100, 'AS', true, 'jinnah international airport'),
+('OTHH', 'DOH', 'Hamad International Airport', 'Doha', 'QA', 25.2731018, 51.6080017, 13, 'AS', true, 'hamad international airport'),
+('OERK', 'RUH', 'King Khalid International Airport', 'Riyadh', 'SA', 24.9575996, 46.6987991, 2049, 'AS', true, 'king khalid international airport'),
+('WSSS', 'SIN', 'Singapore Changi Airport', 'Singapore', 'SG', 1.3501900, 103.9940033, 22, 'AS', true, 'singapore changi airport'),
+('VTBS', 'BKK', 'Suvarnabhumi Airport', 'Bangkok', 'TH', 13.6810999, 100.7472000, 5, 'AS', true, 'suvarnabhumi airport'),
+('LTBA', 'IST', 'Istanbul Airport', 'Istanbul', 'TR', 41.2753982, 28.7519989, 325, 'AS', true, 'istanbul airport'),
+('RCTP', 'TPE', 'Taiwan Taoyuan International Airport', 'Taipei', 'TW', 25.0777000, 121.2328033, 106, 'AS', true, 'taiwan taoyuan international airport'),
+('UTTT', 'TAS', 'Tashkent International Airport', 'Tashkent', 'UZ', 41.2578010, 69.2811966, 1417, 'AS', true, 'tashkent international airport'),
+('VVNB', 'SGN', 'Tan Son Nhat International Airport', 'Ho Chi Minh City', 'VN', 10.8187008, 106.6519012, 33, 'AS', true, 'tan son nhat international airport'),
+('CYYZ', 'YYZ', 'Toronto Pearson International Airport', 'Toronto', 'CA', 43.6772003, -79.6305999, 569, 'NA', true, 'toronto pearson international airport'),
+('CYVR', 'YVR', 'Vancouver International Airport', 'Vancouver', 'CA', 49.1938972, -123.1840057, 14, 'NA', false, 'vancouver international airport'),
+('MMMX', 'MEX', 'Mexico City International Airport', 'Mexico City', 'MX', 19.4363003, -99.0720978, 7340, 'NA', true, 'mexico city international airport'),
+('KJFK', 'JFK', 'John F Kennedy International Airport', 'New York', 'US', 40.6398010, -73.7789001, 13, 'NA', true, 'john f kennedy international airport'),
+('KLAX', 'LAX', 'Los Angeles International Airport', 'Los Angeles', 'US', 33.9424973, -118.4089966, 125, 'NA', true, 'los angeles international airport'),
+('KORD', 'ORD', 'Chicago O\'Hare International Airport', 'Chicago', 'US', 41.9786000, -87.9048004, 672, 'NA', false, 'chicago o\'hare international airport'),
+('SAEZ', 'EZE', 'Ezeiza International Airport', 'Buenos Aires', 'AR', -34.8222008, -58.5358009, 67, 'SA', true, 'ezeiza international airport'),
+('SLLP', 'LPB', 'El Alto International Airport', 'La Paz', 'BO', -16.5132999, -68.1923981, 13323, 'SA', true, 'el alto international airport'),
+('SBGR', 'GRU', 'São Paulo/Guarulhos International Airport', 'São Paulo', 'BR', -23.4355564, -46.4730835, 2459, 'SA', true, 'sao paulo/guarulhos international airport'),
+('SBGL', 'GIG', 'Rio de Janeiro/Galeão International Airport', 'Rio de Janeiro', 'BR', -22.8099995, -43.2505569, 28, 'SA', false, 'rio de janeiro/galeao international airport'),
+('SCEL', 'SCL', 'Santiago International Airport', 'Santiago', 'CL', -33.3930016, -70.7858048, 1555, 'SA', true, 'santiago international airport'),
+('SKBO', 'BOG', 'El Dorado International Airport', 'Bogotá', 'CO', 4.7016201, -74.1469040, 8361, 'SA', true, 'el dorado international airport'),
+('SEQM', 'UIO', 'Mariscal Sucre International Airport', 'Quito', 'EC', -0.1295500, -78.3576965, 9228, 'SA', true, 'mariscal sucre international airport'),
+('SPJC', 'LIM', 'Jorge Chávez International Airport', 'Lima', 'PE', -12.0218992, -77.1142960, 113, 'SA', true, 'jorge chavez international airport'),
+('SUMU', 'MVD', 'Montevideo Airport', 'Montevideo', 'UY', -34.8384018, -56.0308037, 105, 'SA', true, 'montevideo airport'),
+('SVMI', 'CCS', 'Simón Bolívar International Airport', 'Caracas', 'VE', 10.6013002, -66.9906006, 235, 'SA', true, 'simon bolivar international airport'),
+('DAAG', 'ALG', 'Houari Boumediene Airport', 'Algiers', 'DZ', 36.6910019, 3.2154300, 82, 'AF', true, 'houari boumediene airport'),
+('HECA', 'CAI', 'Cairo International Airport', 'Cairo', 'EG', 30.1219006, 31.4055996, 382, 'AF', true, 'cairo international airport'),
+('HAAB', 'ADD', 'Addis Ababa Bole International Airport', 'Addis Ababa', 'ET', 8.9778004, 38.7996979, 7625, 'AF', true, 'addis ababa bole international airport'),
+('DGAA', 'ACC', 'Kotoka International Airport', 'Accra', 'GH', 5.6052198, -0.1669870, 205, 'AF', true, 'kotoka international airport'),
+('HKJK', 'NBO', 'Jomo Kenyatta International Airport', 'Nairobi', 'KE', -1.3192400, 36.9277992, 5327, 'AF', true, 'jomo kenyatta international airport'),
+('GMMN', 'CMN', 'Mohammed V International Airport', 'Casablanca', 'MA', 33.3675003, -7.5899701, 656, 'AF', true, 'mohammed v international airport'),
+('DNMM', 'LOS', 'Murtala Muhammed International Airport', 'Lagos', 'NG', 6.5773702, 3.3213201, 135, 'AF', true, 'murtala muhammed international airport'),
+('DTTA', 'TUN', 'Tunis Carthage International Airport', 'Tunis', 'TN', 36.8510017, 10.2271996, 22, 'AF', true, 'tunis carthage international airport'),
+('FAOR', 'JNB', 'O.R. Tambo International Airport', 'Johannesburg', 'ZA', -26.1392002, 28.2460003, 5558, 'AF', true, 'o.r. tambo international airport'),
+('YSSY', 'SYD', 'Sydney Kingsford Smith Airport', 'Sydney', 'AU', -33.9468994, 151.1770020, 21, 'OC', true, 'sydney kingsford smith airport'),
+('YMML', 'MEL', 'Melbourne Airport', 'Melbourne', 'AU', -37.6733017, 144.8430023, 434, 'OC', false, 'melbourne airport'),
+('NFFN', 'NAN', 'Nadi International Airport', 'Nadi', 'FJ', -17.7553997, 177.4429016, 59, 'OC', true, 'nadi international airport'),
+('NZAA', 'AKL', 'Auckland International Airport', 'Auckland', 'NZ', -37.0080986, 174.7919922, 23, 'OC', true, 'auckland international airport');
 
 
+-- name_folded is text_utils.fold_name(name); airport_importer.py and migrations.py keep it filled
 
 COMMIT;
 
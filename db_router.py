@@ -0,0 +1,231 @@
+"""Routes DatabaseConnection traffic between the primary and a pool of read replicas.
+
+Reads of the static tables (country, airport, the question banks) go round-robin to the replicas in
+Config.DB_REPLICA_HOSTS and every write goes to the primary. Player, session and save reads stay on
+the primary unless DB_REPLICA_SESSION_READS is on. In that case they use a replica too, except within
+DB_READ_YOUR_WRITES_SECONDS of the last write, when a lagging replica could still miss it. Writes
+that the DbWriter thread and the turn journal make on their own connections count too: they call
+note_write when a write is queued and again when it is applied. A replica that fails is skipped for REPLICA_RETRY_SECONDS and the read is retried on the
+primary.
+
+Local two-database setup, using one MySQL server with a second database as the replica:
+    python db_router.py setup-local [replica database]
+This copies the static tables into the second database and creates a SELECT-only user for it, so
+a write routed to the replica by mistake fails loudly. It prints the DB_REPLICA_* settings to use.
+The copy is not replicated, so leave DB_REPLICA_SESSION_READS off with it. Then
+    python db_router.py check
+runs a read workload and prints where each statement went.
+"""
+import secrets
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+from config import Config
+from models import DatabaseConnection, mysql_connector
+
+STATIC_PREFIXES = ('country.', 'airport.', 'challenge.')
+SESSION_PREFIXES = ('player.', 'session.', 'save.', 'daily.')
+# In foreign key order
+STATIC_TABLES = ['country', 'airport', 'question_task', 'multiple_choice_question', 'multiple_choice_answer']
+REPLICA_RETRY_SECONDS = 30.0
+LOCAL_REPLICA_USER = 'bossflight_ro'
+
+
+def parse_replica_hosts(value: str) -> List[dict]:
+    """'db2, db3:3307/project_03' -> connection overrides for each replica"""
+    replicas = []
+    for entry in filter(None, (part.strip() for part in value.split(','))):
+        address, _, database = entry.partition('/')
+        host, _, port = address.partition(':')
+        overrides = {'host': host}
+        if port:
+            overrides['port'] = int(port)
+        if database:
+            overrides['database'] = database
+        if Config.DB_REPLICA_USER:
+            overrides['user'] = Config.DB_REPLICA_USER
+            overrides['password'] = Config.DB_REPLICA_PASSWORD
+        replicas.append(overrides)
+    return replicas
+
+
+class RoutedDatabase(DatabaseConnection):
+    """A DatabaseConnection to the primary that sends eligible reads to replicas"""
+
+    def __init__(self, replicas: List[dict] | None = None):
+        super().__init__()
+        if replicas is None:
+            replicas = parse_replica_hosts(Config.DB_REPLICA_HOSTS)
+        self.replicas = [DatabaseConnection(**overrides) for overrides in replicas]
+        self.routed: Counter = Counter()
+        self._last_write = float('-inf')
+        self._next = 0
+        self._down_until: Dict[int, float] = {}
+
+    def connect(self) -> bool:
+        if not super().connect():
+            return False
+        for i, replica in enumerate(self.replicas):
+            if not replica.connect():
+                self._down_until[i] = time.monotonic() + REPLICA_RETRY_SECONDS
+        return True
+
+    def disconnect(self):
+        for replica in self.replicas:
+            replica.disconnect()
+        super().disconnect()
+
+    def _replica_eligible(self, name: str) -> bool:
+        if name.startswith(STATIC_PREFIXES):
+            return True
+        return (Config.DB_REPLICA_SESSION_READS and name.startswith(SESSION_PREFIXES) and
+                time.monotonic() - self._last_write > Config.DB_READ_YOUR_WRITES_SECONDS)
+
+    def _replica(self) -> DatabaseConnection | None:
+        """Next replica in turn that is up, reconnecting ones whose retry time has come"""
+        now = time.monotonic()
+        for _ in range(len(self.replicas)):
+            i = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+            if self._down_until.get(i, 0) > now:
+                continue
+            replica = self.replicas[i]
+            if i in self._down_until:
+                replica.disconnect()
+                if not replica.connect():
+                    self._down_until[i] = now + REPLICA_RETRY_SECONDS
+                    continue
+                del self._down_until[i]
+            return replica
+        return None
+
+    def _reader(self, name: str) -> DatabaseConnection:
+        replica = self._replica() if self.replicas and self._replica_eligible(name) else None
+        self.routed[(name, 'replica' if replica else 'primary')] += 1
+        return replica or self
+
+    def _failed(self, replica: DatabaseConnection, name: str):
+        self._down_until[self.replicas.index(replica)] = time.monotonic() + REPLICA_RETRY_SECONDS
+        self.routed[(name, 'fallback')] += 1
+
+    def note_write(self):
+        """Start the read-your-writes window; safe to call from the writer and journal threads"""
+        self._last_write = time.monotonic()
+
+    def query_named(self, name: str, params: tuple = ()):
+        db = self._reader(name)
+        if db is not self:
+            rows = db.query_named(name, params)
+            if rows is not None:
+                return rows
+            self._failed(db, name)
+        return super().query_named(name, params)
+
+    def query_named_rows(self, name: str, params: tuple = ()):
+        db = self._reader(name)
+        if db is not self:
+            columns, rows = db.query_named_rows(name, params)
+            # Even an empty result has column names; none means the query failed
+            if columns:
+                return columns, rows
+            self._failed(db, name)
+        return super().query_named_rows(name, params)
+
+    def iter_named(self, name: str, params: tuple = (), chunk_size: int = 500, as_tuples: bool = False,
+                   raise_errors: bool = False):
+        db = self._reader(name)
+        if db is not self:
+            return self._iter_replica(db, name, params, chunk_size, as_tuples, raise_errors)
+        return super().iter_named(name, params, chunk_size, as_tuples, raise_errors)
+
+    def _iter_replica(self, replica: DatabaseConnection, name: str, params: tuple, chunk_size: int,
+                      as_tuples: bool, raise_errors: bool):
+        """Read everything from the replica before yielding, so one that fails midway is retried on the
+        primary instead of silently ending the rows early"""
+        try:
+            rows = list(replica.iter_named(name, params, chunk_size, as_tuples, raise_errors=True))
+        except mysql_connector.Error as e:
+            print(f"Replica read failed ({name}), retrying on the primary: {e}")
+            self._failed(replica, name)
+            yield from super().iter_named(name, params, chunk_size, as_tuples, raise_errors)
+            return
+        yield from rows
+
+    def update_named(self, name: str, params: tuple = ()):
+        self.note_write()
+        return super().update_named(name, params)
+
+    def execute_update(self, query: str, params: tuple = None):
+        self.note_write()
+        return super().execute_update(query, params)
+
+    def execute_batch(self, query: str, rows: List[tuple]) -> int:
+        self.note_write()
+        return super().execute_batch(query, rows)
+
+    def run_in_transaction(self, work):
+        self.note_write()
+        return super().run_in_transaction(work)
+
+
+def setup_local(replica_database: str):
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        primary = Config.DB_NAME
+        db.execute_update(f"CREATE DATABASE IF NOT EXISTS `{replica_database}` "
+                          f"CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+        for table in reversed(STATIC_TABLES):
+            db.execute_update(f"DROP TABLE IF EXISTS `{replica_database}`.`{table}`")
+        for table in STATIC_TABLES:
+            db.execute_update(f"CREATE TABLE `{replica_database}`.`{table}` LIKE `{primary}`.`{table}`")
+            copied = db.execute_update(f"INSERT INTO `{replica_database}`.`{table}` SELECT * FROM `{primary}`.`{table}`")
+            print(f"Copied {copied} rows of {table}")
+
+        # token_urlsafe is quote-free, and a parameter would not survive the '%' host pattern
+        password = secrets.token_urlsafe(12)
+        db.execute_update(f"CREATE USER IF NOT EXISTS '{LOCAL_REPLICA_USER}'@'%' IDENTIFIED BY '{password}'")
+        db.execute_update(f"ALTER USER '{LOCAL_REPLICA_USER}'@'%' IDENTIFIED BY '{password}'")
+        db.execute_update(f"GRANT SELECT ON `{replica_database}`.* TO '{LOCAL_REPLICA_USER}'@'%'")
+        print("\nAdd to .env:")
+        print(f"DB_REPLICA_HOSTS={Config.DB_HOST}:{Config.DB_PORT}/{replica_database}")
+        print(f"DB_REPLICA_USER={LOCAL_REPLICA_USER}")
+        print(f"DB_REPLICA_PASSWORD={password}")
+    finally:
+        db.disconnect()
+
+
+def check():
+    db = RoutedDatabase()
+    if not db.replicas:
+        print("DB_REPLICA_HOSTS is not set")
+        return
+    if not db.connect():
+        return
+    try:
+        db.query_named_rows('country.all')
+        db.query_named_rows('country.by_code', ('FI',))
+        db.query_named_rows('airport.by_id', (1,))
+        db.query_named('challenge.open_ids', ('easy',))
+        db.query_named('player.by_name', ('Benchmark Pilot',))
+        for (name, target), count in sorted(db.routed.items()):
+            print(f"{name:<28} {target:<8} {count}")
+    finally:
+        db.disconnect()
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else ''
+    if command == 'setup-local':
+        setup_local(sys.argv[2] if len(sys.argv) > 2 else Config.DB_NAME + '_replica')
+    elif command == 'check':
+        check()
+    else:
+        print("Usage: python db_router.py setup-local [replica database] | check")
+
+
+if __name__ == "__main__":
+    main()
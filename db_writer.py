@@ -0,0 +1,140 @@
+"""Applies database writes on a background thread so the UI thread never waits for a commit.
+
+A DbWriter owns its own connection and a FIFO queue. submit() queues a named statement and
+submit_call() queues a function that runs against the writer's connection (used for saves, which
+read before they write). Both return at once, and writes are applied in the order they were queued.
+
+flush() is a barrier: it returns once everything queued before it has been applied, and reports
+whether any of it failed. Callers pass a timeout so a stuck write cannot hang the game.
+Any exception from a write is recorded as a failed write; the thread keeps going. Failures are also kept until take_errors() collects them for the UI.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List
+
+from models import DatabaseConnection, mysql_connector
+from statements import StatementStats
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class WriteError:
+    statement: str
+    message: str
+
+
+class _Barrier:
+    def __init__(self):
+        self.done = threading.Event()
+        self.failed = False
+
+
+class DbWriter:
+    def __init__(self, max_errors: int = 100):
+        self.db = DatabaseConnection()
+        # Called when a write is queued and again once it has been applied
+        self._write_listeners: List[Callable[[], None]] = []
+        # Time the caller spent handing a write over, and time from hand-over until it was committed
+        self.submit_stats: Dict[str, StatementStats] = {}
+        self.apply_stats: Dict[str, StatementStats] = {}
+        self._errors: Deque[WriteError] = deque(maxlen=max_errors)
+        self._failed_since_flush = False
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+
+    def start(self) -> bool:
+        """Connect and start the thread; False if the writer's connection could not be opened"""
+        if not self.db.connect():
+            return False
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Apply everything still queued, then stop the thread and close its connection"""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self.db.disconnect()
+
+    def submit(self, name: str, params: tuple = ()):
+        start = time.perf_counter()
+        self._queue.put((name, params, None, start))
+        self._notify_write()
+        self.submit_stats.setdefault(name, StatementStats()).record(time.perf_counter() - start)
+
+    def submit_call(self, name: str, work: Callable[[DatabaseConnection], object]):
+        """Queue work(db) on the writer's connection; a falsy return counts as a failed write"""
+        start = time.perf_counter()
+        self._queue.put((name, (), work, start))
+        self._notify_write()
+        self.submit_stats.setdefault(name, StatementStats()).record(time.perf_counter() - start)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every write queued so far is applied; False if one failed since the last flush or time ran out"""
+        barrier = _Barrier()
+        self._queue.put(barrier)
+        if not barrier.done.wait(timeout):
+            self._errors.append(WriteError('flush', f"writes still pending after {timeout:g}s"))
+            return False
+        return not barrier.failed
+
+    def add_write_listener(self, listener: Callable[[], None]):
+        self._write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: Callable[[], None]):
+        if listener in self._write_listeners:
+            self._write_listeners.remove(listener)
+
+    def _notify_write(self):
+        for listener in list(self._write_listeners):
+            listener()
+
+    def take_errors(self) -> List[WriteError]:
+        errors = []
+        while self._errors:
+            errors.append(self._errors.popleft())
+        return errors
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, _Barrier):
+                item.failed = self._failed_since_flush
+                self._failed_since_flush = False
+                item.done.set()
+                continue
+            name, params, work, submitted_at = item
+            self._apply(name, params, work)
+            self._notify_write()
+            self.apply_stats.setdefault(name, StatementStats()).record(time.perf_counter() - submitted_at)
+
+    def _apply(self, name: str, params: tuple, work: Callable | None):
+        try:
+            if work is not None:
+                ok = bool(work(self.db))
+            else:
+                self.db.statements.update(name, params)
+                self.db.connection.commit()
+                ok = True
+            message = "" if ok else "write was not applied"
+        except mysql_connector.Error as e:
+            ok, message = False, str(e)
+        except Exception as e:
+            # A bug in a queued call must not kill the thread, or every later flush would wait forever
+            ok, message = False, f"{type(e).__name__}: {e}"
+        if not ok:
+            self._failed_since_flush = True
+            self._errors.append(WriteError(name, message))
+            if not self.db.is_healthy():
+                # Reconnect for the next write; this one stays failed
+                self.db.disconnect()
+                self.db.connect()
@@ -0,0 +1,224 @@
+"""Precomputed pairwise airport distances, stored as a float32 .npy file and read through mmap.
+
+Build it with:  python distance_matrix.py build [--hubs] [path]
+
+The matrix is n x n in catalog order, so the full catalog gets large quickly (4 * n^2 bytes:
+10k airports is 400 MB, the full ~70k catalog about 19.6 GB). Building the full catalog is not
+practical; --hubs, which restricts it to the major hubs, is the supported mode.
+
+The game does not read the matrix: ProximityTable already holds the distance from every airport to
+the current boss. It is meant for tools and analysis that need many hub-to-hub distances. A sidecar <path>.meta.json holds
+the airport ids in row order and a checksum of their coordinates, and a matrix whose checksum no
+longer matches the loaded catalog is ignored.
+"""
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from airport_store import AirportStore
+from airport_util import EARTH_RADIUS_KM
+from config import Config
+
+NPY_MAGIC = b'\x93NUMPY'
+BLOCK_ROWS = 256
+
+_worker_latitudes: list[float] = []
+_worker_longitudes: list[float] = []
+_worker_cos_latitudes: list[float] = []
+
+
+def catalog_checksum(ids, latitudes, longitudes) -> str:
+    digest = hashlib.sha256()
+    digest.update(array('q', ids).tobytes())
+    digest.update(array('d', latitudes).tobytes())
+    digest.update(array('d', longitudes).tobytes())
+    return digest.hexdigest()
+
+
+def select_airports(store: AirportStore, hubs_only: bool) -> list[int]:
+    """Store indexes that go into the matrix, in row order"""
+    if not hubs_only:
+        return list(range(len(store)))
+    return [i for i in range(len(store)) if store.hub_flags[i]]
+
+
+def _init_worker(latitudes: list[float], longitudes: list[float]):
+    global _worker_latitudes, _worker_longitudes, _worker_cos_latitudes
+    _worker_latitudes = [math.radians(lat) for lat in latitudes]
+    _worker_longitudes = [math.radians(lon) for lon in longitudes]
+    _worker_cos_latitudes = [math.cos(lat) for lat in _worker_latitudes]
+
+
+def _compute_block(start: int, end: int) -> bytes:
+    lats, lons, cos_lats = _worker_latitudes, _worker_longitudes, _worker_cos_latitudes
+    block = array('f')
+    for row in range(start, end):
+        lat1, lon1, cos1 = lats[row], lons[row], cos_lats[row]
+        for lat2, lon2, cos2 in zip(lats, lons, cos_lats):
+            a = math.sin((lat2 - lat1) / 2) ** 2 + cos1 * cos2 * math.sin((lon2 - lon1) / 2) ** 2
+            block.append(2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(a), 1.0)))
+    if sys.byteorder != 'little':
+        block.byteswap()
+    return block.tobytes()
+
+
+def _npy_header(count: int) -> bytes:
+    """Version 1.0 .npy header for a C-ordered little-endian float32 (count, count) array"""
+    description = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({count}, {count}), }}"
+    unpadded = len(NPY_MAGIC) + 2 + 2 + len(description) + 1
+    padding = -unpadded % 64
+    description = description + ' ' * padding + '\n'
+    return NPY_MAGIC + bytes([1, 0]) + struct.pack('<H', len(description)) + description.encode('latin1')
+
+
+def build_matrix(store: AirportStore, path: str, hubs_only: bool = False, workers: int | None = None) -> int:
+    """Write the matrix and its sidecar, returning the number of airports in it"""
+    selection = select_airports(store, hubs_only)
+    ids = [store.ids[i] for i in selection]
+    latitudes = [store.latitudes[i] for i in selection]
+    longitudes = [store.longitudes[i] for i in selection]
+    count = len(selection)
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(_npy_header(count))
+        blocks = [(start, min(start + BLOCK_ROWS, count)) for start in range(0, count, BLOCK_ROWS)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(latitudes, longitudes)) as pool:
+            # map yields in submission order, so blocks land in row order
+            for data in pool.map(_compute_block, [b[0] for b in blocks], [b[1] for b in blocks]):
+                f.write(data)
+    # Without a sidecar open() ignores the matrix, so a crash from here on never pairs the new matrix
+    # with the old ids
+    meta_path = path + '.meta.json'
+    try:
+        os.remove(meta_path)
+    except FileNotFoundError:
+        pass
+    os.replace(temp_path, path)
+
+    meta = {
+        'checksum': catalog_checksum(ids, latitudes, longitudes),
+        'hubs_only': hubs_only,
+        'ids': ids,
+        'built_at': time.time(),
+    }
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+    return count
+
+
+class DistanceMatrix:
+    """Read-only mmap'd view of a built matrix: distance_km is two dict lookups and one 4-byte read"""
+
+    def __init__(self, path: str, file, data: mmap.mmap, offset: int, ids: list[int], hubs_only: bool):
+        self.path = path
+        self.hubs_only = hubs_only
+        self.ids = ids
+        self._file = file
+        self._data = data
+        self._offset = offset
+        self._rows = {airport_id: row for row, airport_id in enumerate(ids)}
+        self._count = len(ids)
+
+    @classmethod
+    def open(cls, path: str, store: AirportStore | None = None) -> Optional['DistanceMatrix']:
+        """Map the matrix at path, or return None if it is missing, malformed or was built from another catalog"""
+        try:
+            with open(path + '.meta.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            file = open(path, 'rb')
+        except (OSError, ValueError):
+            return None
+
+        if store is not None:
+            selection = select_airports(store, meta.get('hubs_only', False))
+            checksum = catalog_checksum([store.ids[i] for i in selection],
+                                        [store.latitudes[i] for i in selection],
+                                        [store.longitudes[i] for i in selection])
+            if checksum != meta.get('checksum'):
+                file.close()
+                return None
+
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            file.close()
+            return None
+        count = len(meta['ids'])
+        if data[:len(NPY_MAGIC)] != NPY_MAGIC or data[6] != 1:
+            data.close()
+            file.close()
+            return None
+        header_length = struct.unpack_from('<H', data, 8)[0]
+        offset = 10 + header_length
+        if len(data) != offset + count * count * 4:
+            data.close()
+            file.close()
+            return None
+        return cls(path, file, data, offset, meta['ids'], meta.get('hubs_only', False))
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, airport_id: int) -> bool:
+        return airport_id in self._rows
+
+    def distance_km(self, from_airport_id: int, to_airport_id: int) -> Optional[float]:
+        row = self._rows.get(from_airport_id)
+        column = self._rows.get(to_airport_id)
+        if row is None or column is None:
+            return None
+        return struct.unpack_from('<f', self._data, self._offset + (row * self._count + column) * 4)[0]
+
+    def row(self, airport_id: int) -> Optional[array]:
+        """Distances from one airport to every airport in the matrix, in the order of self.ids"""
+        row = self._rows.get(airport_id)
+        if row is None:
+            return None
+        start = self._offset + row * self._count * 4
+        distances = array('f', self._data[start:start + self._count * 4])
+        if sys.byteorder != 'little':
+            distances.byteswap()
+        return distances
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] != 'build':
+        print("Usage: python distance_matrix.py build [--hubs] [path]")
+        return
+    hubs_only = '--hubs' in args
+    paths = [arg for arg in args[1:] if arg != '--hubs']
+    path = paths[0] if paths else Config.DISTANCE_MATRIX_PATH
+
+    from models import Airport, DatabaseConnection
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        store = Airport(db).load_airport_store()
+    finally:
+        db.disconnect()
+
+    start = time.perf_counter()
+    count = build_matrix(store, path, hubs_only)
+    print(f"Wrote {count} x {count} distances ({count * count * 4 / 1e6:.1f} MB) "
+          f"to {path} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,53 @@
 ﻿import airport_util
+import daily_challenge
+from airport_store import AirportStore
+from boss_sampler import BossSampler
+from catalog_snapshot import CatalogSnapshot, build_snapshot
+from challenge_deck import ChallengeDeck
 from data import *
+from db_router import RoutedDatabase
+from db_writer import DbWriter, WriteError
 from models import (DatabaseConnection, Player, Country, Airport,
-                    GameSession, Challenge, GameSave)
+                    GameSession, Challenge, GameSave, DailyChallenge)
+from navigation import NavigationState
+from offline_store import OfflineDatabase, OfflineStore, QuestionSnapshot, build_question_snapshot
+from offline_sync import OfflineSync, SyncReport
+from proximity import ProximityTable
+from race_hub import Mailbox, RaceEvent, RaceHub
+from route_planner import Route, RoutePlanner
+from turn_journal import TurnJournal
 from config import Config
-import random
+from datetime import date
 import math
-from typing import Dict, List, Optional, Tuple
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
 
 
+class _ThreadOutput:
+    """Stands in for sys.stdout and keeps what one thread prints instead of writing it"""
+
+    def __init__(self, target, thread: threading.Thread):
+        self.target = target
+        self.thread = thread
+        self.captured: List[str] = []
+
+    def write(self, text: str) -> int:
+        if threading.current_thread() is not self.thread:
+            return self.target.write(text)
+        self.captured.append(text)
+        return len(text)
+
+    def flush(self):
+        self.target.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.target, name)
+
 
 class BossFlightGameDriver:
     def __init__(self):
-        self.db: DatabaseConnection = DatabaseConnection()
+        self.db: DatabaseConnection = RoutedDatabase() if Config.DB_REPLICA_HOSTS else DatabaseConnection()
         self.player: Player | None = None
         self.current_session: GameSession | None = None
         self.boss_airport: AirportDto | None = None
@@ -21,51 +57,300 @@ class BossFlightGameDriver:
         self.current_save: GameSaveDto | None = None
         self.correct_continent: str | None = None
         self.correct_country: str | None = None
+        self.airport_store: AirportStore | None = None
+        self.catalog: CatalogSnapshot | None = None
+        self.boss_sampler: BossSampler | None = None
+        self._boss_sampler_store: AirportStore | None = None
+        self.proximity: ProximityTable | None = None
+        self.navigation: NavigationState | None = None
+        self.race_hub: RaceHub | None = None
+        self.race_id: str | None = None
+        self.race_mailbox: Mailbox | None = None
+        self.route_planner: RoutePlanner | None = None
+        self.journal: TurnJournal | None = None
+        self.writer: DbWriter | None = None
+        self._on_write: Callable[[], None] | None = None
+        # The server driver whose catalog, writer and journal this one borrows, see initialize_pilot
+        self._shared: 'BossFlightGameDriver | None' = None
+        self.offline = False
+        self.offline_sync_report: SyncReport | None = None
+        self._init_thread: threading.Thread | None = None
+        self._init_result: ResultNoValue | None = None
+        self._init_output: _ThreadOutput | None = None
+        # What initialize() printed while the intro screen was up
+        self.init_messages: List[str] = []
 
     def initialize(self) -> ResultNoValue:
+        self.catalog = CatalogSnapshot.open(Config.CATALOG_SNAPSHOT_PATH)
         if not self.db.connect():
+            return self._go_offline()
+        if self.catalog and self.catalog.is_stale(Config.CATALOG_SNAPSHOT_MAX_AGE_HOURS * 3600):
+            self._drop_catalog()
+        self._refresh_catalog()
+        self._refresh_questions()
+        self._sync_offline_play()
+        # Writes made on the writer's and journal's own connections must also keep session reads on the primary
+        self._on_write = self.db.note_write if isinstance(self.db, RoutedDatabase) else None
+        if Config.DB_WRITER_ENABLED:
+            writer = DbWriter()
+            if writer.start():
+                self.writer = writer
+                if self._on_write:
+                    writer.add_write_listener(self._on_write)
+        if Config.TURN_JOURNAL_PATH:
+            # Opening replays the journal; writes left over from a crash are drained in the background
+            self.journal = TurnJournal.open(Config.TURN_JOURNAL_PATH, Config.TURN_JOURNAL_SYNC_MS / 1000,
+                                            Config.TURN_JOURNAL_DRAIN_SECONDS)
+            if self._on_write:
+                self.journal.add_write_listener(self._on_write)
+        return ResultNoValue.success()
+
+    def initialize_pilot(self, shared: 'BossFlightGameDriver') -> ResultNoValue:
+        """initialize() for one pilot of a server: open only this driver's connection and borrow the
+        catalog, airport store, writer and journal of the server's already initialized driver"""
+        if shared.offline or not self.db.connect():
+            return ResultNoValue.failure("Database connection failed.")
+        self._shared = shared
+        self.catalog = shared.catalog
+        self.airport_store = shared.get_airport_store()
+        self.writer = shared.writer
+        self.journal = shared.journal
+        self._on_write = self.db.note_write if isinstance(self.db, RoutedDatabase) else None
+        if self._on_write:
+            for source in (self.writer, self.journal):
+                if source:
+                    source.add_write_listener(self._on_write)
+        return ResultNoValue.success()
+
+    def _go_offline(self) -> ResultNoValue:
+        """Play from the local snapshots, however old, and keep new players, games and saves locally"""
+        questions = QuestionSnapshot.open(Config.QUESTION_SNAPSHOT_PATH)
+        if not Config.OFFLINE_MODE or not self.catalog or not questions:
             return ResultNoValue.failure("Database connection failed.")
+        self.db = OfflineDatabase(self.catalog, questions, OfflineStore(Config.OFFLINE_STORE_PATH))
+        self.offline = True
         return ResultNoValue.success()
 
+    def _refresh_questions(self):
+        """Keep a question snapshot around so a later start without the database can still play"""
+        if not Config.OFFLINE_MODE:
+            return
+        questions = QuestionSnapshot.open(Config.QUESTION_SNAPSHOT_PATH)
+        if questions is None or questions.is_stale(Config.CATALOG_SNAPSHOT_MAX_AGE_HOURS * 3600):
+            build_question_snapshot(self.db, Config.QUESTION_SNAPSHOT_PATH)
+
+    def _sync_offline_play(self):
+        store = OfflineStore(Config.OFFLINE_STORE_PATH)
+        if store.has_pending():
+            self.offline_sync_report = OfflineSync(self.db, store).sync()
+
+    def _refresh_catalog(self):
+        """Fall back to the database when the snapshot no longer matches it, rebuilding it if allowed"""
+        fingerprint = Airport(self.db).get_catalog_fingerprint()
+        max_age_seconds = Config.CATALOG_SNAPSHOT_MAX_AGE_HOURS * 3600
+        if self.catalog and not self.catalog.is_stale(max_age_seconds, fingerprint):
+            return
+        self._drop_catalog()
+        if Config.CATALOG_SNAPSHOT_AUTO_REBUILD and build_snapshot(self.db, Config.CATALOG_SNAPSHOT_PATH, fingerprint):
+            self.catalog = CatalogSnapshot.open(Config.CATALOG_SNAPSHOT_PATH)
+
+    def _drop_catalog(self):
+        if self.catalog:
+            self.catalog.close()
+        self.catalog = None
+
+    def _countries(self) -> CatalogSnapshot | Country:
+        return self.catalog if self.catalog else Country(self.db)
+
+    def _airports(self) -> CatalogSnapshot | Airport:
+        return self.catalog if self.catalog else Airport(self.db)
+
+    def initialize_in_background(self):
+        """Connect to the database on a worker thread so the UI can draw meanwhile.
+
+        Its error messages would land in the middle of the intro screen, so they are kept in
+        init_messages until wait_for_initialize.
+        """
+        self._init_thread = threading.Thread(target=self._run_initialize, daemon=True)
+        self._init_output = _ThreadOutput(sys.stdout, self._init_thread)
+        sys.stdout = self._init_output
+        self._init_thread.start()
+
+    def _run_initialize(self):
+        self._init_result = self.initialize()
+
+    def wait_for_initialize(self) -> ResultNoValue:
+        if self._init_thread is None:
+            return self.initialize()
+        self._init_thread.join()
+        self._init_thread = None
+        if sys.stdout is self._init_output:
+            sys.stdout = self._init_output.target
+        self.init_messages = [line for line in ''.join(self._init_output.captured).splitlines() if line.strip()]
+        self._init_output = None
+        return self._init_result
+
     def terminate(self):
         self.auto_save_game()
+        if self.race_id:
+            self.leave_race()
+        if self.journal:
+            if self._on_write:
+                self.journal.remove_write_listener(self._on_write)
+            if not self._shared:
+                self.journal.close()
+            self.journal = None
+        if self.writer:
+            if self._on_write:
+                self.writer.remove_write_listener(self._on_write)
+            if not self._shared:
+                # Applies whatever is still queued before closing its connection
+                self.writer.stop()
+            self.writer = None
         self.db.disconnect()
+        if self._shared:
+            # The server driver closes the catalog
+            self.catalog = None
+        else:
+            self._drop_catalog()
 
     def setup_player(self, player_name: str) -> bool:
         self.player = Player(self.db)
         if self.player.create_or_get_player(player_name):
-            self.game_save = GameSave(self.db)
+            self.game_save = GameSave(self.db, 'json' if self.offline else None, self.writer)
             return True
         else:
             return False
 
-    def start_new_game(self, starting_airport_name: str, difficulty: Difficulty) -> ResultNoValue:
-        """Start a new game session"""
-        airport_model = Airport(self.db)
-
-        self.boss_airport = airport_model.get_random_airport()
+    def start_new_game(self, starting_airport_name: str | None, difficulty: Difficulty,
+                       daily: bool = False) -> ResultNoValue:
+        """Start a new game session; a daily game ignores starting_airport_name and uses the day's shared setup"""
+        challenge = None
+        if daily:
+            challenge_result = self.get_daily_challenge(difficulty)
+            if challenge_result.is_error():
+                return ResultNoValue.failure(challenge_result.error)
+            challenge = challenge_result.value
+            if DailyChallenge(self.db).has_result(challenge.challenge_date, difficulty, self.player.id):
+                return ResultNoValue.failure("You have already flown today's challenge.")
+            self.boss_airport = self._airports().get_airport_by_id(challenge.boss_airport_id)
+        elif self.race_id:
+            boss_airport_id = self.race_hub.get_boss(self.race_id)
+            if boss_airport_id is None:
+                race_id = self.race_id
+                self.leave_race()
+                return ResultNoValue.failure(f"Race '{race_id}' has been closed.")
+            self.boss_airport = self._airports().get_airport_by_id(boss_airport_id)
+        else:
+            self.boss_airport = self.pick_boss_airport()
         if not self.boss_airport:
             return ResultNoValue.failure("No airports available in the database.")
 
-        starting_airport = airport_model.get_airport_by_name(starting_airport_name)
+        if challenge:
+            starting_airport = self._airports().get_airport_by_id(challenge.starting_airport_id)
+        else:
+            starting_airport = self._airports().get_airport_by_name(starting_airport_name)
         if not starting_airport:
             return ResultNoValue.failure(f"Starting airport '{starting_airport_name}' not found.")
 
-        starting_country = Country(self.db).get_country_by_code(starting_airport.country_code)
+        starting_country = self._countries().get_country_by_code(starting_airport.country_code)
         self.current_country = starting_country
-        self.current_airport = airport_model.get_airport_by_name(starting_airport_name)
+        self.current_airport = starting_airport
 
         self.player.set_battery(Config.get_starting_battery(difficulty))
         self.player.set_difficulty(difficulty)
 
         self.current_session = GameSession(self.db)
         if not self.current_session.create_new_session(
-                self.player.id, self.player.difficulty_level, self.boss_airport):
+                self.player.id, self.player.difficulty_level, self.boss_airport, starting_airport):
             return ResultNoValue.failure("Could not create game session.")
 
         self.current_session.update_current_airport(starting_airport)
+        if challenge:
+            self.current_session.daily_date = challenge.challenge_date.isoformat()
+            cards = Challenge(self.db).get_question_cards(difficulty)
+            self.current_session.challenge_deck = ChallengeDeck(cards, seed=challenge.deck_seed)
+        self._attach_session()
+        self.build_proximity_table()
+        self.update_navigation()
         return ResultNoValue.success()
 
+    def get_daily_challenge(self, difficulty: Difficulty, day: date | None = None) -> Result[DailyChallengeDto]:
+        """The day's shared setup, derived and stored by whoever asks first and read by primary key after that"""
+        if self.offline:
+            return Result[DailyChallengeDto].failure("The daily challenge needs a database connection.")
+        day = day or daily_challenge.today()
+        model = DailyChallenge(self.db)
+        challenge = model.get_challenge(day, difficulty)
+        if challenge is None:
+            derived = daily_challenge.derive_daily_challenge(day, difficulty, self.get_airport_store())
+            if derived is None:
+                return Result[DailyChallengeDto].failure("No airports available in the database.")
+            model.store_challenge(derived)
+            # Read back so a player who lost the insert race plays the stored row, not their own
+            challenge = model.get_challenge(day, difficulty) or derived
+        return Result[DailyChallengeDto].success(challenge)
+
+    def get_daily_leaderboard(self, difficulty: Difficulty, day: date | None = None,
+                              limit: int = 10) -> List[DailyResultDto]:
+        if self.offline:
+            return []
+        return DailyChallenge(self.db).get_leaderboard(day or daily_challenge.today(), difficulty, limit)
+
+    def join_race(self, hub: RaceHub, race_id: str) -> ResultNoValue:
+        """Race the other pilots in race_id: the next new game uses the race's boss and flights are broadcast"""
+        mailbox = hub.join(race_id, self.player.name)
+        if mailbox is None:
+            return ResultNoValue.failure(f"Race '{race_id}' does not exist or is full.")
+        self.race_hub, self.race_id, self.race_mailbox = hub, race_id, mailbox
+        return ResultNoValue.success()
+
+    def leave_race(self):
+        if self.race_hub and self.race_id:
+            self.race_hub.leave(self.race_id, self.player.name)
+        self.race_hub, self.race_id, self.race_mailbox = None, None, None
+
+    def get_race_updates(self) -> List[RaceEvent]:
+        """Latest event from every other pilot since the last call"""
+        if not self.race_hub or not self.race_mailbox:
+            return []
+        return self.race_hub.poll(self.race_mailbox)
+
+    def _publish_race_event(self, kind: str, result: str = ""):
+        if not self.race_hub or not self.race_id:
+            return
+        navigation = self.navigation
+        self.race_hub.publish(RaceEvent(
+            race_id=self.race_id,
+            pilot=self.player.name,
+            kind=kind,
+            airport_name=navigation.airport_name if navigation else "",
+            country_code=self.current_airport.country_code if self.current_airport else "",
+            distance_km=navigation.distance_km if navigation else 0.0,
+            battery=navigation.battery if navigation else 0,
+            result=result,
+        ))
+
+    def get_boss_sampler(self) -> BossSampler:
+        """Weighted boss picker over the major hubs, kept in step with the loaded airport catalog"""
+        store = self.get_airport_store()
+        if self.boss_sampler is None:
+            self.boss_sampler = BossSampler(balance_continents=Config.BOSS_BALANCE_CONTINENTS,
+                                            recent_window=Config.BOSS_RECENT_WINDOW,
+                                            recent_weight=Config.BOSS_RECENT_WEIGHT)
+        if self._boss_sampler_store is not store:
+            self.boss_sampler.sync(airport for airport in store if airport.is_major_hub)
+            self._boss_sampler_store = store
+        return self.boss_sampler
+
+    def pick_boss_airport(self) -> AirportDto | None:
+        sampler = self.get_boss_sampler()
+        boss = sampler.sample()
+        if boss is None:
+            return Airport(self.db).get_random_airport()
+        sampler.record_usage(boss.id)
+        return boss.to_dto()
+
     def get_saves(self) -> List[GameSaveDto]:
         if not self.player:
             return []
@@ -78,11 +363,26 @@ class BossFlightGameDriver:
         save_data = self.game_save.load_game(save)
         if not save_data:
             return ResultNoValue.failure("Failed to load save data.")
+        return self._restore_session(save_data, save)
+
+    def get_journal_resume(self) -> Dict | None:
+        """The player's unfinished session as last journaled, which may be newer than the autosave"""
+        if not self.journal or not self.player:
+            return None
+        return self.journal.latest_state(self.player.id)
+
+    def resume_from_journal(self) -> ResultNoValue:
+        save_data = self.get_journal_resume()
+        if not save_data:
+            return ResultNoValue.failure("No unfinished flight to resume.")
+        return self._restore_session(save_data, None)
+
+    def _restore_session(self, save_data: Dict, save: GameSaveDto | None) -> ResultNoValue:
         self.current_session = self.game_save.restore_session_from_save(save_data, self.db)
         if not self.current_session:
             return ResultNoValue.failure("Failed to restore game session from save data.")
 
-        airport_model = Airport(self.db)
+        airport_model = self._airports()
         self.current_airport = airport_model.get_airport_by_id(self.current_session.current_airport_id)
         if not self.current_airport:
             return ResultNoValue.failure("Failed to find current airport from session data.")
@@ -90,25 +390,81 @@ class BossFlightGameDriver:
         if not self.boss_airport:
             return ResultNoValue.failure("Failed to find boss airport from session data.")
 
-        country_model = Country(self.db)
+        country_model = self._countries()
         self.current_country = country_model.get_country_by_code(self.current_airport.country_code)
         if not self.current_country:
             return ResultNoValue.failure("Failed to find current country from airport data.")
 
-        if self.current_session.status != 'active':
+        if self.current_session.status is not SessionStatus.ACTIVE:
             return ResultNoValue.failure("Cannot load a game that is not active.")
 
         self.current_save = save
+        self._attach_session()
+        self.build_proximity_table()
+        self.update_navigation()
         return ResultNoValue.success()
 
+    def _attach_session(self):
+        """Route the session's writes through the turn journal or the writer thread, if there is one"""
+        self.current_session.player_id = self.player.id
+        self.current_session.journal = self.journal
+        self.current_session.writer = self.writer
+        self._journal_turn()
+
+    def flush_writes(self) -> bool:
+        """Barrier: wait until every queued and journaled write is in the database; False if one of them
+        failed or they did not all land within DB_WRITER_FLUSH_SECONDS"""
+        ok = self.writer.flush(Config.DB_WRITER_FLUSH_SECONDS) if self.writer else True
+        if self.journal:
+            player_id = self.player.id if self.player else None
+            ok = self.journal.wait_drained(Config.DB_WRITER_FLUSH_SECONDS, player_id) and ok
+        return ok
+
+    def take_write_errors(self) -> List[WriteError]:
+        errors = self.writer.take_errors() if self.writer else []
+        if self.journal and self.player:
+            errors += self.journal.take_errors(self.player.id)
+        return errors
+
+    def _journal_turn(self):
+        if self.current_session and self.current_session.journal:
+            self.journal.append_state(self.player.id, self.current_session.to_save_data())
+
+    def build_proximity_table(self):
+        """Distances and bearings from every airport to the boss, computed once when the boss is fixed"""
+        self.proximity = ProximityTable.for_airport(self.get_airport_store(), self.boss_airport)
+
+    def get_airport_store(self) -> AirportStore:
+        """Whole airport catalog, loaded once and shared for the rest of the process"""
+        if self.airport_store is None:
+            if self.catalog:
+                self.airport_store = self.catalog.to_airport_store()
+            else:
+                self.airport_store = Airport(self.db).load_airport_store()
+        return self.airport_store
+
+    def get_route_planner(self) -> RoutePlanner:
+        store = self.get_airport_store()
+        if self.route_planner is None or self.route_planner.store is not store:
+            self.route_planner = RoutePlanner(store, Config.ROUTE_MAX_HOP_KM)
+        return self.route_planner
+
+    def plan_route(self, target_airport_id: int | None = None) -> Route | None:
+        """Shortest chain of flights from the current airport to the target (the boss by default), each within range"""
+        if not self.current_session:
+            return None
+        if target_airport_id is None:
+            if not self.boss_airport:
+                return None
+            target_airport_id = self.boss_airport.id
+        return self.get_route_planner().plan(self.current_session.current_airport_id, target_airport_id)
+
     def get_all_country_names(self) -> List[str]:
-        country_model = Country(self.db)
-        countries = country_model.get_all_countries()
+        countries = self._countries().get_all_countries()
         return [country.name for country in countries]
 
     def get_country_by_name(self, country_name: str) -> Result[CountryDto]:
-        country_model = Country(self.db)
-        country = country_model.get_country_by_name(country_name)
+        country = self._countries().get_country_by_name(country_name)
         if not country:
             return Result[CountryDto].failure(f"Country '{country_name}' not found.")
         return Result[CountryDto].success(country)
@@ -124,13 +480,12 @@ class BossFlightGameDriver:
             return []
 
         country = country_result.value
-        airport_model = Airport(self.db)
-        airports = airport_model.get_airports_by_country(country)
+        airports = self._airports().get_airports_by_country(country)
         return [airport.name for airport in airports]
 
     def change_airport(self, airport_name: str) -> FlightResult:
-        airport = Airport(self.db).get_airport_by_name(airport_name)
-        country = Country(self.db).get_country_by_code(airport.country_code)
+        airport = self._airports().get_airport_by_name(airport_name)
+        country = self._countries().get_country_by_code(airport.country_code) if airport else None
         if not airport or not country or not self.current_session or not self.boss_airport:
             raise ValueError("Invalid airport or game session state.")
 
@@ -139,6 +494,9 @@ class BossFlightGameDriver:
         self.current_session.deduct_battery(Config.get_battery_consumption(self.current_session.difficulty_level))
         self.current_session.add_guessed_country(country)
         self.current_session.update_current_airport(airport)
+        self.update_navigation()
+        self._publish_race_event('flight')
+        self._journal_turn()
         self.auto_save_game()
         if airport.id == self.boss_airport.id:
             return FlightResult.CORRECT_AIRPORT
@@ -151,21 +509,39 @@ class BossFlightGameDriver:
 
     def auto_save_game(self):
         """Automatically save the game"""
-        if self.current_session and self.current_session.status == 'active':
+        if self.current_session and self.current_session.status is SessionStatus.ACTIVE:
             self.game_save.save_game(self.player.id, self.current_session, "autosave")
+            if self.current_save and self.current_save.save_name == "autosave":
+                return
             saves = self.game_save.get_player_saves(self.player.id)
             autosave = next((s for s in saves if s.save_name == "autosave"), None)
             if autosave:
                 self.current_save = autosave
 
+    def get_challenge_deck(self) -> ChallengeDeck:
+        """The session's question deck, shuffled on first use or restored from the save"""
+        session = self.current_session
+        if session.challenge_deck is None:
+            cards = Challenge(self.db).get_question_cards(session.difficulty_level)
+            if session.challenge_deck_state:
+                session.challenge_deck = ChallengeDeck.from_state(cards, session.challenge_deck_state)
+            else:
+                session.challenge_deck = ChallengeDeck(cards)
+        return session.challenge_deck
+
     def get_challenge(self) -> OpenQuestion | MultipleChoiceQuestion | None:
+        if not self.current_session:
+            return None
+        card = self.get_challenge_deck().draw()
+        if card is None:
+            return None
         challenge_model = Challenge(self.db)
-        challenge_type = random.choice([ChallengeType.OPEN_QUESTION, ChallengeType.MULTIPLE_CHOICE])
-        match challenge_type:
+        challenge_type, question_id = card
+        match ChallengeType(challenge_type):
             case ChallengeType.OPEN_QUESTION:
-                return challenge_model.get_random_open_question(self.player.difficulty_level)
+                return challenge_model.get_open_question(question_id)
             case ChallengeType.MULTIPLE_CHOICE:
-                return challenge_model.get_random_multiple_choice(self.player.difficulty_level)
+                return challenge_model.get_multiple_choice(question_id)
         return None
 
     def challenge_completed(self, challenge_result: ChallengeResult) -> int:
@@ -175,10 +551,12 @@ class BossFlightGameDriver:
                 self.current_session.increment_puzzles_solved()
                 battery_reward = Config.get_battery_reward(self.current_session.difficulty_level)
                 self.current_session.add_battery(battery_reward)
+                self._update_navigation_battery()
                 return battery_reward
             case ChallengeResult.INCORRECT:
                 battery_penalty = Config.get_battery_penalty(self.current_session.difficulty_level)
                 self.current_session.deduct_battery(battery_penalty)
+                self._update_navigation_battery()
                 return -battery_penalty
 
     def get_distance_to_goal_km(self) -> float:
@@ -187,8 +565,12 @@ class BossFlightGameDriver:
         if not self.current_session or not goal_airport:
             return float('inf')
 
-        airport_model = Airport(self.db)
-        current_airport = airport_model.get_airport_by_id(self.current_session.current_airport_id)
+        if self.proximity:
+            distance = self.proximity.distance_km(self.current_session.current_airport_id)
+            if distance is not None:
+                return distance
+
+        current_airport = self.get_airport_store().get_by_id(self.current_session.current_airport_id)
         if not current_airport:
             return float('inf')
 
@@ -201,9 +583,49 @@ class BossFlightGameDriver:
         if not self.current_session or not goal_airport:
             return airport_util.CompassDirection.N
 
+        if self.proximity:
+            direction = self.proximity.direction(self.current_session.current_airport_id)
+            if direction is not None:
+                return direction
+
         direction = airport_util.get_direction(self.current_airport, goal_airport)
         return direction
 
+    def update_navigation(self):
+        """Recompute the navigation state after the current airport changed"""
+        if not self.current_session or not self.current_airport or not self.current_country or not self.boss_airport:
+            self.navigation = None
+            return
+        airport_id = self.current_session.current_airport_id
+        bearing = self.proximity.bearing(airport_id) if self.proximity else None
+        if bearing is None:
+            bearing = airport_util.calculate_bearing(self.current_airport, self.boss_airport)
+        self.navigation = NavigationState(
+            airport_name=self.current_airport.name,
+            country_name=self.current_country.name,
+            continent=self.current_country.continent,
+            distance_km=self.get_distance_to_goal_km(),
+            bearing=bearing,
+            direction=airport_util.bearing_to_compass_direction(bearing),
+            battery=self.current_session.battery_level,
+            closest_percent=self.get_proximity_percent(),
+        )
+
+    def _update_navigation_battery(self):
+        if self.navigation:
+            self.navigation = self.navigation.with_battery(self.current_session.battery_level)
+
+    def get_navigation(self) -> NavigationState | None:
+        if self.navigation is None:
+            self.update_navigation()
+        return self.navigation
+
+    def get_proximity_percent(self) -> float | None:
+        """Share of all airports at least as close to the boss as the current one, in percent"""
+        if not self.current_session or not self.proximity:
+            return None
+        return self.proximity.closest_percent(self.current_session.current_airport_id)
+
     def end_game(self, game_result: GameResult):
         if not self.current_session:
             return
@@ -218,17 +640,26 @@ class BossFlightGameDriver:
                 session_status = SessionStatus.ABANDONED
 
         self.current_session.update_status(session_status)
-        if game_result == GameResult.QUIT:
+        self._publish_race_event('finished', session_status.value)
+        if self.current_session.daily_date:
+            # Quitting counts as the day's attempt too, or the player could retry knowing the boss
+            DailyChallenge(self.db).record_result(date.fromisoformat(self.current_session.daily_date),
+                                                  self.player.id, self.current_session)
+        if game_result == GameResult.QUIT and not self.current_session.daily_date:
             self.auto_save_game()
         else:
             if self.current_save:
                 self.game_save.delete_save(self.current_save)
             self.current_save = None
 
+        # The game's result must be in the database before the next menu can read it
+        self.flush_writes()
         self.current_session = None
         self.current_airport = None
         self.current_country = None
         self.boss_airport = None
+        self.proximity = None
+        self.navigation = None
         self.correct_continent = None
         self.correct_country = None
 
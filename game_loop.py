@@ -1,30 +1,20 @@
 ﻿from game import BossFlightGameDriver
-from prompt_utils import safe_prompt
-from prompt_toolkit.completion import Completer, Completion
+from prompt_utils import safe_prompt, create_completer
 from menu_windows import MainView, MainViewResult, MultipleChoiceWindow, TextWindow
 from menu_drawer import TextElement, MenuOption, Alignment, MenuOptionConfig, draw_menu, \
     HorizontalMenu, BoxedElement, VerticalMenu
 import os
 from data import *
 from config import Config
-
-class AnyCompleter(Completer):
-    def __init__(self, options: list[str]):
-        super().__init__()
-        self.options = options
-
-    def get_completions(self, document, complete_event):
-        text = document.text
-        for option in self.options:
-            if option.lower().startswith(text.lower()):
-                yield Completion(option, start_position=-len(text))
+import startup_profile
+from text_utils import fold_name
 
 
 def prompt_country(game: BossFlightGameDriver) -> str:
     os.system('cls')  # Clear screen for Windows
     country_names = game.get_all_country_names()
-    lowered_country_names = [name.lower() for name in country_names]
-    country_completer = AnyCompleter(country_names)
+    folded_country_names = {fold_name(name) for name in country_names}
+    country_completer = create_completer(country_names)
     while True:
         guessed_countries = game.get_guessed_countries()
         if guessed_countries:
@@ -32,7 +22,7 @@ def prompt_country(game: BossFlightGameDriver) -> str:
             print("\nCountries you've already visited:")
             print((", ".join(guessed_country_names) if guessed_country_names else "None"))
         country_name = safe_prompt("\nPlease select a country: ", completer=country_completer).strip()
-        if country_name.lower() in lowered_country_names:
+        if fold_name(country_name) in folded_country_names:
             return country_name
         else:
             print(f"'{country_name}' is not a valid country. Please try again.")
@@ -83,20 +73,26 @@ def handle_challenge(game: BossFlightGameDriver, challenge: OpenQuestion | Multi
 
 def handle_continue_menu(game: BossFlightGameDriver) -> bool:
     back_str = "Back"
+    resume_str = "Resume last flight"
     saves = game.get_saves()
     save_names = [save.save_name for save in saves]
     save_elements = [BoxedElement(MenuOption(name, name, MenuOptionConfig(width=30))) for name in save_names]
     elements = [BoxedElement(MenuOption(back_str, back_str))]
+    if game.get_journal_resume():
+        elements.append(BoxedElement(MenuOption(resume_str, resume_str, MenuOptionConfig(width=30))))
     elements.extend(save_elements)
     save_menu = HorizontalMenu(elements, start_y=4)
     save_menu.add_non_selectable([TextElement(f"Pilot: {game.player.name}", alignment=Alignment.LEFT)], -1)
     selected_save = draw_menu(save_menu)
     if selected_save == back_str:
         return False
-    selected_save_obj = next((save for save in saves if save.save_name == selected_save), None)
-    if not selected_save_obj:
-        return False
-    load_result = game.load_save(selected_save_obj)
+    if selected_save == resume_str:
+        load_result = game.resume_from_journal()
+    else:
+        selected_save_obj = next((save for save in saves if save.save_name == selected_save), None)
+        if not selected_save_obj:
+            return False
+        load_result = game.load_save(selected_save_obj)
     if not load_result.is_success():
         error_window = TextWindow([
             TextElement(f"Error loading save: {load_result.error}", alignment=Alignment.CENTER),
@@ -108,15 +104,59 @@ def handle_continue_menu(game: BossFlightGameDriver) -> bool:
 
 
 
+def show_daily_leaderboard(game: BossFlightGameDriver) -> None:
+    difficulty = select_difficulty()
+    results = game.get_daily_leaderboard(difficulty)
+    elements = [TextElement(f"Daily challenge - {difficulty.value.capitalize()}", alignment=Alignment.CENTER)]
+    if not results:
+        elements.append(TextElement("Nobody has finished today's challenge yet.", alignment=Alignment.CENTER))
+    for rank, result in enumerate(results, start=1):
+        outcome = f"{result.countries_visited} countries" if result.status is SessionStatus.WON else "did not finish"
+        elements.append(TextElement(f"{rank:>2}. {result.player_name:<20} {outcome:<15} {result.battery_level:>3} %"))
+    elements.append(TextElement("Press any key to continue...", alignment=Alignment.CENTER, offset_y=1))
+    draw_menu(TextWindow(elements))
+
+
+def handle_daily_menu(game: BossFlightGameDriver) -> ResultNoValue | None:
+    """Returns the start result once a daily game has started, None to go back to the main menu"""
+    config = MenuOptionConfig(width=20)
+    while True:
+        daily_menu = HorizontalMenu([
+            BoxedElement(MenuOption("Fly Today's Boss", "play", config)),
+            BoxedElement(MenuOption("Leaderboard", "leaderboard", config)),
+            BoxedElement(MenuOption("Back", "back", config))],
+            start_y=4
+        )
+        daily_menu.add_non_selectable([TextElement("Same boss for every pilot, new one every day", alignment=Alignment.CENTER)], -1)
+        match draw_menu(daily_menu):
+            case "play":
+                start_result = game.start_new_game(None, select_difficulty(), daily=True)
+                if start_result.is_success():
+                    return start_result
+                draw_menu(TextWindow([
+                    TextElement(start_result.error, alignment=Alignment.CENTER),
+                    TextElement("Press any key to continue...", alignment=Alignment.CENTER, offset_y=1)
+                ]))
+            case "leaderboard":
+                show_daily_leaderboard(game)
+            case _:
+                return None
+
+
 def handle_main_menu(game: BossFlightGameDriver) -> ResultNoValue:
     while True:
-        main_menu_result = main_menu(game.player.name)
+        main_menu_result = main_menu(game.player.name + (" (offline)" if game.offline else ""))
         match main_menu_result:
             case MainMenuResult.NEW_GAME:
                 difficulty = select_difficulty()
                 starting_airport = select_airport(game)
                 start_result = game.start_new_game(starting_airport, difficulty)
                 return start_result
+            case MainMenuResult.DAILY:
+                start_result = handle_daily_menu(game)
+                if not start_result:
+                    continue
+                return start_result
             case MainMenuResult.CONTINUE:
                 loaded_game = handle_continue_menu(game)
                 if not loaded_game:
@@ -141,11 +181,19 @@ def display_introduction() -> None:
         TextElement("Win by finding the secret airport.", alignment=Alignment.CENTER),
         TextElement("Press any key to continue...", alignment=Alignment.CENTER, offset_y=1)
     ], autosize_to_highest_width=True)
-    draw_menu(intro_window)
+    draw_menu(intro_window, on_first_frame=startup_profile.profile.mark_first_frame)
+
+
+def show_init_messages(game: BossFlightGameDriver) -> None:
+    """Print what startup reported while the intro was on screen"""
+    for message in game.init_messages:
+        print(message)
+    game.init_messages = []
 
 
 def setup_player(game: BossFlightGameDriver) -> ResultNoValue:
     os.system('cls' if os.name == 'nt' else 'clear')  # Clear screen
+    show_init_messages(game)
     name = input("\nEnter your pilot name: ")
     if not name:
         name = "Anonymous Pilot"
@@ -162,6 +210,7 @@ def main_menu(player_name: str) -> MainMenuResult:
     new_game_menu = HorizontalMenu([
         BoxedElement(MenuOption("New Game", MainMenuResult.NEW_GAME, config)),
         BoxedElement(MenuOption("Continue", MainMenuResult.CONTINUE, config)),
+        BoxedElement(MenuOption("Daily", MainMenuResult.DAILY, config)),
         BoxedElement(MenuOption("Change Pilot", MainMenuResult.CHANGE_PILOT, config)),
         BoxedElement(MenuOption("Quit", MainMenuResult.QUIT, config))],
         start_y=4
@@ -221,6 +270,18 @@ def after_flight_message(result: FlightResult, game: BossFlightGameDriver) -> No
     draw_menu(result_window)
 
 
+def show_write_errors(game: BossFlightGameDriver) -> None:
+    errors = game.take_write_errors()
+    if not errors:
+        return
+    error_window = TextWindow([
+        TextElement(f"Could not save progress ({len(errors)} failed writes): {errors[-1].message}",
+                    alignment=Alignment.CENTER),
+        TextElement("Press any key to continue...", alignment=Alignment.CENTER, offset_y=1)
+    ])
+    draw_menu(error_window)
+
+
 def show_correct_info(main_view: MainView, difficulty: Difficulty, country: bool, continent: bool):
     if country and Config.allow_show_correct_country(difficulty):
         main_view.show_correct_country(True)
@@ -235,25 +296,18 @@ def game_loop(game: BossFlightGameDriver):
     player_name = game.player.name
     main_view = MainView(player_name)
     main_view.show_direction = True if game.current_session.difficulty_level != Difficulty.HARD else False
+    main_view.show_proximity = Config.allow_show_proximity_hint(game.current_session.difficulty_level)
     main_view.set_difficulty(game.current_session.difficulty_level)
 
     while game.current_session.status is SessionStatus.ACTIVE:
-        distance = game.get_distance_to_goal_km()
-        airport_name = game.current_airport.name
-        country_name = game.current_country.name
-        continent_name = game.current_country.continent
-        direction = game.get_direction_to_goal()
-        main_view.set_airport(airport_name)
-        main_view.set_country(country_name)
-        main_view.set_continent(continent_name)
-        main_view.set_battery(game.current_session.battery_level)
-        main_view.set_direction(direction)
-        main_view.set_distance(distance)
-
-        main_view_result = draw_menu(main_view)
+        main_view.apply_navigation(game.get_navigation())
+        main_view.invalidate()
+
+        main_view_result = draw_menu(main_view, clear_on_refresh=False)
         match main_view_result:
             case MainViewResult.TAKEOFF:
                 flight_result = handle_flight(game)
+                show_write_errors(game)
                 after_flight_message(flight_result, game)
                 if flight_result == FlightResult.CORRECT_AIRPORT:
                     game.end_game(GameResult.VICTORY)
@@ -283,13 +337,16 @@ def game_loop(game: BossFlightGameDriver):
 def start_loop():
     os.system('cls' if os.name == 'nt' else 'clear')
     game: BossFlightGameDriver = BossFlightGameDriver()
-    init_result = game.initialize()
+    game.initialize_in_background()
+    display_introduction()
+    init_result = game.wait_for_initialize()
+    startup_profile.profile.mark("database ready")
     if not init_result.is_success():
+        show_init_messages(game)
         print(f"Error: {init_result.error}")
         return
 
     try:
-        display_introduction()
         player_setup_result = setup_player(game)
         if not player_setup_result.is_success():
             print(f"Error: {player_setup_result.error}")
@@ -1,4 +1,7 @@
-﻿from game_loop import start_loop
+﻿import startup_profile
+
+start_loop = startup_profile.timed_import('game_loop').start_loop
+
 
 def main():
     try:
@@ -7,6 +10,9 @@ def main():
         print("\n\n✈️  Game stopped!")
     except Exception as e:
         print(f"\n Error: {e}")
+    finally:
+        if startup_profile.is_enabled():
+            print(startup_profile.profile.report())
 
 
 if __name__ == "__main__":
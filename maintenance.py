@@ -0,0 +1,286 @@
+"""Retention job that keeps game_session and game_save small.
+
+Usage: python maintenance.py [run|dry-run] [--days N] [--batch-size N] [--pause SECONDS]
+       python maintenance.py show SESSION_ID
+
+One run does three things, oldest first, in transactions of --batch-size rows:
+    orphaned saves    Saves whose session is gone, or is won, lost or abandoned and the save not touched
+                      for --days. A save whose session id cannot be read is kept, and so is one written
+                      again while the job runs.
+    old sessions      Finished sessions completed more than --days ago move into game_session_archive
+                      as one zlib-compressed JSON row. Active sessions are never archived, as the turn
+                      journal may still resume them. Sessions a save still points to stay, so every
+                      remaining save can be loaded.
+    offline sync ops  offline_sync rows older than --days; only a store synced just now needs them.
+
+After every batch the job sleeps --pause seconds plus as long as the batch took, so it gives way to
+live traffic and backs off further when the server is busy. It can run while the game is being played.
+"""
+import json
+import sys
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import Config
+from models import DatabaseConnection, mysql_connector
+from statements import StatementRegistry
+
+PRUNED_STATUSES = ('won', 'lost', 'abandoned')
+# session id of a save whose data could not be read; such a save is never pruned
+UNREADABLE = object()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode('utf-8')
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def compress_session(row: Dict) -> bytes:
+    row = dict(row)
+    if isinstance(row.get('countries_guessed'), (str, bytes, bytearray)):
+        row['countries_guessed'] = json.loads(row['countries_guessed'])
+    return zlib.compress(json.dumps(row, default=_json_default, separators=(',', ':')).encode('utf-8'), 9)
+
+
+def decompress_session(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def _session_id(value):
+    """game_data.session_id as JSON_EXTRACT returns it: JSON text, so 'null' or a number"""
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    if value is None or value == 'null':
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return UNREADABLE
+
+
+@dataclass
+class MaintenanceReport:
+    saves_pruned: int = 0
+    sessions_archived: int = 0
+    sessions_kept_for_saves: int = 0
+    saves_kept_unreadable: int = 0
+    offline_ops_pruned: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+
+class RetentionJob:
+    def __init__(self, db: DatabaseConnection, days: int = Config.MAINTENANCE_RETENTION_DAYS,
+                 batch_size: int = Config.MAINTENANCE_BATCH_SIZE,
+                 pause: float = Config.MAINTENANCE_PAUSE_SECONDS, dry_run: bool = False):
+        self.db = db
+        self.cutoff = datetime.now() - timedelta(days=days)
+        self.batch_size = batch_size
+        self.pause = pause
+        self.dry_run = dry_run
+        self.report = MaintenanceReport()
+
+    def run(self) -> MaintenanceReport:
+        start = time.perf_counter()
+        saves = self.save_sessions()
+        statuses = self.session_statuses({session_id for _, _, session_id in saves
+                                          if session_id is not None and session_id is not UNREADABLE})
+        if statuses is None:
+            # Without the statuses every save would look orphaned
+            print("Could not read session statuses, nothing was changed.")
+            return self.report
+        orphaned = [(save_id, updated_at) for save_id, updated_at, session_id in saves
+                    if self.is_orphaned(session_id, updated_at, statuses)]
+        self.prune_saves(orphaned)
+
+        orphaned_ids = {save_id for save_id, _ in orphaned}
+        referenced = {session_id for save_id, _, session_id in saves
+                      if session_id is not None and session_id is not UNREADABLE and save_id not in orphaned_ids}
+        self.archive_sessions(referenced)
+        self.prune_offline_ops()
+        self.report.seconds = time.perf_counter() - start
+        return self.report
+
+    def save_sessions(self) -> List[Tuple[int, datetime, object]]:
+        """(save id, updated_at, session id) of every save, reading delta saves back from their base;
+        the session id is None for a save without one and UNREADABLE where the data could not be read"""
+        saves: Dict[int, list] = {}
+        # A partial list would leave sessions of unlisted saves unprotected, so errors propagate
+        for save_id, updated_at, session_id, base_blob, delta in self.db.iter_named('maintenance.save_sessions',
+                                                                                    as_tuples=True, raise_errors=True):
+            save = saves.get(save_id)
+            if save is None:
+                session_id = _session_id(session_id)
+                if base_blob is not None:
+                    try:
+                        session_id = json.loads(zlib.decompress(base_blob)).get('session_id')
+                    except (ValueError, zlib.error):
+                        session_id = UNREADABLE
+                save = saves[save_id] = [save_id, updated_at, session_id]
+            if delta is not None:
+                try:
+                    changed = json.loads(delta).get('s', {})
+                except ValueError:
+                    save[2] = UNREADABLE
+                    continue
+                if 'session_id' in changed:
+                    save[2] = changed['session_id']
+        return [tuple(save) for save in saves.values()]
+
+    def session_statuses(self, session_ids: Set[int]) -> Optional[Dict[int, str]]:
+        statuses = {}
+        ids = sorted(session_ids)
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start:start + self.batch_size]
+            query = f"SELECT id, status FROM game_session WHERE id IN ({', '.join(['%s'] * len(chunk))})"
+            rows = self.db.execute_query(query, tuple(chunk))
+            if rows is None:
+                return None
+            statuses.update((row['id'], row['status']) for row in rows)
+        return statuses
+
+    def is_orphaned(self, session_id, updated_at: datetime, statuses: Dict[int, str]) -> bool:
+        if session_id is UNREADABLE:
+            self.report.saves_kept_unreadable += 1
+            return False
+        status = statuses.get(session_id)
+        if status is None:
+            # No session id, or the session is gone: the save can never be loaded
+            return True
+        return status in PRUNED_STATUSES and updated_at < self.cutoff
+
+    def prune_saves(self, orphaned: List[Tuple[int, datetime]]):
+        if self.dry_run:
+            self.report.saves_pruned = len(orphaned)
+            return
+        for start in range(0, len(orphaned), self.batch_size):
+            batch = orphaned[start:start + self.batch_size]
+            deleted = self._batch(lambda statements: sum(
+                statements.update('maintenance.delete_save', row).rowcount for row in batch))
+            if deleted is None:
+                return
+            self.report.saves_pruned += deleted
+
+    def archive_sessions(self, referenced: Set[int]):
+        last_id = 0
+        while True:
+            moved = self._batch(lambda statements: self._archive_batch(statements, last_id, referenced))
+            if not moved:
+                return
+            last_id, archived = moved
+            self.report.sessions_archived += archived
+
+    def _archive_batch(self, statements: StatementRegistry, last_id: int,
+                       referenced: Set[int]) -> Optional[Tuple[int, int]]:
+        rows = statements.query('maintenance.archive_candidates',
+                                (last_id, self.cutoff, self.batch_size))
+        if not rows:
+            return None
+        archived = 0
+        for row in rows:
+            if row['id'] in referenced:
+                self.report.sessions_kept_for_saves += 1
+                continue
+            archived += 1
+            if self.dry_run:
+                continue
+            statements.update('maintenance.archive_session', (
+                row['id'], row['player_id'], row['status'], row['difficulty_level'], row['score'] or 0,
+                row['started_at'], row['completed_at'], compress_session(row)))
+            statements.update('maintenance.delete_session', (row['id'],))
+        return rows[-1]['id'], archived
+
+    def prune_offline_ops(self):
+        if self.dry_run:
+            return
+        while True:
+            deleted = self._batch(lambda statements: statements.update(
+                'offline.prune_ops', (self.cutoff, self.batch_size)).rowcount)
+            if not deleted:
+                return
+            self.report.offline_ops_pruned += deleted
+
+    def _batch(self, work):
+        """One throttled transaction; None if it was rolled back"""
+        start = time.perf_counter()
+        result = self.db.run_in_transaction(work)
+        self.report.batches += 1
+        time.sleep(self.pause + time.perf_counter() - start)
+        return result
+
+
+def show_archived(db: DatabaseConnection, session_id: int):
+    rows = db.query_named('maintenance.archived_session', (session_id,))
+    if not rows:
+        print(f"Session {session_id} is not archived")
+        return
+    row = rows[0]
+    print(f"Archived at {row['archived_at']}")
+    print(json.dumps(decompress_session(row['session_blob']), indent=2))
+
+
+def parse_args(args: List[str]) -> Optional[Tuple[str, Dict[str, float], List[str]]]:
+    command = 'run'
+    options = {}
+    rest = []
+    flags = {'--days': 'days', '--batch-size': 'batch_size', '--pause': 'pause'}
+    i = 0
+    while i < len(args):
+        if args[i] in flags and i + 1 < len(args):
+            options[flags[args[i]]] = float(args[i + 1]) if args[i] == '--pause' else int(args[i + 1])
+            i += 1
+        elif args[i] in ('run', 'dry-run', 'show'):
+            command = args[i]
+        elif command == 'show':
+            rest.append(args[i])
+        else:
+            return None
+        i += 1
+    if command == 'show' and len(rest) != 1:
+        return None
+    return command, options, rest
+
+
+def print_report(report: MaintenanceReport, dry_run: bool):
+    verb = "Would" if dry_run else "Did"
+    print(f"{verb} prune {report.saves_pruned} orphaned saves "
+          f"({report.saves_kept_unreadable} kept because their session could not be read)")
+    print(f"{verb} archive {report.sessions_archived} sessions "
+          f"({report.sessions_kept_for_saves} kept because a save uses them)")
+    if not dry_run:
+        print(f"Pruned {report.offline_ops_pruned} offline sync records")
+    print(f"{report.batches} batches in {report.seconds:.2f}s")
+
+
+def main():
+    parsed = parse_args(sys.argv[1:])
+    if parsed is None:
+        print("Usage: python maintenance.py [run|dry-run] [--days N] [--batch-size N] [--pause SECONDS]\n"
+              "       python maintenance.py show SESSION_ID")
+        return
+    command, options, rest = parsed
+
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        if command == 'show':
+            show_archived(db, int(rest[0]))
+            return
+        dry_run = command == 'dry-run'
+        report = RetentionJob(db, dry_run=dry_run, **options).run()
+        print_report(report, dry_run)
+    except mysql_connector.Error as e:
+        print(f"Maintenance failed: {e}")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -381,20 +381,25 @@ class VerticalMenu(Menu):
         return None
 
 
-def _draw_menu_internal(window, layout: Menu, clear_on_refresh: bool) -> Any:
+def _draw_menu_internal(window, layout: Menu, clear_on_refresh: bool, on_first_frame: Callable[[], None] | None) -> Any:
     curses.curs_set(0)
 
     while True:
         if clear_on_refresh:
             window.clear()
         layout.on_draw(window)
+        if on_first_frame is not None:
+            window.refresh()
+            on_first_frame()
+            on_first_frame = None
         result = layout.read_input(window)
         if result is not None:
             return result
 
 
-def draw_menu(layout: Menu, clear_on_refresh: bool = True) -> Any:
-    return curses.wrapper(lambda window: _draw_menu_internal(window, layout, clear_on_refresh))
+def draw_menu(layout: Menu, clear_on_refresh: bool = True, on_first_frame: Callable[[], None] | None = None) -> Any:
+    """on_first_frame is called once the first frame has been pushed to the terminal"""
+    return curses.wrapper(lambda window: _draw_menu_internal(window, layout, clear_on_refresh, on_first_frame))
 
 
 def _draw_menu_horizontal(
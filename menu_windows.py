@@ -1,25 +1,13 @@
 ﻿import curses
 from enum import Enum, auto
-from prompt_toolkit.completion import Completer, Completion
+import math
 
 from airport_util import CompassDirection
 from data import OpenQuestion, MultipleChoiceQuestion, ChallengeResult, Difficulty
+from navigation import NavigationState
 from menu_drawer import Menu, MenuElement, TextElement, MenuOption, Alignment, MenuOptionConfig, draw_menu, \
     HorizontalMenu, BoxedElement, InputHandler
 
-country_names = ["USA", "Canada", "Mexico", "Brazil", "UK", "France", "Germany", "Italy", "Spain", "Russia", "China", "Japan", "India", "Australia", "South Africa"]
-
-class AnyCompleter(Completer):
-    def __init__(self, options: list[str]):
-        super().__init__()
-        self.options = options
-
-    def get_completions(self, document, complete_event):
-        text = document.text
-        for option in self.options:
-            if option.lower().startswith(text.lower()):
-                yield Completion(option, start_position=-len(text))
-
 
 class MainViewResult(Enum):
     TAKEOFF = auto()
@@ -35,11 +23,26 @@ def create_exit_window(start_y: int = 2, start_x: int = 2) -> HorizontalMenu:
 
 
 class MainView(Menu):
+    """The in-flight dashboard. Draw it with draw_menu(view, clear_on_refresh=False) after invalidate():
+    after the first frame, key presses redraw only the buttons and the rows whose fields changed."""
+
+    # Screen rows of the dashboard fields
+    DIRECTION_ROW = 1
+    STATUS_ROW = 2
+    PROXIMITY_ROW = 3
+    LOCATION_ROW = 8
+    AIRPORT_ROW = 9
+
     def __init__(self, user_name: str = "Player", battery_percentage: int = 100, distance_km: float = 0, current_country_name: str = "", current_airport_name: str = "", direction_to_goal: CompassDirection = CompassDirection.N, difficulty: Difficulty | None = None) -> None:
         option_config = MenuOptionConfig(
             width=20,
         )
         self.show_direction = True
+        self.show_proximity = False
+        self.navigation: NavigationState | None = None
+        self._window: curses.window | None = None
+        self._drawn_exit_menu = False
+        self._dirty_rows: set[int] = set()
 
         start_button = MenuOption("Takeoff", MainViewResult.TAKEOFF, option_config)
         statistics_button = MenuOption("Statistics", None, option_config)
@@ -64,6 +67,7 @@ class MainView(Menu):
         self.direction_display = TextElement(f"{direction_to_goal.value}", width=menu_width, alignment=Alignment.CENTER, offset_y=-1)
         self.distance_display = TextElement(f"{distance_km}", prefix=distance_prefix, suffix=distance_suffix, width=menu_width, alignment=Alignment.CENTER)
         self.battery_display = TextElement(f"{battery_percentage}", prefix=battery_prefix, suffix=battery_suffix, width=menu_width, alignment=Alignment.RIGHT)
+        self.proximity_display = TextElement("", width=menu_width, alignment=Alignment.CENTER, offset_y=1)
 
         # bottom 2 rows: country (left), airport (left)
         self.continent_display = TextElement("N/A", alignment=Alignment.LEFT)
@@ -81,38 +85,76 @@ class MainView(Menu):
         elements.extend(self.buttons_menu.menu_elements)
         super().__init__(elements)
 
+    def apply_navigation(self, navigation: NavigationState | None) -> bool:
+        """Update only the fields that differ from the last applied state; returns whether anything changed"""
+        previous = self.navigation
+        if navigation is None or previous == navigation:
+            return False
+        if previous is None or previous.airport_name != navigation.airport_name:
+            self.set_airport(navigation.airport_name)
+        if previous is None or previous.country_name != navigation.country_name:
+            self.set_country(navigation.country_name)
+        if previous is None or previous.continent != navigation.continent:
+            self.set_continent(navigation.continent)
+        if previous is None or previous.battery != navigation.battery:
+            self.set_battery(navigation.battery)
+        if previous is None or previous.direction != navigation.direction:
+            self.set_direction(navigation.direction)
+        if previous is None or previous.distance_km != navigation.distance_km:
+            self.set_distance(navigation.distance_km)
+        if previous is None or previous.closest_percent != navigation.closest_percent:
+            self.set_proximity(navigation.closest_percent)
+        self.navigation = navigation
+        return True
+
     def set_direction(self, direction: CompassDirection) -> None:
         self.direction_display.set_text(f"{direction.value}")
+        self._dirty_rows.add(self.DIRECTION_ROW)
 
     def set_distance(self, distance_km: float) -> None:
         self.distance_display.set_text(f"{distance_km:.1f}")
+        self._dirty_rows.add(self.STATUS_ROW)
+
+    def set_proximity(self, closest_percent: float | None) -> None:
+        if closest_percent is None:
+            self.proximity_display.set_text("")
+        else:
+            self.proximity_display.set_text(f"In the closest {math.ceil(closest_percent)}% of airports")
+        self._dirty_rows.add(self.PROXIMITY_ROW)
 
     def set_battery(self, battery: int) -> None:
         self.battery_display.set_text(f"{battery}")
+        self._dirty_rows.add(self.STATUS_ROW)
 
     def set_continent(self, continent_name: str) -> None:
         self.continent_display.set_text(continent_name)
+        self._dirty_rows.add(self.LOCATION_ROW)
 
     def set_country(self, country_name: str) -> None:
         self.country_display.set_text(country_name)
+        self._dirty_rows.add(self.LOCATION_ROW)
 
     def set_airport(self, airport_name: str) -> None:
         self.airport_display.set_text(airport_name)
+        self._dirty_rows.add(self.AIRPORT_ROW)
 
     def set_difficulty(self, difficulty: Difficulty) -> None:
         self.difficulty_display.set_text(difficulty.value.capitalize())
+        self._dirty_rows.add(self.LOCATION_ROW)
 
     def show_correct_continent(self, show: bool = True) -> None:
         if show:
             self.continent_display.set_prefix(self.correct_continent_prefix)
         else:
             self.continent_display.set_prefix("")
+        self._dirty_rows.add(self.LOCATION_ROW)
 
     def show_correct_country(self, show: bool = True) -> None:
         if show:
             self.country_display.set_prefix(self.correct_country_prefix)
         else:
             self.country_display.set_prefix("")
+        self._dirty_rows.add(self.LOCATION_ROW)
 
     def get_width(self) -> int:
         return self.buttons_menu.get_width()
@@ -121,26 +163,49 @@ class MainView(Menu):
         pass
 
     def on_draw(self, window: curses.window) -> None:
-        x = 2
-        y = 2
-
-        self.name_display.draw(window, x, y)
-        if self.show_direction:
-            self.direction_display.draw(window, x, y)
-        self.distance_display.draw(window, x, y)
-        self.battery_display.draw(window, x, y)
-
-        self.continent_display.draw(window, x, y + 6)
-        self.country_display.draw(window, x + self.continent_display.get_width() + 2, y + 6)
-        self.airport_display.draw(window, x, y + 7)
-
-        self.difficulty_display.draw(window, x, y + 6)
+        # A new curses window, or the exit menu opening or closing over the buttons, needs a full frame
+        full_frame = window is not self._window or self.show_exit_menu != self._drawn_exit_menu
+        if full_frame:
+            window.erase()
+            rows = [self.DIRECTION_ROW, self.STATUS_ROW, self.PROXIMITY_ROW, self.LOCATION_ROW, self.AIRPORT_ROW]
+        else:
+            rows = sorted(self._dirty_rows)
+        for row in rows:
+            if not full_frame:
+                window.move(row, 0)
+                window.clrtoeol()
+            self._draw_row(window, row)
+        self._window = window
+        self._drawn_exit_menu = self.show_exit_menu
+        self._dirty_rows.clear()
 
         if self.show_exit_menu:
             self.exit_menu.on_draw(window)
         else:
             self.buttons_menu.on_draw(window)
 
+    def invalidate(self) -> None:
+        """Draw the next frame in full, for a screen that was used by something else meanwhile"""
+        self._window = None
+
+    def _draw_row(self, window: curses.window, row: int) -> None:
+        x = 2
+        y = self.STATUS_ROW
+        if row == self.DIRECTION_ROW and self.show_direction:
+            self.direction_display.draw(window, x, y)
+        elif row == self.STATUS_ROW:
+            self.name_display.draw(window, x, y)
+            self.distance_display.draw(window, x, y)
+            self.battery_display.draw(window, x, y)
+        elif row == self.PROXIMITY_ROW and self.show_proximity:
+            self.proximity_display.draw(window, x, y)
+        elif row == self.LOCATION_ROW:
+            self.continent_display.draw(window, x, row)
+            self.country_display.draw(window, x + self.continent_display.get_width() + 2, row)
+            self.difficulty_display.draw(window, x, row)
+        elif row == self.AIRPORT_ROW:
+            self.airport_display.draw(window, x, row)
+
     def on_get_input(self, key: int, window: curses.window) -> MainViewResult | None:
         """Return True to exit menu, False to continue"""
         if key in(8, curses.KEY_BACKSPACE) and not self.show_exit_menu:  # Backspace
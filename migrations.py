@@ -0,0 +1,200 @@
+"""Schema migrations for databases created from an older database.sql.
+
+Usage: python migrations.py          apply pending migrations
+       python migrations.py check    EXPLAIN the hot lookups and fail if they do not use their index
+"""
+import sys
+from typing import Callable, List, Tuple
+
+from models import DatabaseConnection, mysql_connector
+from statements import STATEMENTS
+from text_utils import fold_name
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def column_exists(db: DatabaseConnection, table: str, column: str) -> bool:
+    query = """SELECT COUNT(*) AS found
+               FROM information_schema.columns
+               WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s"""
+    result = db.execute_query(query, (table, column))
+    return bool(result and result[0]['found'])
+
+
+def index_exists(db: DatabaseConnection, table: str, index: str) -> bool:
+    query = """SELECT COUNT(*) AS found
+               FROM information_schema.statistics
+               WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s"""
+    result = db.execute_query(query, (table, index))
+    return bool(result and result[0]['found'])
+
+
+def run_ddl(db: DatabaseConnection, statement: str):
+    """DDL errors are raised, unlike DatabaseConnection.execute_update which only prints them"""
+    db.cursor.execute(statement)
+
+
+def backfill_folded_names(db: DatabaseConnection, table: str, key_column: str) -> int:
+    rows = db.execute_query(f"SELECT {key_column} AS row_key, name FROM {table}") or []
+    updates = [(fold_name(row['name']), row['row_key']) for row in rows]
+    query = f"UPDATE {table} SET name_folded = %s WHERE {key_column} = %s"
+    written = 0
+    for start in range(0, len(updates), BACKFILL_BATCH_SIZE):
+        written += db.execute_batch(query, updates[start:start + BACKFILL_BATCH_SIZE])
+    return written
+
+
+def migrate_name_folded(db: DatabaseConnection):
+    for table, length, index in (('country', 100, 'idx_country_name_folded'),
+                                 ('airport', 150, 'idx_airport_name_folded')):
+        if not column_exists(db, table, 'name_folded'):
+            run_ddl(db, f"ALTER TABLE {table} ADD COLUMN name_folded varchar({length}) DEFAULT NULL")
+        if not index_exists(db, table, index):
+            run_ddl(db, f"ALTER TABLE {table} ADD INDEX {index} (name_folded)")
+    backfill_folded_names(db, 'country', 'code')
+    backfill_folded_names(db, 'airport', 'id')
+
+
+def migrate_daily_challenge(db: DatabaseConnection):
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `daily_challenge` (
+                       `challenge_date` date NOT NULL,
+                       `difficulty_level` enum('easy','medium','hard') NOT NULL,
+                       `boss_airport_id` int(11) NOT NULL,
+                       `starting_airport_id` int(11) NOT NULL,
+                       `deck_seed` bigint NOT NULL,
+                       `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (`challenge_date`, `difficulty_level`),
+                       FOREIGN KEY (`boss_airport_id`) REFERENCES `airport` (`id`),
+                       FOREIGN KEY (`starting_airport_id`) REFERENCES `airport` (`id`)
+                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `daily_result` (
+                       `challenge_date` date NOT NULL,
+                       `difficulty_level` enum('easy','medium','hard') NOT NULL,
+                       `player_id` int(11) NOT NULL,
+                       `session_id` int(11) NOT NULL,
+                       `status` enum('won','lost') NOT NULL,
+                       `countries_visited` int(11) NOT NULL,
+                       `puzzles_solved` int(11) NOT NULL,
+                       `battery_level` int(11) NOT NULL,
+                       `completed_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (`challenge_date`, `difficulty_level`, `player_id`),
+                       KEY `idx_daily_result_board` (`challenge_date`, `difficulty_level`, `status`, `countries_visited`),
+                       FOREIGN KEY (`player_id`) REFERENCES `player` (`id`) ON DELETE CASCADE
+                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+
+
+def migrate_save_deltas(db: DatabaseConnection):
+    if not column_exists(db, 'game_save', 'base_blob'):
+        run_ddl(db, "ALTER TABLE `game_save` ADD COLUMN `base_blob` mediumblob NULL AFTER `game_data`")
+    if not column_exists(db, 'game_save', 'base_seq'):
+        run_ddl(db, "ALTER TABLE `game_save` ADD COLUMN `base_seq` int(11) NOT NULL DEFAULT 0 AFTER `base_blob`")
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `game_save_delta` (
+                       `save_id` int(11) NOT NULL,
+                       `seq` int(11) NOT NULL,
+                       `delta` blob NOT NULL,
+                       `created_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (`save_id`, `seq`),
+                       FOREIGN KEY (`save_id`) REFERENCES `game_save` (`id`) ON DELETE CASCADE
+                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+
+
+def migrate_offline_sync(db: DatabaseConnection):
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `offline_sync` (
+                       `op_id` char(32) NOT NULL,
+                       `entity` varchar(16) NOT NULL,
+                       `remote_id` int(11) NOT NULL,
+                       `synced_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (`op_id`)
+                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+
+
+def migrate_session_archive(db: DatabaseConnection):
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `game_session_archive` (
+                       `id` int(11) NOT NULL,
+                       `player_id` int(11) NOT NULL,
+                       `status` enum('active','won','lost','abandoned') NOT NULL,
+                       `difficulty_level` enum('easy','medium','hard') NOT NULL,
+                       `score` int(11) NOT NULL DEFAULT 0,
+                       `started_at` timestamp NULL DEFAULT NULL,
+                       `completed_at` timestamp NULL DEFAULT NULL,
+                       `session_blob` blob NOT NULL,
+                       `archived_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (`id`),
+                       KEY `idx_session_archive_player` (`player_id`),
+                       FOREIGN KEY (`player_id`) REFERENCES `player` (`id`) ON DELETE CASCADE
+                     ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+
+
+def migrate_daily_abandoned(db: DatabaseConnection):
+    run_ddl(db, "ALTER TABLE `daily_result` MODIFY `status` enum('won','lost','abandoned') NOT NULL")
+
+
+MIGRATIONS: List[Tuple[str, Callable[[DatabaseConnection], None]]] = [
+    ('001_name_folded', migrate_name_folded),
+    ('002_daily_challenge', migrate_daily_challenge),
+    ('003_save_deltas', migrate_save_deltas),
+    ('004_offline_sync', migrate_offline_sync),
+    ('005_session_archive', migrate_session_archive),
+    ('006_daily_abandoned', migrate_daily_abandoned),
+]
+
+# (statement name, sample params, index the plan must use)
+INDEX_CHECKS = [
+    ('country.by_name', ('finland',), 'idx_country_name_folded'),
+    ('airport.by_name', ('helsinki airport',), 'idx_airport_name_folded'),
+]
+
+
+def ensure_migration_table(db: DatabaseConnection):
+    run_ddl(db, """CREATE TABLE IF NOT EXISTS `schema_migration` (
+                     `name` varchar(100) NOT NULL,
+                     `applied_at` timestamp DEFAULT CURRENT_TIMESTAMP,
+                     PRIMARY KEY (`name`)
+                   ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci""")
+
+
+def apply_migrations(db: DatabaseConnection) -> List[str]:
+    ensure_migration_table(db)
+    applied = {row['name'] for row in db.execute_query("SELECT name FROM schema_migration") or []}
+    newly_applied = []
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        migrate(db)
+        db.execute_update("INSERT INTO schema_migration (name) VALUES (%s)", (name,))
+        newly_applied.append(name)
+    return newly_applied
+
+
+def check_index_usage(db: DatabaseConnection) -> bool:
+    ok = True
+    for name, params, expected_index in INDEX_CHECKS:
+        plan = db.execute_query("EXPLAIN " + STATEMENTS[name], params) or []
+        used = [row.get('key') for row in plan if row.get('key')]
+        uses_index = expected_index in used
+        ok = ok and uses_index
+        print(f"{'ok  ' if uses_index else 'FAIL'} {name}: keys used {used or 'none'}, expected {expected_index}")
+    return ok
+
+
+def main():
+    db = DatabaseConnection()
+    if not db.connect():
+        raise SystemExit(1)
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == 'check':
+            if not check_index_usage(db):
+                raise SystemExit(1)
+            return
+        try:
+            applied = apply_migrations(db)
+        except mysql_connector.Error as e:
+            print(f"Migration failed: {e}")
+            raise SystemExit(1)
+        print(f"Applied: {', '.join(applied)}" if applied else "Database is up to date.")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
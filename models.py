@@ -1,26 +1,50 @@
-﻿import mysql.connector
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+﻿from datetime import date, datetime
+from typing import Callable, Iterator, List, Dict, Optional, Tuple, TypeVar
 import json
+import zlib
 from config import Config
 from data import *
+from airport_store import AirportStore
+from challenge_deck import ChallengeDeck
+from row_mapper import AIRPORT_MAPPER, COUNTRY_MAPPER
+import save_delta
+from statements import STATEMENTS, StatementRegistry
+from startup_profile import LazyModule
+from text_utils import fold_name
+
+T = TypeVar('T')
+
+mysql_connector = LazyModule('mysql.connector')
 
 
 class DatabaseConnection:
-    def __init__(self):
+    def __init__(self, **overrides):
+        """overrides replace keys of Config.get_db_config(), e.g. host for a replica"""
+        self.overrides = overrides
         self.connection = None
         self.cursor = None
+        self.statements: StatementRegistry | None = None
 
     def connect(self):
         try:
-            self.connection = mysql.connector.connect(**Config.get_db_config())
+            self.connection = mysql_connector.connect(**{**Config.get_db_config(), **self.overrides})
             self.cursor = self.connection.cursor(dictionary=True)
+            self.statements = StatementRegistry(self.connection, Config.DB_PREPARED_STATEMENTS)
             return True
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Database connection error: {e}")
             return False
 
+    def is_healthy(self) -> bool:
+        """True if connected and the server answers a ping"""
+        try:
+            return bool(self.connection) and self.connection.is_connected()
+        except mysql_connector.Error:
+            return False
+
     def disconnect(self):
+        if self.statements:
+            self.statements.close()
         if self.cursor:
             self.cursor.close()
         if self.connection:
@@ -33,10 +57,49 @@ class DatabaseConnection:
             else:
                 self.cursor.execute(query)
             return self.cursor.fetchall()
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Query exec error: {e}")
             return None
 
+    def iter_query(self, query: str, params: tuple = None, chunk_size: int = 500,
+                   as_tuples: bool = False, raise_errors: bool = False) -> Iterator[dict | tuple]:
+        """Stream rows in fetchmany chunks through an unbuffered cursor instead of fetching them all.
+
+        as_tuples skips building a dict per row. Nothing else can run on the connection until the
+        generator is exhausted or closed; closing it early discards the unread rows.
+        An error is printed and ends the rows early, like the other helpers. Callers that must not
+        mistake that for the whole result, such as exports, pass raise_errors to get the error instead.
+        """
+        cursor = self.connection.cursor(dictionary=not as_tuples, buffered=False)
+        exhausted = False
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield from rows
+        except mysql_connector.Error as e:
+            if raise_errors:
+                raise
+            print(f"Query exec error: {e}")
+        finally:
+            try:
+                if not exhausted:
+                    self.connection.consume_results()
+                cursor.close()
+            except mysql_connector.Error as e:
+                print(f"Cursor close error: {e}")
+
+    def iter_named(self, name: str, params: tuple = (), chunk_size: int = 500,
+                   as_tuples: bool = False, raise_errors: bool = False) -> Iterator[dict | tuple]:
+        """iter_query for a statement from statements.STATEMENTS; streamed statements are not prepared"""
+        return self.iter_query(STATEMENTS[name], params, chunk_size, as_tuples, raise_errors)
+
     def execute_update(self, query: str, params: tuple = None):
         try:
             if params:
@@ -45,10 +108,61 @@ class DatabaseConnection:
                 self.cursor.execute(query)
             self.connection.commit()
             return self.cursor.rowcount
-        except mysql.connector.Error as e:
+        except mysql_connector.Error as e:
             print(f"Update execution error: {e}")
             return 0
 
+    def query_named(self, name: str, params: tuple = ()):
+        """Run a statement from statements.STATEMENTS and return its rows as dicts"""
+        try:
+            return self.statements.query(name, params)
+        except mysql_connector.Error as e:
+            print(f"Query exec error ({name}): {e}")
+            return None
+
+    def query_named_rows(self, name: str, params: tuple = ()) -> Tuple[tuple, list]:
+        """query_named returning (column names, tuple rows), for the row mappers; ((), []) on error"""
+        try:
+            return self.statements.query_rows(name, params)
+        except mysql_connector.Error as e:
+            print(f"Query exec error ({name}): {e}")
+            return (), []
+
+    def update_named(self, name: str, params: tuple = ()):
+        try:
+            cursor = self.statements.update(name, params)
+            self.connection.commit()
+            return cursor.rowcount
+        except mysql_connector.Error as e:
+            print(f"Update execution error ({name}): {e}")
+            return 0
+
+    def run_in_transaction(self, work: Callable[[StatementRegistry], T]) -> Optional[T]:
+        """Call work with the named statements inside one transaction; None if it was rolled back"""
+        try:
+            self.connection.start_transaction()
+            result = work(self.statements)
+            self.connection.commit()
+            return result
+        except mysql_connector.Error as e:
+            self.connection.rollback()
+            print(f"Transaction error: {e}")
+            return None
+
+    def execute_batch(self, query: str, rows: List[tuple]) -> int:
+        """Run one executemany inside a transaction, returns the number of rows written or 0 on failure"""
+        if not rows:
+            return 0
+        try:
+            self.connection.start_transaction()
+            self.cursor.executemany(query, rows)
+            self.connection.commit()
+            return len(rows)
+        except mysql_connector.Error as e:
+            self.connection.rollback()
+            print(f"Batch execution error: {e}")
+            return 0
+
 
 class Player:
     def __init__(self, db: DatabaseConnection):
@@ -60,8 +174,7 @@ class Player:
         self.difficulty_level: Difficulty = Difficulty.EASY
 
     def create_or_get_player(self, name: str) -> bool:
-        query = "SELECT * FROM player WHERE name = %s"
-        result = self.db.execute_query(query, (name,))
+        result = self.db.query_named('player.by_name', (name,))
 
         if result:
             player_data = result[0]
@@ -72,26 +185,21 @@ class Player:
             self.difficulty_level = player_data['difficulty_level']
             return True
         else:
-            query = """INSERT INTO player (name, battery_level, difficulty_level)
-                       VALUES (%s, %s, %s)"""
-            if self.db.execute_update(query, (name, Config.DEFAULT_BATTERY, 'easy')):
+            if self.db.update_named('player.insert', (name, Config.DEFAULT_BATTERY, 'easy')):
                 return self.create_or_get_player(name)
         return False
 
     def add_battery(self, amount: int):
         self.battery_level = max(0, min(100, self.battery_level + amount))
-        query = "UPDATE player SET battery_level = %s WHERE id = %s"
-        self.db.execute_update(query, (self.battery_level, self.id))
+        self.db.update_named('player.set_battery', (self.battery_level, self.id))
 
     def set_battery(self, amount: int):
         self.battery_level = max(0, min(100, amount))
-        query = "UPDATE player SET battery_level = %s WHERE id = %s"
-        self.db.execute_update(query, (self.battery_level, self.id))
+        self.db.update_named('player.set_battery', (self.battery_level, self.id))
 
     def set_difficulty(self, difficulty: Difficulty):
         self.difficulty_level = difficulty
-        query = "UPDATE player SET difficulty_level = %s WHERE id = %s"
-        self.db.execute_update(query, (difficulty.value, self.id))
+        self.db.update_named('player.set_difficulty', (difficulty.value, self.id))
 
 
 class Country:
@@ -99,19 +207,16 @@ class Country:
         self.db = db
 
     def get_all_countries(self) -> List[CountryDto]:
-        query = "SELECT * FROM country ORDER BY name"
-        results = self.db.execute_query(query)
-        return [CountryDto.create(row) for row in results] if results else []
+        columns, rows = self.db.query_named_rows('country.all')
+        return COUNTRY_MAPPER.map_rows(columns, rows)
 
     def get_country_by_name(self, name: str) -> Optional[CountryDto]:
-        query = "SELECT * FROM country WHERE LOWER(name) = LOWER(%s)"
-        result = self.db.execute_query(query, (name,))
-        return CountryDto.create(result[0]) if result else None
+        columns, rows = self.db.query_named_rows('country.by_name', (fold_name(name),))
+        return COUNTRY_MAPPER.map_row(columns, rows[0]) if rows else None
 
     def get_country_by_code(self, code: str) -> Optional[CountryDto]:
-        query = "SELECT * FROM country WHERE code = %s"
-        result = self.db.execute_query(query, (code,))
-        return CountryDto.create(result[0]) if result else None
+        columns, rows = self.db.query_named_rows('country.by_code', (code,))
+        return COUNTRY_MAPPER.map_row(columns, rows[0]) if rows else None
 
 
 class Airport:
@@ -119,38 +224,35 @@ class Airport:
         self.db = db
 
     def get_airports_by_country(self, country: CountryDto) -> List[AirportDto]:
-        query = """SELECT a.*, c.name as country_name
-                   FROM airport a
-                            JOIN country c ON a.country_code = c.code
-                   WHERE a.country_code = %s
-                   ORDER BY a.is_major_hub DESC, a.name"""
-        results = self.db.execute_query(query, (country.code,))
-        return [AirportDto.create(row) for row in results] if results else []
+        columns, rows = self.db.query_named_rows('airport.by_country', (country.code,))
+        return AIRPORT_MAPPER.map_rows(columns, rows)
 
     def get_airport_by_name(self, name: str) -> Optional[AirportDto]:
-        query = """SELECT a.*, c.name as country_name, c.continent
-                   FROM airport a
-                            JOIN country c ON a.country_code = c.code
-                   WHERE LOWER(a.name) = LOWER(%s)"""
-        result = self.db.execute_query(query, (name,))
-        return AirportDto.create(result[0]) if result else None
+        columns, rows = self.db.query_named_rows('airport.by_name', (fold_name(name),))
+        return AIRPORT_MAPPER.map_row(columns, rows[0]) if rows else None
 
     def get_airport_by_id(self, airport_id: int) -> Optional[AirportDto]:
-        query = """SELECT a.*, c.name as country_name, c.continent
-                   FROM airport a
-                            JOIN country c ON a.country_code = c.code
-                   WHERE a.id = %s"""
-        result = self.db.execute_query(query, (airport_id,))
-        return AirportDto.create(result[0]) if result else None
+        columns, rows = self.db.query_named_rows('airport.by_id', (airport_id,))
+        return AIRPORT_MAPPER.map_row(columns, rows[0]) if rows else None
 
     def get_random_airport(self) -> Optional[AirportDto]:
-        query = """SELECT a.*, c.name as country_name, c.continent
-                   FROM airport a
-                            JOIN country c ON a.country_code = c.code
-                   WHERE a.is_major_hub = true
-                   ORDER BY RAND() LIMIT 1"""
-        result = self.db.execute_query(query)
-        return AirportDto.create(result[0]) if result else None
+        columns, rows = self.db.query_named_rows('airport.random_hub')
+        return AIRPORT_MAPPER.map_row(columns, rows[0]) if rows else None
+
+    def get_catalog_fingerprint(self) -> Tuple[int, int, int, int]:
+        """(airport count, highest airport id, country count, content checksum), used to detect stale catalog snapshots.
+
+        The checksum covers every column the snapshot copies, so renames and coordinate fixes count too.
+        """
+        result = self.db.query_named('airport.fingerprint')
+        if not result:
+            return 0, 0, 0, 0
+        row = result[0]
+        return (int(row['airport_count']), int(row['max_airport_id']), int(row['country_count']),
+                int(row['content_checksum']))
+
+    def load_airport_store(self) -> AirportStore:
+        return AirportStore.from_rows(self.db.iter_named('airport.all', chunk_size=2000))
 
 
 class GameSession:
@@ -167,31 +269,32 @@ class GameSession:
         self.puzzles_solved: int = 0
         self.countries_guessed: List[CountryDto] = []
         self.status: SessionStatus = SessionStatus.ACTIVE
+        self.score: int = 0
+        self.challenge_deck: ChallengeDeck | None = None
+        self.challenge_deck_state: Dict | None = None
+        self.daily_date: str | None = None
+        self.journal: 'TurnJournal | None' = None
+        self.writer: 'DbWriter | None' = None
 
     def get_guessed_country_codes(self) -> List[str]:
         return [country.code for country in self.countries_guessed] if self.countries_guessed else []
 
-    def create_new_session(self, player_id: int, difficulty: Difficulty, boss_airport: AirportDto) -> bool:
-        airport_model = Airport(self.db)
-        starting_airport = airport_model.get_random_airport()
+    def create_new_session(self, player_id: int, difficulty: Difficulty, boss_airport: AirportDto,
+                           starting_airport: AirportDto | None = None) -> bool:
+        if starting_airport is None:
+            starting_airport = Airport(self.db).get_random_airport()
 
         if not starting_airport:
             return False
 
-        query = """INSERT INTO game_session
-                   (player_id, difficulty_level, starting_airport_id, boss_airport_id,
-                    boss_country_code, current_airport_id, battery_level, countries_guessed)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
-
         countries_json = json.dumps([])
 
-        if self.db.execute_update(query, (
+        if self.db.update_named('session.insert', (
                 player_id, difficulty.value, starting_airport.id, boss_airport.id,
                 boss_airport.country_code, starting_airport.id,
                 Config.DEFAULT_BATTERY, countries_json
         )):
-            query = "SELECT * FROM game_session WHERE player_id = %s ORDER BY id DESC LIMIT 1"
-            result = self.db.execute_query(query, (player_id,))
+            result = self.db.query_named('session.latest_for_player', (player_id,))
             if result:
                 session_data = result[0]
                 self.id = session_data['id']
@@ -212,42 +315,64 @@ class GameSession:
                 return True
         return False
 
+    def to_save_data(self) -> Dict:
+        """The session as stored in game_save.game_data and in the turn journal"""
+        return {
+            'session_id': self.id,
+            'difficulty_level': self.difficulty_level.value,
+            'starting_airport_id': self.starting_airport_id,
+            'boss_airport_id': self.boss_airport_id,
+            'boss_country_code': self.boss_country_code,
+            'current_airport_id': self.current_airport_id,
+            'battery_level': self.battery_level,
+            'puzzles_solved': self.puzzles_solved,
+            'countries_guessed': self.get_guessed_country_codes(),
+            'status': self.status.value,
+            'score': self.score,
+            'challenge_deck': self.challenge_deck.to_state() if self.challenge_deck else self.challenge_deck_state,
+            'daily_date': self.daily_date,
+            'save_timestamp': datetime.now().isoformat()
+        }
+
+    def _write(self, name: str, params: tuple):
+        """With a journal attached the write is made durable locally and reaches MySQL via its drainer;
+        with only a writer it is queued for the writer thread"""
+        if self.journal:
+            self.journal.append_write(self.player_id, self.id, name, params)
+        elif self.writer:
+            self.writer.submit(name, params)
+        else:
+            self.db.update_named(name, params)
+
     def add_guessed_country(self, country: CountryDto):
         if country not in self.countries_guessed:
             self.countries_guessed.append(country)
-            query = "UPDATE game_session SET countries_guessed = %s WHERE id = %s"
             guessed_countries_codes = [c.code for c in self.countries_guessed]
-            self.db.execute_update(query, (json.dumps(guessed_countries_codes), self.id))
+            self._write('session.set_countries_guessed', (json.dumps(guessed_countries_codes), self.id))
 
     def update_current_airport(self, airport: AirportDto):
         self.current_airport_id = airport.id
-        query = "UPDATE game_session SET current_airport_id = %s WHERE id = %s"
-        self.db.execute_update(query, (airport.id, self.id))
+        self._write('session.set_current_airport', (airport.id, self.id))
 
     def add_battery(self, amount: int):
         self.battery_level = max(0, min(100, self.battery_level + amount))
-        query = "UPDATE game_session SET battery_level = %s WHERE id = %s"
-        self.db.execute_update(query, (self.battery_level, self.id))
+        self._write('session.set_battery', (self.battery_level, self.id))
 
     def deduct_battery(self, amount: int):
         self.battery_level = max(0, min(100, self.battery_level - amount))
-        query = "UPDATE game_session SET battery_level = %s WHERE id = %s"
-        self.db.execute_update(query, (self.battery_level, self.id))
+        self._write('session.set_battery', (self.battery_level, self.id))
 
     def increment_puzzles_solved(self):
         self.puzzles_solved += 1
-        query = "UPDATE game_session SET puzzles_solved = %s WHERE id = %s"
-        self.db.execute_update(query, (self.puzzles_solved, self.id))
+        self._write('session.set_puzzles_solved', (self.puzzles_solved, self.id))
 
     def update_status(self, status: SessionStatus):
         self.status = status
         completed_at = datetime.now() if status is SessionStatus.WON or SessionStatus.LOST or SessionStatus.ABANDONED else None
         if completed_at:
-            query = "UPDATE game_session SET status = %s, completed_at = %s WHERE id = %s"
-            self.db.execute_update(query, (status.value, completed_at, self.id))
+            self._write('session.complete', (status.value, completed_at, self.id))
         else:
-            query = "UPDATE game_session SET status = %s WHERE id = %s"
-            self.db.execute_update(query, (status.value, self.id))
+            self._write('session.set_status', (status.value, self.id))
 
 
 class Challenge:
@@ -255,11 +380,7 @@ class Challenge:
         self.db = db
 
     def get_random_open_question(self, difficulty: Difficulty) -> Optional[OpenQuestion]:
-        query = """SELECT * \
-                   FROM question_task
-                   WHERE difficulty_level = %s
-                   ORDER BY RAND() LIMIT 1"""
-        result = self.db.execute_query(query, (difficulty.value,))
+        result = self.db.query_named('challenge.random_open', (difficulty.value,))
         if result:
             question_data = result[0]
             return OpenQuestion(
@@ -269,22 +390,31 @@ class Challenge:
         return None
 
     def get_random_multiple_choice(self, difficulty: Difficulty) -> Optional[MultipleChoiceQuestion]:
-        query = """SELECT * \
-                   FROM multiple_choice_question
-                   WHERE difficulty_level = %s
-                   ORDER BY RAND() LIMIT 1"""
-        result = self.db.execute_query(query, (difficulty.value,))
+        result = self.db.query_named('challenge.random_multiple_choice', (difficulty.value,))
 
         if not result:
             return None
+        return self._build_multiple_choice(result[0])
 
-        question = result[0]
+    def get_question_cards(self, difficulty: Difficulty) -> List[Tuple[str, int]]:
+        """(challenge type, question id) for every question of a difficulty"""
+        open_ids = self.db.query_named('challenge.open_ids', (difficulty.value,)) or []
+        choice_ids = self.db.query_named('challenge.multiple_choice_ids', (difficulty.value,)) or []
+        return ([(ChallengeType.OPEN_QUESTION.value, row['id']) for row in open_ids] +
+                [(ChallengeType.MULTIPLE_CHOICE.value, row['id']) for row in choice_ids])
 
-        query = """SELECT * \
-                   FROM multiple_choice_answer
-                   WHERE question_id = %s
-                   ORDER BY RAND()"""
-        answers = self.db.execute_query(query, (question['id'],))
+    def get_open_question(self, question_id: int) -> Optional[OpenQuestion]:
+        result = self.db.query_named('challenge.open_by_id', (question_id,))
+        if result:
+            return OpenQuestion(question=result[0]['question'], answer=result[0]['correct_answer'])
+        return None
+
+    def get_multiple_choice(self, question_id: int) -> Optional[MultipleChoiceQuestion]:
+        result = self.db.query_named('challenge.multiple_choice_by_id', (question_id,))
+        return self._build_multiple_choice(result[0]) if result else None
+
+    def _build_multiple_choice(self, question: Dict) -> MultipleChoiceQuestion:
+        answers = self.db.query_named('challenge.answers', (question['id'],))
 
         options = [MultipleChoiceOption(name=ans['answer'], is_correct=ans['is_correct']) for ans in answers] if answers else []
         return MultipleChoiceQuestion(
@@ -293,52 +423,104 @@ class Challenge:
         )
 
 
+class _DeltaChain:
+    """What is stored for one save in delta mode, so the next save can be written as a diff"""
+
+    def __init__(self, save_id: int, state: Dict, seq: int, base_seq: int):
+        self.save_id = save_id
+        self.state = state
+        self.seq = seq
+        self.base_seq = base_seq
+
+
+# game_data of a delta-mode save; the state itself lives in base_blob and game_save_delta
+DELTA_PLACEHOLDER = json.dumps({'storage': 'delta'})
+
+
 class GameSave:
-    def __init__(self, db: DatabaseConnection):
+    def __init__(self, db: DatabaseConnection, storage_mode: str | None = None, writer: 'DbWriter | None' = None):
         self.db = db
+        self.storage_mode = storage_mode or Config.SAVE_STORAGE_MODE
+        self.writer = writer
+        self._chains: Dict[Tuple[int, str], _DeltaChain] = {}
 
     def save_game(self, player_id: int, session: GameSession, save_name: str = "autosave") -> bool:
-        game_data = {
-            'session_id': session.id,
-            'difficulty_level': session.difficulty_level,
-            'starting_airport_id': session.starting_airport_id,
-            'boss_airport_id': session.boss_airport_id,
-            'boss_country_code': session.boss_country_code,
-            'current_airport_id': session.current_airport_id,
-            'battery_level': session.battery_level,
-            'puzzles_solved': session.puzzles_solved,
-            'countries_guessed': session.countries_guessed,
-            'status': session.status,
-            'score': session.score,
-            'save_timestamp': datetime.now().isoformat()
-        }
+        """With a writer the save is only queued; failures surface through the writer"""
+        game_data = session.to_save_data()
+        if self.writer:
+            self.writer.submit_call('save.game', lambda db: self._persist(db, player_id, save_name, game_data))
+            return True
+        return self._persist(self.db, player_id, save_name, game_data)
+
+    def _flush(self):
+        """Let queued saves land before reading saves back"""
+        if self.writer:
+            self.writer.flush(Config.DB_WRITER_FLUSH_SECONDS)
+
+    def _persist(self, db: DatabaseConnection, player_id: int, save_name: str, game_data: Dict) -> bool:
+        if self.storage_mode == 'delta':
+            return self._save_delta(db, player_id, save_name, game_data)
 
-        query = "SELECT id FROM game_save WHERE player_id = %s AND save_name = %s"
-        existing = self.db.execute_query(query, (player_id, save_name))
+        self._chains.pop((player_id, save_name), None)
+        existing = db.query_named('save.find', (player_id, save_name))
 
         if existing:
-            query = """UPDATE game_save
-                       SET game_data  = %s, \
-                           updated_at = CURRENT_TIMESTAMP
-                       WHERE player_id = %s \
-                         AND save_name = %s"""
-            return self.db.execute_update(query, (json.dumps(game_data), player_id, save_name)) > 0
+            return db.update_named('save.update', (json.dumps(game_data), player_id, save_name)) > 0
         else:
-            query = """INSERT INTO game_save (player_id, save_name, game_data)
-                       VALUES (%s, %s, %s)"""
-            return self.db.execute_update(query, (player_id, save_name, json.dumps(game_data))) > 0
+            return db.update_named('save.insert', (player_id, save_name, json.dumps(game_data))) > 0
 
-    def get_player_saves(self, player_id: int) -> List[GameSaveDto]:
-        query = """SELECT id, save_name, created_at, updated_at, game_data
-                   FROM game_save
-                   WHERE player_id = %s
-                   ORDER BY updated_at DESC"""
-        saves = self.db.execute_query(query, (player_id,))
+    def _save_delta(self, db: DatabaseConnection, player_id: int, save_name: str, game_data: Dict) -> bool:
+        chain = self._chains.get((player_id, save_name))
+        if chain is None or chain.seq - chain.base_seq >= Config.SAVE_DELTA_COMPACT_EVERY:
+            return self._save_base(db, player_id, save_name, game_data)
 
-        if saves:
+        delta = save_delta.diff_state(chain.state, game_data)
+        if delta is None:
+            return True
+        if not db.update_named('save.insert_delta',
+                               (chain.save_id, chain.seq + 1, save_delta.encode_delta(delta))):
+            self._chains.pop((player_id, save_name), None)
+            return False
+        chain.seq += 1
+        chain.state = game_data
+        return True
+
+    def _save_base(self, db: DatabaseConnection, player_id: int, save_name: str, game_data: Dict) -> bool:
+        """Write a fresh compressed snapshot; deltas up to base_seq stop applying and are pruned"""
+        self._chains.pop((player_id, save_name), None)
+        blob = save_delta.encode_base(game_data)
+        existing = db.query_named('save.find', (player_id, save_name))
+        if existing:
+            save_id, base_seq = existing[0]['id'], int(existing[0]['last_seq'])
+            if not db.update_named('save.update_base', (DELTA_PLACEHOLDER, blob, base_seq, save_id)):
+                return False
+            db.update_named('save.prune_deltas', (save_id, base_seq))
+        else:
+            if not db.update_named('save.insert_base', (player_id, save_name, DELTA_PLACEHOLDER, blob, 0)):
+                return False
+            existing = db.query_named('save.find', (player_id, save_name))
+            if not existing:
+                return False
+            save_id, base_seq = existing[0]['id'], 0
+        self._chains[(player_id, save_name)] = _DeltaChain(save_id, game_data, base_seq, base_seq)
+        return True
+
+    def get_player_saves(self, player_id: int) -> List[GameSaveDto]:
+        self._flush()
+        rows = self.db.query_named('save.list_for_player', (player_id,))
+
+        # One row per delta newer than the base, so a delta-mode preview shows the latest turn
+        saves = []
+        if rows:
+            for row in rows:
+                if saves and saves[-1]['id'] == row['id']:
+                    saves[-1]['deltas'].append(row['delta'])
+                    continue
+                row['deltas'] = [row['delta']] if row['delta'] is not None else []
+                saves.append(row)
             for save in saves:
                 try:
-                    game_data = json.loads(save['game_data'])
+                    game_data = save_delta.replay(save['game_data'], save['base_blob'], save['deltas'])
                     save['preview'] = {
                         'difficulty': game_data.get('difficulty_level', 'unknown'),
                         'battery': game_data.get('battery_level', 0),
@@ -346,43 +528,84 @@ class GameSave:
                         'countries_guessed': len(game_data.get('countries_guessed', [])),
                         'status': game_data.get('status', 'unknown')
                     }
-                except json.JSONDecodeError:
+                except (ValueError, zlib.error):
                     save['preview'] = {'error': 'Invalid save data'}
 
         return [GameSaveDto.create(s) for s in saves] if saves else []
 
     def load_game(self, save: GameSaveDto) -> Optional[Dict]:
         """Load and return the game data from a save"""
-        query = """SELECT game_data \
-                   FROM game_save
-                   WHERE player_id = %s \
-                     AND save_name = %s"""
-        result = self.db.execute_query(query, (save.player_id, save.save_name))
+        return self._load_state(save.player_id, save.save_name)
 
-        if result:
-            try:
-                return json.loads(result[0]['game_data'])
-            except json.JSONDecodeError:
-                return None
-        return None
+    def _load_state(self, player_id: int, save_name: str) -> Optional[Dict]:
+        self._flush()
+        # One read: the save row joined with every delta newer than its base
+        result = self.db.query_named('save.load', (player_id, save_name))
+        if not result:
+            return None
+
+        row = result[0]
+        deltas = [delta_row for delta_row in result if delta_row['seq'] is not None]
+        try:
+            state = save_delta.replay(row['game_data'], row['base_blob'], (d['delta'] for d in deltas))
+        except (ValueError, zlib.error):
+            return None
+        if row['base_blob'] is None:
+            return state
+        seq = deltas[-1]['seq'] if deltas else int(row['base_seq'])
+        self._chains[(player_id, save_name)] = _DeltaChain(row['id'], dict(state), seq, int(row['base_seq']))
+        return state
 
     def delete_save(self, save: GameSaveDto) -> bool:
-        query = "DELETE FROM game_save WHERE player_id = %s AND save_name = %s"
-        return self.db.execute_update(query, (save.player_id, save.save_name)) > 0
+        self._flush()
+        self._chains.pop((save.player_id, save.save_name), None)
+        return self.db.update_named('save.delete', (save.player_id, save.save_name)) > 0
 
     def restore_session_from_save(self, save_data: Dict, db: DatabaseConnection) -> Optional[GameSession]:
         session = GameSession(db)
 
         session.id = save_data.get('session_id')
-        session.difficulty_level = save_data.get('difficulty_level', 'easy')
+        session.difficulty_level = Difficulty(save_data.get('difficulty_level', 'easy'))
         session.starting_airport_id = save_data.get('starting_airport_id')
         session.boss_airport_id = save_data.get('boss_airport_id')
         session.boss_country_code = save_data.get('boss_country_code')
         session.current_airport_id = save_data.get('current_airport_id')
         session.battery_level = save_data.get('battery_level', 100)
         session.puzzles_solved = save_data.get('puzzles_solved', 0)
-        session.countries_guessed = save_data.get('countries_guessed', [])
-        session.status = save_data.get('status', 'active')
+        country_model = Country(db)
+        countries = [country_model.get_country_by_code(code) for code in save_data.get('countries_guessed', [])]
+        session.countries_guessed = [country for country in countries if country]
+        session.status = SessionStatus(save_data.get('status', 'active'))
         session.score = save_data.get('score', 0)
+        session.challenge_deck_state = save_data.get('challenge_deck')
+        session.daily_date = save_data.get('daily_date')
+
+        return session
+
+
+class DailyChallenge:
+    def __init__(self, db: DatabaseConnection):
+        self.db = db
+
+    def get_challenge(self, day: date, difficulty: Difficulty) -> Optional[DailyChallengeDto]:
+        result = self.db.query_named('daily.get', (day, difficulty.value))
+        return DailyChallengeDto.create(result[0]) if result else None
+
+    def store_challenge(self, challenge: DailyChallengeDto) -> bool:
+        """INSERT IGNORE, so when two players race to create the day only the first row is kept"""
+        return self.db.update_named('daily.insert', (
+            challenge.challenge_date, challenge.difficulty.value, challenge.boss_airport_id,
+            challenge.starting_airport_id, challenge.deck_seed)) > 0
+
+    def has_result(self, day: date, difficulty: Difficulty, player_id: int) -> bool:
+        return bool(self.db.query_named('daily.result_exists', (day, difficulty.value, player_id)))
+
+    def record_result(self, day: date, player_id: int, session: GameSession) -> bool:
+        """Only a player's first attempt counts, abandoned ones included; those are kept off the leaderboard"""
+        return self.db.update_named('daily.insert_result', (
+            day, session.difficulty_level.value, player_id, session.id, session.status.value,
+            len(session.countries_guessed), session.puzzles_solved, session.battery_level)) > 0
 
-        return session
\ No newline at end of file
+    def get_leaderboard(self, day: date, difficulty: Difficulty, limit: int = 10) -> List[DailyResultDto]:
+        result = self.db.query_named('daily.leaderboard', (day, difficulty.value, limit))
+        return [DailyResultDto.create(row) for row in result] if result else []
\ No newline at end of file
@@ -0,0 +1,20 @@
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from airport_util import CompassDirection
+
+
+@dataclass(frozen=True)
+class NavigationState:
+    """Everything the main view shows about where the pilot is, computed once per flight"""
+    airport_name: str
+    country_name: str
+    continent: str
+    distance_km: float
+    bearing: float
+    direction: CompassDirection
+    battery: int
+    closest_percent: Optional[float] = None
+
+    def with_battery(self, battery: int) -> 'NavigationState':
+        return self if battery == self.battery else replace(self, battery=battery)
@@ -0,0 +1,313 @@
+"""Offline play: a local question snapshot, a local store of players, sessions and saves, and a
+stand-in for DatabaseConnection that serves the game's named statements from them.
+
+BossFlightGameDriver switches to OfflineDatabase when MySQL cannot be reached and both the catalog
+snapshot and the question snapshot exist, so the models run unchanged. Rows created offline get
+negative ids, which never collide with MySQL ids, and an op_id that offline_sync uses to apply each
+of them exactly once when the database is back.
+
+Build the question snapshot with:  python offline_store.py build [path]
+"""
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from catalog_snapshot import CatalogSnapshot
+from config import Config
+from data import AirportDto
+from models import mysql_connector
+
+
+def _write_json(path: str, data: dict):
+    """Replace path atomically, so a crash leaves either the old or the new file"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'), default=str)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _now() -> str:
+    return datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
+class QuestionSnapshot:
+    """Every open and multiple choice question with its answers, read from a JSON file"""
+
+    def __init__(self, data: dict):
+        self.built_at: float = data['built_at']
+        self.open: Dict[int, dict] = {row['id']: row for row in data['open']}
+        self.multiple_choice: Dict[int, dict] = {row['id']: row for row in data['multiple_choice']}
+        self.answers: Dict[int, List[dict]] = {}
+        for row in data['answers']:
+            self.answers.setdefault(row['question_id'], []).append(row)
+
+    @classmethod
+    def open(cls, path: str = Config.QUESTION_SNAPSHOT_PATH) -> Optional['QuestionSnapshot']:
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        return time.time() - self.built_at > max_age_seconds
+
+
+def build_question_snapshot(db, path: str = Config.QUESTION_SNAPSHOT_PATH) -> bool:
+    try:
+        data = {
+            'built_at': time.time(),
+            'open': list(db.iter_query("SELECT id, question, correct_answer, difficulty_level FROM question_task",
+                                       raise_errors=True)),
+            'multiple_choice': list(db.iter_query("SELECT id, question, difficulty_level FROM multiple_choice_question",
+                                                  raise_errors=True)),
+            'answers': list(db.iter_query("SELECT id, question_id, answer, is_correct FROM multiple_choice_answer",
+                                          raise_errors=True)),
+        }
+    except mysql_connector.Error as e:
+        # A partial snapshot would be taken for the whole question bank
+        print(f"Question snapshot failed: {e}")
+        return False
+    if not data['open'] and not data['multiple_choice']:
+        return False
+    _write_json(path, data)
+    return True
+
+
+class OfflineStore:
+    """Players, sessions and saves created while offline, kept in one JSON file until they are synced"""
+
+    def __init__(self, path: str = Config.OFFLINE_STORE_PATH):
+        self.path = path
+        self.data = {'next_id': 1, 'players': [], 'sessions': [], 'saves': []}
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        _write_json(self.path, self.data)
+
+    def _new_row(self, table: str, row: dict) -> dict:
+        row['id'] = -self.data['next_id']
+        row['op_id'] = uuid.uuid4().hex
+        self.data['next_id'] += 1
+        self.data[table].append(row)
+        self._save()
+        return row
+
+    def has_pending(self) -> bool:
+        return bool(self.data['players'] or self.data['sessions'] or self.data['saves'])
+
+    def rows(self, table: str) -> List[dict]:
+        return list(self.data[table])
+
+    def clear(self):
+        self.data = {'next_id': self.data['next_id'], 'players': [], 'sessions': [], 'saves': []}
+        self._save()
+
+    def find(self, table: str, **match) -> List[dict]:
+        return [row for row in self.data[table] if all(row.get(k) == v for k, v in match.items())]
+
+    def update(self, table: str, row_id: int, **values) -> int:
+        rows = self.find(table, id=row_id)
+        for row in rows:
+            row.update(values)
+        if rows:
+            self._save()
+        return len(rows)
+
+    def add_player(self, name: str, battery_level: int, difficulty_level: str) -> dict:
+        return self._new_row('players', {'name': name, 'current_airport_id': None, 'battery_level': battery_level,
+                                         'difficulty_level': difficulty_level, 'created_at': _now()})
+
+    def add_session(self, player_id: int, difficulty_level: str, starting_airport_id: int, boss_airport_id: int,
+                    boss_country_code: str, current_airport_id: int, battery_level: int,
+                    countries_guessed: str) -> dict:
+        return self._new_row('sessions', {
+            'player_id': player_id, 'difficulty_level': difficulty_level,
+            'starting_airport_id': starting_airport_id, 'boss_airport_id': boss_airport_id,
+            'boss_country_code': boss_country_code, 'current_airport_id': current_airport_id,
+            'battery_level': battery_level, 'puzzles_solved': 0, 'countries_guessed': countries_guessed,
+            'status': 'active', 'score': 0, 'started_at': _now(), 'completed_at': None})
+
+    def put_save(self, player_id: int, save_name: str, game_data: str) -> int:
+        rows = self.find('saves', player_id=player_id, save_name=save_name)
+        if rows:
+            # A new op_id per version: the synced version is a different write than an earlier one
+            rows[0].update(game_data=game_data, updated_at=_now(), op_id=uuid.uuid4().hex)
+            self._save()
+            return 1
+        self._new_row('saves', {'player_id': player_id, 'save_name': save_name, 'game_data': game_data,
+                                'created_at': _now(), 'updated_at': _now()})
+        return 1
+
+    def delete_save(self, player_id: int, save_name: str) -> int:
+        before = len(self.data['saves'])
+        self.data['saves'] = [row for row in self.data['saves']
+                              if (row['player_id'], row['save_name']) != (player_id, save_name)]
+        removed = before - len(self.data['saves'])
+        if removed:
+            self._save()
+        return removed
+
+
+class OfflineDatabase:
+    """Answers the named statements the game uses while MySQL is unreachable; anything else is refused"""
+
+    def __init__(self, catalog: CatalogSnapshot, questions: QuestionSnapshot, store: OfflineStore):
+        self.catalog = catalog
+        self.questions = questions
+        self.store = store
+        self._hubs: List[AirportDto] | None = None
+        self._queries: Dict[str, Callable[..., List[dict]]] = {
+            'player.by_name': lambda name: self._public(store.find('players', name=name)),
+            'country.all': lambda: [asdict(c) for c in catalog.get_all_countries()],
+            'country.by_name': lambda name: self._one(catalog.get_country_by_name(name)),
+            'country.by_code': lambda code: self._one(catalog.get_country_by_code(code)),
+            'airport.by_id': lambda airport_id: self._one(catalog.get_airport_by_id(airport_id)),
+            'airport.by_name': lambda name: self._one(catalog.get_airport_by_name(name)),
+            'airport.by_country': self._airports_by_country,
+            'airport.random_hub': lambda: [asdict(random.choice(self.hubs()))] if self.hubs() else [],
+            'session.latest_for_player': lambda player_id: self._public(
+                store.find('sessions', player_id=player_id)[-1:]),
+            'challenge.random_open': lambda level: self._random(self.questions.open, level),
+            'challenge.random_multiple_choice': lambda level: self._random(self.questions.multiple_choice, level),
+            'challenge.open_ids': lambda level: self._ids(self.questions.open, level),
+            'challenge.multiple_choice_ids': lambda level: self._ids(self.questions.multiple_choice, level),
+            'challenge.open_by_id': lambda question_id: self._by_id(self.questions.open, question_id),
+            'challenge.multiple_choice_by_id': lambda question_id: self._by_id(
+                self.questions.multiple_choice, question_id),
+            'challenge.answers': self._answers,
+            'save.find': lambda player_id, save_name: [
+                {'id': row['id'], 'last_seq': 0} for row in store.find('saves', player_id=player_id, save_name=save_name)],
+            'save.list_for_player': lambda player_id: sorted(
+                [dict(row, base_blob=None, delta=None) for row in self._public(store.find('saves', player_id=player_id))],
+                key=lambda row: row['updated_at'], reverse=True),
+            'save.load': lambda player_id, save_name: [
+                {'id': row['id'], 'game_data': row['game_data'], 'base_blob': None, 'base_seq': 0, 'seq': None,
+                 'delta': None} for row in store.find('saves', player_id=player_id, save_name=save_name)],
+        }
+        self._updates: Dict[str, Callable[..., int]] = {
+            'player.insert': lambda name, battery, difficulty: bool(store.add_player(name, battery, difficulty)),
+            'player.set_battery': lambda battery, player_id: store.update('players', player_id, battery_level=battery),
+            'player.set_difficulty': lambda difficulty, player_id: store.update(
+                'players', player_id, difficulty_level=difficulty),
+            'session.insert': lambda *params: bool(store.add_session(*params)),
+            'session.set_countries_guessed': lambda codes, session_id: store.update(
+                'sessions', session_id, countries_guessed=codes),
+            'session.set_current_airport': lambda airport_id, session_id: store.update(
+                'sessions', session_id, current_airport_id=airport_id),
+            'session.set_battery': lambda battery, session_id: store.update(
+                'sessions', session_id, battery_level=battery),
+            'session.set_puzzles_solved': lambda solved, session_id: store.update(
+                'sessions', session_id, puzzles_solved=solved),
+            'session.set_status': lambda status, session_id: store.update('sessions', session_id, status=status),
+            'session.complete': lambda status, completed_at, session_id: store.update(
+                'sessions', session_id, status=status, completed_at=str(completed_at)),
+            'save.update': lambda game_data, player_id, save_name: store.put_save(player_id, save_name, game_data),
+            'save.insert': lambda player_id, save_name, game_data: store.put_save(player_id, save_name, game_data),
+            'save.delete': store.delete_save,
+        }
+
+    @staticmethod
+    def _public(rows: List[dict]) -> List[dict]:
+        return [{k: v for k, v in row.items() if k != 'op_id'} for row in rows]
+
+    @staticmethod
+    def _one(dto) -> List[dict]:
+        return [asdict(dto)] if dto else []
+
+    @staticmethod
+    def _random(questions: Dict[int, dict], level: str) -> List[dict]:
+        matching = [row for row in questions.values() if row['difficulty_level'] == level]
+        return [random.choice(matching)] if matching else []
+
+    @staticmethod
+    def _ids(questions: Dict[int, dict], level: str) -> List[dict]:
+        return [{'id': row['id']} for row in questions.values() if row['difficulty_level'] == level]
+
+    @staticmethod
+    def _by_id(questions: Dict[int, dict], question_id: int) -> List[dict]:
+        return [questions[question_id]] if question_id in questions else []
+
+    def _answers(self, question_id: int) -> List[dict]:
+        answers = list(self.questions.answers.get(question_id, []))
+        random.shuffle(answers)
+        return answers
+
+    def _airports_by_country(self, code: str) -> List[dict]:
+        country = self.catalog.get_country_by_code(code)
+        return [asdict(a) for a in self.catalog.get_airports_by_country(country)] if country else []
+
+    def hubs(self) -> List[AirportDto]:
+        if self._hubs is None:
+            self._hubs = [airport.to_dto() for airport in self.catalog.to_airport_store() if airport.is_major_hub]
+        return self._hubs
+
+    def connect(self) -> bool:
+        return False
+
+    def is_healthy(self) -> bool:
+        return False
+
+    def disconnect(self):
+        pass
+
+    def query_named(self, name: str, params: tuple = ()):
+        query = self._queries.get(name)
+        if query is None:
+            print(f"Not available offline: {name}")
+            return None
+        return query(*params)
+
+    def query_named_rows(self, name: str, params: tuple = ()) -> tuple:
+        rows = self.query_named(name, params)
+        if not rows:
+            return (), []
+        columns = tuple(rows[0])
+        return columns, [tuple(row[c] for c in columns) for row in rows]
+
+    def iter_named(self, name: str, params: tuple = (), chunk_size: int = 500, as_tuples: bool = False):
+        if as_tuples:
+            return iter(self.query_named_rows(name, params)[1])
+        return iter(self.query_named(name, params) or [])
+
+    def update_named(self, name: str, params: tuple = ()):
+        update = self._updates.get(name)
+        if update is None:
+            print(f"Not available offline: {name}")
+            return 0
+        return int(update(*params))
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("Usage: python offline_store.py build [path]")
+        return
+    from models import DatabaseConnection
+    path = sys.argv[2] if len(sys.argv) > 2 else Config.QUESTION_SNAPSHOT_PATH
+    db = DatabaseConnection()
+    if not db.connect():
+        return
+    try:
+        start = time.perf_counter()
+        if build_question_snapshot(db, path):
+            print(f"Wrote {path} in {time.perf_counter() - start:.2f}s")
+        else:
+            print("No questions found, snapshot not written")
+    finally:
+        db.disconnect()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Pushes what was played offline (offline_store.OfflineStore) to MySQL once it is reachable again.
+
+Players go first, then sessions, then saves, each in transactions of batch_size rows. Every row is
+recorded in the offline_sync table under its op_id in the same transaction as the write, so a sync
+interrupted halfway can simply be run again: rows already applied are skipped and their MySQL ids
+are read back to remap the rows that depend on them.
+
+Conflicts:
+    player name  A pilot created offline whose name already exists in MySQL is the same pilot, as in
+                 Player.create_or_get_player; the offline games are attached to the existing player.
+    save slot    If the slot was written in MySQL after the offline save, the MySQL save is kept and
+                 the offline one goes to "<name> (offline)"; otherwise the offline save replaces it.
+                 Timestamps are compared as naive local times.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from config import Config
+from models import DatabaseConnection
+from offline_store import OfflineStore
+from statements import StatementRegistry
+
+OFFLINE_SLOT_SUFFIX = " (offline)"
+
+
+@dataclass
+class SyncReport:
+    players: int = 0
+    sessions: int = 0
+    saves: int = 0
+    already_applied: int = 0
+    merged_players: int = 0
+    renamed_saves: int = 0
+
+
+class OfflineSync:
+    def __init__(self, db: DatabaseConnection, store: OfflineStore, batch_size: int = Config.OFFLINE_SYNC_BATCH_SIZE):
+        self.db = db
+        self.store = store
+        self.batch_size = batch_size
+        self.report = SyncReport()
+        # offline id -> MySQL id, per table
+        self.ids: Dict[str, Dict[int, int]] = {'players': {}, 'sessions': {}}
+
+    def sync(self) -> SyncReport | None:
+        """Apply everything in the store and clear it; None if a batch failed, the rest is kept for next time"""
+        for table, apply in (('players', self._apply_player), ('sessions', self._apply_session),
+                             ('saves', self._apply_save)):
+            if not self._sync_table(table, apply):
+                return None
+        self.store.clear()
+        return self.report
+
+    def _sync_table(self, table: str, apply: Callable[[StatementRegistry, dict], int]) -> bool:
+        rows = self.store.rows(table)
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            mapped = self.db.run_in_transaction(lambda statements: self._apply_batch(statements, table, batch, apply))
+            if mapped is None:
+                return False
+            if table in self.ids:
+                self.ids[table].update(mapped)
+        return True
+
+    def _apply_batch(self, statements: StatementRegistry, table: str, batch: List[dict],
+                     apply: Callable[[StatementRegistry, dict], int]) -> Dict[int, int]:
+        mapped = {}
+        for row in batch:
+            applied = statements.query('offline.op_remote_id', (row['op_id'],))
+            if applied:
+                remote_id = applied[0]['remote_id']
+                self.report.already_applied += 1
+            else:
+                remote_id = apply(statements, row)
+                statements.update('offline.record_op', (row['op_id'], table, remote_id))
+                setattr(self.report, table, getattr(self.report, table) + 1)
+            mapped[row['id']] = remote_id
+        return mapped
+
+    def _remote(self, table: str, local_id: int | None) -> int | None:
+        """MySQL id for an id seen offline; positive ids already are MySQL ids"""
+        if local_id is None or local_id > 0:
+            return local_id
+        return self.ids[table][local_id]
+
+    def _apply_player(self, statements: StatementRegistry, row: dict) -> int:
+        existing = statements.query('player.by_name', (row['name'],))
+        if existing:
+            self.report.merged_players += 1
+            return existing[0]['id']
+        return statements.update('player.insert', (row['name'], row['battery_level'], row['difficulty_level'])).lastrowid
+
+    def _apply_session(self, statements: StatementRegistry, row: dict) -> int:
+        return statements.update('offline.insert_session', (
+            self._remote('players', row['player_id']), row['difficulty_level'], row['starting_airport_id'],
+            row['boss_airport_id'], row['boss_country_code'], row['current_airport_id'], row['battery_level'],
+            row['puzzles_solved'], row['countries_guessed'], row['status'], row['score'], row['started_at'],
+            row['completed_at'])).lastrowid
+
+    def _apply_save(self, statements: StatementRegistry, row: dict) -> int:
+        player_id = self._remote('players', row['player_id'])
+        game_data = json.loads(row['game_data'])
+        game_data['session_id'] = self._remote('sessions', game_data.get('session_id'))
+        save_name = row['save_name']
+
+        existing = statements.query('offline.save_by_slot', (player_id, save_name))
+        if existing and existing[0]['updated_at'] > datetime.fromisoformat(row['updated_at']):
+            save_name += OFFLINE_SLOT_SUFFIX
+            self.report.renamed_saves += 1
+            existing = statements.query('offline.save_by_slot', (player_id, save_name))
+
+        if existing:
+            statements.update('save.update', (json.dumps(game_data), player_id, save_name))
+            return existing[0]['id']
+        return statements.update('save.insert', (player_id, save_name, json.dumps(game_data))).lastrowid
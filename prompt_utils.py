@@ -1,7 +1,32 @@
-﻿from prompt_toolkit import prompt
+﻿from startup_profile import timed_import
+
+_completer_class = None
+
 
 def safe_prompt(prompt_text: str, **kwargs) -> str:
     try:
+        prompt = timed_import('prompt_toolkit').prompt
         return prompt(prompt_text, **kwargs)
     except Exception:
         return input(prompt_text)
+
+
+def create_completer(options: list[str]):
+    """Build a case-insensitive prefix completer, importing prompt_toolkit on first use"""
+    global _completer_class
+    if _completer_class is None:
+        completion = timed_import('prompt_toolkit.completion')
+
+        class AnyCompleter(completion.Completer):
+            def __init__(self, options: list[str]):
+                super().__init__()
+                self.options = options
+
+            def get_completions(self, document, complete_event):
+                text = document.text
+                for option in self.options:
+                    if option.lower().startswith(text.lower()):
+                        yield completion.Completion(option, start_position=-len(text))
+
+        _completer_class = AnyCompleter
+    return _completer_class(options)
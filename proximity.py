@@ -0,0 +1,55 @@
+from array import array
+from typing import Optional
+
+import airport_util
+from airport_store import AirportStore
+
+
+class ProximityTable:
+    """Distance, bearing and distance rank from every airport in a store to one target, computed once per session"""
+
+    def __init__(self, store: AirportStore, target_latitude: float, target_longitude: float):
+        self.store = store
+        count = len(store)
+        self.distances = array('d', [0.0]) * count
+        self.bearings = array('d', [0.0]) * count
+        for i in range(count):
+            latitude, longitude = store.latitudes[i], store.longitudes[i]
+            self.distances[i] = airport_util.haversine_km(latitude, longitude, target_latitude, target_longitude)
+            self.bearings[i] = airport_util.initial_bearing(latitude, longitude, target_latitude, target_longitude)
+
+        # ranks[i] is how many airports are strictly closer to the target than airport i
+        self.ranks = array('I', [0]) * count
+        order = sorted(range(count), key=self.distances.__getitem__)
+        rank = 0
+        for position, i in enumerate(order):
+            if position and self.distances[i] > self.distances[order[position - 1]]:
+                rank = position
+            self.ranks[i] = rank
+
+    @classmethod
+    def for_airport(cls, store: AirportStore, target) -> 'ProximityTable':
+        return cls(store, float(target.latitude), float(target.longitude))
+
+    def distance_km(self, airport_id: int) -> Optional[float]:
+        index = self.store.index_of(airport_id)
+        return self.distances[index] if index is not None else None
+
+    def bearing(self, airport_id: int) -> Optional[float]:
+        index = self.store.index_of(airport_id)
+        return self.bearings[index] if index is not None else None
+
+    def direction(self, airport_id: int) -> Optional[airport_util.CompassDirection]:
+        bearing = self.bearing(airport_id)
+        return airport_util.bearing_to_compass_direction(bearing) if bearing is not None else None
+
+    def rank(self, airport_id: int) -> Optional[int]:
+        index = self.store.index_of(airport_id)
+        return self.ranks[index] if index is not None else None
+
+    def closest_percent(self, airport_id: int) -> Optional[float]:
+        """Share of airports at least as close as this one, in percent ("you are in the closest 5%")"""
+        rank = self.rank(airport_id)
+        if rank is None:
+            return None
+        return (rank + 1) / len(self.ranks) * 100
@@ -0,0 +1,154 @@
+"""In-process pub/sub for race mode, where several pilots chase the same boss.
+
+The hub runs its own asyncio loop on a daemon thread. Drivers publish from any thread without
+blocking; each subscriber has a mailbox holding at most one pending event per pilot, so a slow
+reader gets the newest position of every pilot instead of a growing backlog. api_server.py runs one
+hub for the whole server; pilots open and join races there and poll GET /race for the others' moves.
+
+A race and its boss stay open until close_race, also when every pilot has left.
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class RaceEvent:
+    race_id: str
+    pilot: str
+    kind: str  # 'flight' or 'finished'
+    airport_name: str = ""
+    country_code: str = ""
+    distance_km: float = 0.0
+    battery: int = 0
+    result: str = ""
+    published_at: float = field(default_factory=time.perf_counter)
+
+
+class Mailbox:
+    """Pending events for one subscriber, coalesced to the latest per pilot; only touched on the hub loop"""
+
+    def __init__(self, race_id: str, pilot: str):
+        self.race_id = race_id
+        self.pilot = pilot
+        self.pending: Dict[str, RaceEvent] = {}
+        self.coalesced = 0
+        self.delivered = 0
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def put(self, event: RaceEvent):
+        previous = self.pending.pop(event.pilot, None)
+        if previous is not None:
+            self.coalesced += 1
+            # A finish is final, a late position update from the same pilot must not replace it
+            if previous.kind == 'finished' and event.kind != 'finished':
+                event = previous
+        self.pending[event.pilot] = event
+        self._ready.set()
+
+    def take(self) -> List[RaceEvent]:
+        events = list(self.pending.values())
+        self.pending.clear()
+        self._ready.clear()
+        self.delivered += len(events)
+        return events
+
+    async def next_batch(self, timeout: float | None = None) -> List[RaceEvent]:
+        """Wait until something is pending (or timeout), then take everything"""
+        if not self.pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.take()
+
+
+class RaceHub:
+    def __init__(self, max_pilots_per_race: int = 50):
+        self.max_pilots_per_race = max_pilots_per_race
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="race-hub", daemon=True)
+        self._mailboxes: Dict[str, Dict[str, Mailbox]] = {}
+        self._bosses: Dict[str, int] = {}
+        self.published = 0
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def start(self) -> 'RaceHub':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    def _call(self, function, *args, timeout: float = 5.0):
+        """Run function on the hub loop and wait for its result, from any other thread"""
+        async def call():
+            return function(*args)
+        return asyncio.run_coroutine_threadsafe(call(), self.loop).result(timeout)
+
+    def open_race(self, race_id: str, boss_airport_id: int):
+        self._call(self._bosses.__setitem__, race_id, boss_airport_id)
+
+    def close_race(self, race_id: str):
+        self._call(self._close_race, race_id)
+
+    def _close_race(self, race_id: str):
+        for mailbox in self._mailboxes.pop(race_id, {}).values():
+            mailbox.closed = True
+            mailbox._ready.set()
+        self._bosses.pop(race_id, None)
+
+    def get_boss(self, race_id: str) -> Optional[int]:
+        return self._call(self._bosses.get, race_id)
+
+    def join(self, race_id: str, pilot: str) -> Optional[Mailbox]:
+        """Mailbox for pilot in the race, or None if the race is unknown or full"""
+        return self._call(self._join, race_id, pilot)
+
+    def _join(self, race_id: str, pilot: str) -> Optional[Mailbox]:
+        if race_id not in self._bosses:
+            return None
+        race = self._mailboxes.setdefault(race_id, {})
+        if pilot not in race and len(race) >= self.max_pilots_per_race:
+            return None
+        mailbox = race.get(pilot)
+        if mailbox is None:
+            mailbox = race[pilot] = Mailbox(race_id, pilot)
+        return mailbox
+
+    def leave(self, race_id: str, pilot: str):
+        self._call(self._leave, race_id, pilot)
+
+    def _leave(self, race_id: str, pilot: str):
+        race = self._mailboxes.get(race_id, {})
+        mailbox = race.pop(pilot, None)
+        if mailbox:
+            mailbox.closed = True
+            mailbox._ready.set()
+        if not race:
+            self._mailboxes.pop(race_id, None)
+
+    def publish(self, event: RaceEvent):
+        """Non-blocking and thread safe; delivery happens on the hub loop"""
+        self.loop.call_soon_threadsafe(self._deliver, event)
+
+    def _deliver(self, event: RaceEvent):
+        self.published += 1
+        for pilot, mailbox in self._mailboxes.get(event.race_id, {}).items():
+            if pilot != event.pilot:
+                mailbox.put(event)
+
+    def poll(self, mailbox: Mailbox) -> List[RaceEvent]:
+        """Take whatever is pending without waiting, for synchronous callers such as the curses UI"""
+        return self._call(mailbox.take)
+
+    def race_count(self) -> int:
+        return self._call(len, self._mailboxes)
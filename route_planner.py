@@ -0,0 +1,199 @@
+import heapq
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+from airport_store import AirportStore, AirportView
+from airport_util import EARTH_RADIUS_KM
+
+
+@dataclass
+class Route:
+    airports: list[AirportView]
+    distance_km: float
+
+    @property
+    def hops(self) -> int:
+        return len(self.airports) - 1
+
+
+class RoutePlanner:
+    """Multi-hop routes where no single flight may be longer than max_hop_km.
+
+    plan() routes like an airline itinerary: every stop between the two ends is a major hub. The hubs'
+    neighbour lists are built once up front, so a query is A* over a few hundred hubs plus the hubs in
+    range of either end, about a millisecond on 50k synthetic airports with a 2500 km hop
+    (benchmarks/route_planner.py). The result is the shortest route through hubs, which can be a little
+    longer than the shortest route overall. Only when no hub route exists does plan() fall back to
+    plan_exact().
+
+    plan_exact() is the true shortest route over every airport. Its graph is implicit: airports are
+    bucketed into a lat/lon grid with cells one hop wide, so the neighbours of an airport are found by
+    scanning the nearby cells only, and each airport's list is computed the first time A* expands it.
+    With ~1900 airports in range of each one that takes tens to hundreds of milliseconds per query.
+
+    Distances are compared as chord lengths between unit vectors, which order the same way as great
+    circle distances but need no trigonometry per pair.
+    """
+
+    def __init__(self, store: AirportStore, max_hop_km: float):
+        self.store = store
+        self.max_hop_km = max_hop_km
+        self.hop_radians = min(max_hop_km / EARTH_RADIUS_KM, math.pi)
+        self.max_chord = 2 * math.sin(self.hop_radians / 2)
+
+        self.x = array('d')
+        self.y = array('d')
+        self.z = array('d')
+        for latitude, longitude in zip(store.latitudes, store.longitudes):
+            lat, lon = math.radians(latitude), math.radians(longitude)
+            self.x.append(math.cos(lat) * math.cos(lon))
+            self.y.append(math.cos(lat) * math.sin(lon))
+            self.z.append(math.sin(lat))
+
+        self.cell_degrees = max(math.degrees(self.hop_radians), 0.5)
+        self.lat_cells = math.ceil(180 / self.cell_degrees)
+        self.lon_cells = math.ceil(360 / self.cell_degrees)
+        self.grid: dict[tuple[int, int], list[int]] = {}
+        self.hub_grid: dict[tuple[int, int], list[int]] = {}
+        self.cell_of = array('i')
+        for index, (latitude, longitude) in enumerate(zip(store.latitudes, store.longitudes)):
+            cell = self._cell(latitude, longitude)
+            self.grid.setdefault(cell, []).append(index)
+            if store.hub_flags[index]:
+                self.hub_grid.setdefault(cell, []).append(index)
+            self.cell_of.append(cell[0] * self.lon_cells + cell[1])
+        self._row_spans = [self._lon_span(row) for row in range(self.lat_cells)]
+        self._neighbours: dict[int, list[tuple[int, float]]] = {}
+        # Hubs in range of an airport; filled for every hub now, for other airports when they are an end
+        self._hub_neighbours: dict[int, list[tuple[int, float]]] = {}
+        for hubs in self.hub_grid.values():
+            for hub in hubs:
+                self.hub_neighbours(hub)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        row = min(int((latitude + 90) / self.cell_degrees), self.lat_cells - 1)
+        column = int((longitude + 180) / self.cell_degrees) % self.lon_cells
+        return row, column
+
+    def _lon_span(self, row: int) -> int:
+        """How many longitude cells either side of a cell in this row can hold an airport within range"""
+        # The poleward edge of the neighbouring rows is where a degree of longitude is shortest
+        edge = max(abs(-90 + (row - 1) * self.cell_degrees), abs(-90 + (row + 2) * self.cell_degrees))
+        cos_edge = math.cos(math.radians(min(edge, 90)))
+        if cos_edge <= math.sin(self.hop_radians):
+            return self.lon_cells
+        span_degrees = math.degrees(math.asin(math.sin(self.hop_radians) / cos_edge))
+        return min(math.ceil(span_degrees / self.cell_degrees), self.lon_cells)
+
+    def _chord_to_km(self, chord: float) -> float:
+        return 2 * EARTH_RADIUS_KM * math.asin(min(chord / 2, 1.0))
+
+    def _chord(self, a: int, b: int) -> float:
+        dx = self.x[a] - self.x[b]
+        dy = self.y[a] - self.y[b]
+        dz = self.z[a] - self.z[b]
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def distance_km(self, a: int, b: int) -> float:
+        return self._chord_to_km(self._chord(a, b))
+
+    def neighbours(self, index: int) -> list[tuple[int, float]]:
+        """(store index, distance km) of every airport reachable in one hop, computed once per airport"""
+        cached = self._neighbours.get(index)
+        if cached is None:
+            cached = self._neighbours[index] = self._scan(index, self.grid)
+        return cached
+
+    def hub_neighbours(self, index: int) -> list[tuple[int, float]]:
+        """(store index, distance km) of every major hub reachable in one hop"""
+        cached = self._hub_neighbours.get(index)
+        if cached is None:
+            cached = self._hub_neighbours[index] = self._scan(index, self.hub_grid)
+        return cached
+
+    def _scan(self, index: int, grid: dict[tuple[int, int], list[int]]) -> list[tuple[int, float]]:
+        x, y, z = self.x[index], self.y[index], self.z[index]
+        max_chord_sq = self.max_chord * self.max_chord
+        row, column = divmod(self.cell_of[index], self.lon_cells)
+        span = self._row_spans[row]
+        if span * 2 + 1 >= self.lon_cells:
+            columns = range(self.lon_cells)
+        else:
+            columns = [(column + offset) % self.lon_cells for offset in range(-span, span + 1)]
+
+        result = []
+        xs, ys, zs = self.x, self.y, self.z
+        for r in (row - 1, row, row + 1):
+            if r < 0 or r >= self.lat_cells:
+                continue
+            for c in columns:
+                for other in grid.get((r, c), ()):
+                    dx = xs[other] - x
+                    dy = ys[other] - y
+                    dz = zs[other] - z
+                    chord_sq = dx * dx + dy * dy + dz * dz
+                    if chord_sq <= max_chord_sq and other != index:
+                        result.append((other, self._chord_to_km(math.sqrt(chord_sq))))
+        return result
+
+    def _in_range(self, a: int, b: int) -> bool:
+        return self._chord(a, b) <= self.max_chord
+
+    def plan(self, from_airport_id: int, to_airport_id: int) -> Optional[Route]:
+        """Shortest route whose stops in between are major hubs, else plan_exact. None when out of reach."""
+        start = self.store.index_of(from_airport_id)
+        goal = self.store.index_of(to_airport_id)
+        if start is None or goal is None:
+            return None
+        if start == goal or self._in_range(start, goal):
+            return self._route({goal: start} if goal != start else {}, goal, self.distance_km(start, goal))
+
+        # Hubs that can reach the goal, found once from the goal's side
+        into_goal = {hub: km for hub, km in self.hub_neighbours(goal)}
+
+        def next_hops(index: int) -> list[tuple[int, float]]:
+            hops = self.hub_neighbours(index)
+            last_leg = into_goal.get(index)
+            return hops + [(goal, last_leg)] if last_leg is not None else hops
+
+        return self._search(start, goal, next_hops) or self._search(start, goal, self.neighbours)
+
+    def plan_exact(self, from_airport_id: int, to_airport_id: int) -> Optional[Route]:
+        """A* over every airport, minimising total distance flown. None when the target is out of reach."""
+        start = self.store.index_of(from_airport_id)
+        goal = self.store.index_of(to_airport_id)
+        if start is None or goal is None:
+            return None
+        return self._search(start, goal, self.neighbours)
+
+    def _search(self, start: int, goal: int, next_hops) -> Optional[Route]:
+        # The straight line to the goal is never longer than any route to it, so the heuristic is admissible
+        best = {start: 0.0}
+        came_from: dict[int, int] = {}
+        open_heap = [(self.distance_km(start, goal), 0.0, start)]
+        closed = set()
+        while open_heap:
+            _, cost, index = heapq.heappop(open_heap)
+            if index == goal:
+                return self._route(came_from, goal, cost)
+            if index in closed:
+                continue
+            closed.add(index)
+            for neighbour, hop_km in next_hops(index):
+                if neighbour in closed:
+                    continue
+                new_cost = cost + hop_km
+                if new_cost < best.get(neighbour, math.inf):
+                    best[neighbour] = new_cost
+                    came_from[neighbour] = index
+                    heapq.heappush(open_heap, (new_cost + self.distance_km(neighbour, goal), new_cost, neighbour))
+        return None
+
+    def _route(self, came_from: dict[int, int], goal: int, distance_km: float) -> Route:
+        path = [goal]
+        while path[-1] in came_from:
+            path.append(came_from[path[-1]])
+        path.reverse()
+        return Route([self.store.view(index) for index in path], distance_km)
@@ -0,0 +1,88 @@
+"""Builds DTOs straight from tuple rows instead of going through a dict per row and Dto.create.
+
+A RowMapper works out once per column layout which position each DTO field comes from, then maps
+every row with one itemgetter call and a positional constructor call. It applies the same defaults
+and required-field check as the DTO's create().
+"""
+from dataclasses import fields, make_dataclass
+from operator import itemgetter
+from typing import Callable, Generic, Iterable, List, Optional, Sequence, Type, TypeVar
+
+from data import AirportDto, CountryDto
+
+T = TypeVar('T')
+
+_slotted: dict[type, type] = {}
+
+
+def slotted(dto_cls: Type[T]) -> type:
+    """A copy of a dataclass DTO with __slots__: same fields and constructor, less memory per instance.
+
+    The copy is a separate class, not a subclass, so compare instances with their own kind only.
+    """
+    cls = _slotted.get(dto_cls)
+    if cls is None:
+        cls = make_dataclass(dto_cls.__name__ + 'Slots', [(f.name, f.type) for f in fields(dto_cls)], slots=True)
+        _slotted[dto_cls] = cls
+    return cls
+
+
+class RowMapper(Generic[T]):
+    def __init__(self, dto_cls: Type[T], defaults: dict, required: Sequence[str], error: str):
+        self.dto_cls = dto_cls
+        self.field_names = [f.name for f in fields(dto_cls)]
+        self.defaults = defaults
+        self.required = required
+        self.error = error
+        self._compiled: dict[tuple, Callable[[tuple], tuple]] = {}
+
+    def _compile(self, columns: tuple) -> Callable[[tuple], tuple]:
+        # A repeated column name resolves to its last position, as it would in dict(zip(columns, row))
+        positions = {name: i for i, name in enumerate(columns)}
+        if len(self.field_names) > 1 and all(name in positions for name in self.field_names):
+            getter = itemgetter(*(positions[name] for name in self.field_names))
+        else:
+            sources = [(positions.get(name), self.defaults.get(name)) for name in self.field_names]
+
+            def getter(row: tuple) -> tuple:
+                return tuple(row[i] if i is not None else default for i, default in sources)
+        self._compiled[columns] = getter
+        return getter
+
+    def getter(self, columns: Sequence[str]) -> Callable[[tuple], tuple]:
+        columns = tuple(columns)
+        return self._compiled.get(columns) or self._compile(columns)
+
+    def map_rows(self, columns: Sequence[str], rows: Iterable[tuple], slots: bool = False) -> List[T]:
+        getter = self.getter(columns)
+        cls = slotted(self.dto_cls) if slots else self.dto_cls
+        required = [self.field_names.index(name) for name in self.required]
+        result = []
+        for row in rows:
+            values = getter(row)
+            for i in required:
+                if not values[i]:
+                    raise ValueError(self.error)
+            result.append(cls(*values))
+        return result
+
+    def map_row(self, columns: Sequence[str], row: Optional[tuple], slots: bool = False) -> Optional[T]:
+        if row is None:
+            return None
+        return self.map_rows(columns, (row,), slots)[0]
+
+
+AIRPORT_MAPPER: RowMapper[AirportDto] = RowMapper(
+    AirportDto,
+    defaults={'id': 0, 'icao_code': '', 'iata_code': '', 'name': '', 'city': '', 'country_code': '',
+              'latitude': 0.0, 'longitude': 0.0, 'elevation_ft': 0, 'continent': ''},
+    required=['id', 'icao_code', 'iata_code', 'name', 'city', 'country_code', 'continent'],
+    error="Invalid airport data",
+)
+
+COUNTRY_MAPPER: RowMapper[CountryDto] = RowMapper(
+    CountryDto,
+    defaults={'code': '', 'name': '', 'continent': ''},
+    required=['code', 'name', 'continent'],
+    error="Invalid country data",
+)
@@ -0,0 +1,67 @@
+"""Encoding for delta save storage: a zlib-compressed base snapshot plus small per-turn deltas.
+
+A delta holds only what changed at the top level of the save dict:
+    {"s": {key: new value}, "a": {key: [items appended to a list]}, "r": [removed keys]}
+"""
+import json
+import zlib
+from typing import Dict, Iterable, Optional
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def encode_base(state: Dict) -> bytes:
+    return zlib.compress(_dumps(state), 9)
+
+
+def decode_base(blob: bytes) -> Dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def diff_state(old: Dict, new: Dict) -> Optional[Dict]:
+    """The delta that turns old into new, or None when nothing changed"""
+    changed, appended = {}, {}
+    for key, value in new.items():
+        if key in old and old[key] == value:
+            continue
+        previous = old.get(key)
+        if isinstance(previous, list) and isinstance(value, list) and \
+                len(value) > len(previous) and value[:len(previous)] == previous:
+            appended[key] = value[len(previous):]
+        else:
+            changed[key] = value
+    removed = [key for key in old if key not in new]
+    delta = {}
+    if changed:
+        delta['s'] = changed
+    if appended:
+        delta['a'] = appended
+    if removed:
+        delta['r'] = removed
+    return delta or None
+
+
+def encode_delta(delta: Dict) -> bytes:
+    return _dumps(delta)
+
+
+def replay(game_data, base_blob: Optional[bytes], deltas: Iterable[bytes]) -> Dict:
+    """The state of a game_save row: its JSON game_data, or in delta mode the base with its deltas applied"""
+    if base_blob is None:
+        return json.loads(game_data)
+    state = decode_base(base_blob)
+    for delta in deltas:
+        state = apply_delta(state, delta)
+    return state
+
+
+def apply_delta(state: Dict, blob: bytes) -> Dict:
+    delta = json.loads(blob)
+    state.update(delta.get('s', {}))
+    for key, items in delta.get('a', {}).items():
+        state[key] = list(state.get(key) or []) + items
+    for key in delta.get('r', []):
+        state.pop(key, None)
+    return state
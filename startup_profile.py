@@ -0,0 +1,70 @@
+import importlib
+import os
+import sys
+import time
+from typing import Any
+
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfile:
+    def __init__(self):
+        self.imports: list[tuple[str, float]] = []
+        self.marks: list[tuple[str, float]] = []
+        self.first_frame_at: float | None = None
+
+    def record_import(self, module_name: str, seconds: float) -> None:
+        self.imports.append((module_name, seconds))
+
+    def mark(self, name: str) -> None:
+        self.marks.append((name, time.perf_counter() - PROCESS_START))
+
+    def mark_first_frame(self) -> None:
+        if self.first_frame_at is None:
+            self.first_frame_at = time.perf_counter() - PROCESS_START
+            self.mark("first frame")
+
+    def report(self) -> str:
+        lines = ["Startup profile", "  imports:"]
+        for module_name, seconds in self.imports:
+            lines.append(f"    {module_name:<24} {seconds * 1000:8.1f} ms")
+        lines.append(f"    {'total':<24} {sum(s for _, s in self.imports) * 1000:8.1f} ms")
+        lines.append("  timeline:")
+        for name, at in self.marks:
+            lines.append(f"    {name:<24} {at * 1000:8.1f} ms")
+        if self.first_frame_at is not None:
+            lines.append(f"  time to first frame: {self.first_frame_at * 1000:.1f} ms")
+        return "\n".join(lines)
+
+
+profile = StartupProfile()
+
+
+def is_enabled() -> bool:
+    return os.getenv('STARTUP_PROFILE', 'false').lower() == 'true'
+
+
+def timed_import(module_name: str):
+    """Import a module and record how long it took"""
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    profile.record_import(module_name, time.perf_counter() - start)
+    return module
+
+
+class LazyModule:
+    """Module proxy that defers the real import until an attribute is first used"""
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = timed_import(self._module_name)
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
@@ -0,0 +1,250 @@
+"""Every SQL statement the models run, declared once by name.
+
+DatabaseConnection.query_named / update_named execute them. With prepared statements enabled each
+name gets its own prepared cursor per connection, so MySQL parses the text once and later calls only
+send parameters.
+"""
+import time
+from dataclasses import dataclass
+
+STATEMENTS: dict[str, str] = {
+    # player
+    'player.by_name': "SELECT * FROM player WHERE name = %s",
+    'player.insert': """INSERT INTO player (name, battery_level, difficulty_level)
+                        VALUES (%s, %s, %s)""",
+    'player.set_battery': "UPDATE player SET battery_level = %s WHERE id = %s",
+    'player.set_difficulty': "UPDATE player SET difficulty_level = %s WHERE id = %s",
+
+    # country
+    'country.all': "SELECT * FROM country ORDER BY name",
+    'country.by_name': "SELECT * FROM country WHERE name_folded = %s",
+    'country.by_code': "SELECT * FROM country WHERE code = %s",
+
+    # airport
+    'airport.by_country': """SELECT a.*, c.name as country_name
+                             FROM airport a
+                                      JOIN country c ON a.country_code = c.code
+                             WHERE a.country_code = %s
+                             ORDER BY a.is_major_hub DESC, a.name""",
+    'airport.by_name': """SELECT a.*, c.name as country_name, c.continent
+                          FROM airport a
+                                   JOIN country c ON a.country_code = c.code
+                          WHERE a.name_folded = %s""",
+    'airport.by_id': """SELECT a.*, c.name as country_name, c.continent
+                        FROM airport a
+                                 JOIN country c ON a.country_code = c.code
+                        WHERE a.id = %s""",
+    'airport.random_hub': """SELECT a.*, c.name as country_name, c.continent
+                             FROM airport a
+                                      JOIN country c ON a.country_code = c.code
+                             WHERE a.is_major_hub = true
+                             ORDER BY RAND() LIMIT 1""",
+    'airport.fingerprint': """SELECT (SELECT COUNT(*) FROM airport) AS airport_count,
+                                     (SELECT COALESCE(MAX(id), 0) FROM airport) AS max_airport_id,
+                                     (SELECT COUNT(*) FROM country) AS country_count,
+                                     (SELECT COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', id, icao_code, iata_code, name, city,
+                                                                             country_code, latitude, longitude,
+                                                                             COALESCE(elevation_ft, ''), continent,
+                                                                             is_major_hub))), 0)
+                                      FROM airport) ^
+                                     (SELECT COALESCE(BIT_XOR(CRC32(CONCAT_WS('|', code, name, continent))), 0)
+                                      FROM country) AS content_checksum""",
+    'airport.all': "SELECT * FROM airport ORDER BY id",
+
+    # game_session
+    'session.insert': """INSERT INTO game_session
+                         (player_id, difficulty_level, starting_airport_id, boss_airport_id,
+                          boss_country_code, current_airport_id, battery_level, countries_guessed)
+                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+    'session.latest_for_player': "SELECT * FROM game_session WHERE player_id = %s ORDER BY id DESC LIMIT 1",
+    'session.set_countries_guessed': "UPDATE game_session SET countries_guessed = %s WHERE id = %s",
+    'session.set_current_airport': "UPDATE game_session SET current_airport_id = %s WHERE id = %s",
+    'session.set_battery': "UPDATE game_session SET battery_level = %s WHERE id = %s",
+    'session.set_puzzles_solved': "UPDATE game_session SET puzzles_solved = %s WHERE id = %s",
+    'session.set_status': "UPDATE game_session SET status = %s WHERE id = %s",
+    'session.complete': "UPDATE game_session SET status = %s, completed_at = %s WHERE id = %s",
+
+    # challenges
+    'challenge.random_open': """SELECT *
+                                FROM question_task
+                                WHERE difficulty_level = %s
+                                ORDER BY RAND() LIMIT 1""",
+    'challenge.random_multiple_choice': """SELECT *
+                                           FROM multiple_choice_question
+                                           WHERE difficulty_level = %s
+                                           ORDER BY RAND() LIMIT 1""",
+    'challenge.open_ids': "SELECT id FROM question_task WHERE difficulty_level = %s",
+    'challenge.multiple_choice_ids': "SELECT id FROM multiple_choice_question WHERE difficulty_level = %s",
+    'challenge.open_by_id': "SELECT * FROM question_task WHERE id = %s",
+    'challenge.multiple_choice_by_id': "SELECT * FROM multiple_choice_question WHERE id = %s",
+    'challenge.answers': """SELECT *
+                            FROM multiple_choice_answer
+                            WHERE question_id = %s
+                            ORDER BY RAND()""",
+
+    # game_save
+    'save.find': """SELECT s.id, COALESCE(MAX(d.seq), 0) AS last_seq
+                   FROM game_save s
+                            LEFT JOIN game_save_delta d ON d.save_id = s.id
+                   WHERE s.player_id = %s AND s.save_name = %s
+                   GROUP BY s.id""",
+    'save.update': """UPDATE game_save
+                      SET game_data  = %s,
+                          base_blob  = NULL,
+                          updated_at = CURRENT_TIMESTAMP
+                      WHERE player_id = %s
+                        AND save_name = %s""",
+    'save.insert': """INSERT INTO game_save (player_id, save_name, game_data)
+                      VALUES (%s, %s, %s)""",
+    'save.list_for_player': """SELECT s.id, s.player_id, s.save_name, s.created_at, s.updated_at, s.game_data,
+                                      s.base_blob, d.delta
+                               FROM game_save s
+                                        LEFT JOIN game_save_delta d ON d.save_id = s.id AND d.seq > s.base_seq
+                               WHERE s.player_id = %s
+                               ORDER BY s.updated_at DESC, s.id, d.seq""",
+    'save.load': """SELECT s.id, s.game_data, s.base_blob, s.base_seq, d.seq, d.delta
+                    FROM game_save s
+                             LEFT JOIN game_save_delta d ON d.save_id = s.id AND d.seq > s.base_seq
+                    WHERE s.player_id = %s
+                      AND s.save_name = %s
+                    ORDER BY d.seq""",
+    'save.update_base': """UPDATE game_save
+                           SET game_data  = %s,
+                               base_blob  = %s,
+                               base_seq   = %s,
+                               updated_at = CURRENT_TIMESTAMP
+                           WHERE id = %s""",
+    'save.insert_base': """INSERT INTO game_save (player_id, save_name, game_data, base_blob, base_seq)
+                           VALUES (%s, %s, %s, %s, %s)""",
+    'save.insert_delta': "INSERT INTO game_save_delta (save_id, seq, delta) VALUES (%s, %s, %s)",
+    'save.prune_deltas': "DELETE FROM game_save_delta WHERE save_id = %s AND seq <= %s",
+    'save.delete': "DELETE FROM game_save WHERE player_id = %s AND save_name = %s",
+
+    # offline sync
+    'offline.op_remote_id': "SELECT remote_id FROM offline_sync WHERE op_id = %s",
+    'offline.record_op': "INSERT INTO offline_sync (op_id, entity, remote_id) VALUES (%s, %s, %s)",
+    'offline.insert_session': """INSERT INTO game_session
+                                 (player_id, difficulty_level, starting_airport_id, boss_airport_id,
+                                  boss_country_code, current_airport_id, battery_level, puzzles_solved,
+                                  countries_guessed, status, score, started_at, completed_at)
+                                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+    'offline.save_by_slot': "SELECT id, updated_at FROM game_save WHERE player_id = %s AND save_name = %s",
+    'offline.prune_ops': "DELETE FROM offline_sync WHERE synced_at < %s LIMIT %s",
+
+    # maintenance
+    'maintenance.save_sessions': """SELECT s.id, s.updated_at, JSON_EXTRACT(s.game_data, '$.session_id') AS session_id,
+                                          s.base_blob, d.delta
+                                   FROM game_save s
+                                            LEFT JOIN game_save_delta d ON d.save_id = s.id AND d.seq > s.base_seq
+                                   ORDER BY s.id, d.seq""",
+    'maintenance.delete_save': "DELETE FROM game_save WHERE id = %s AND updated_at = %s",
+    'maintenance.archive_candidates': """SELECT *
+                                        FROM game_session
+                                        WHERE id > %s
+                                          AND status <> 'active'
+                                          AND COALESCE(completed_at, started_at) < %s
+                                        ORDER BY id
+                                        LIMIT %s
+                                        FOR UPDATE""",
+    'maintenance.archive_session': """INSERT INTO game_session_archive
+                                     (id, player_id, status, difficulty_level, score, started_at, completed_at,
+                                      session_blob)
+                                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+    'maintenance.delete_session': "DELETE FROM game_session WHERE id = %s",
+    'maintenance.archived_session': "SELECT * FROM game_session_archive WHERE id = %s",
+
+    # daily challenge
+    'daily.get': """SELECT challenge_date, difficulty_level, boss_airport_id, starting_airport_id, deck_seed
+                   FROM daily_challenge
+                   WHERE challenge_date = %s AND difficulty_level = %s""",
+    'daily.insert': """INSERT IGNORE INTO daily_challenge
+                      (challenge_date, difficulty_level, boss_airport_id, starting_airport_id, deck_seed)
+                      VALUES (%s, %s, %s, %s, %s)""",
+    'daily.result_exists': """SELECT 1 AS found
+                             FROM daily_result
+                             WHERE challenge_date = %s AND difficulty_level = %s AND player_id = %s""",
+    'daily.insert_result': """INSERT IGNORE INTO daily_result
+                             (challenge_date, difficulty_level, player_id, session_id, status,
+                              countries_visited, puzzles_solved, battery_level)
+                             VALUES (%s, %s, %s, %s, %s, %s, %s, %s)""",
+    'daily.leaderboard': """SELECT p.name AS player_name, r.status, r.countries_visited, r.puzzles_solved,
+                                  r.battery_level
+                           FROM daily_result r
+                                    JOIN player p ON r.player_id = p.id
+                           WHERE r.challenge_date = %s AND r.difficulty_level = %s AND r.status <> 'abandoned'
+                           ORDER BY r.status = 'won' DESC, r.countries_visited, r.battery_level DESC, r.completed_at
+                           LIMIT %s""",
+}
+
+
+@dataclass
+class StatementStats:
+    calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, seconds: float):
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_seconds / self.calls * 1000 if self.calls else 0.0
+
+
+class StatementRegistry:
+    """Named statements for one connection, prepared lazily on first use"""
+
+    def __init__(self, connection, prepared: bool = True):
+        self.connection = connection
+        self.prepared = prepared
+        self.stats: dict[str, StatementStats] = {}
+        self._cursors = {}
+
+    def _cursor(self, name: str):
+        cursor = self._cursors.get(name)
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True) if self.prepared else self.connection.cursor()
+            self._cursors[name] = cursor
+        return cursor
+
+    def _run(self, name: str, params: tuple):
+        cursor = self._cursor(name)
+        cursor.execute(STATEMENTS[name], params)
+        return cursor
+
+    def query(self, name: str, params: tuple = ()) -> list[dict]:
+        """Run a named SELECT and return its rows as dicts, raises KeyError for unknown names"""
+        start = time.perf_counter()
+        cursor = self._run(name, params)
+        rows = cursor.fetchall()
+        self.stats.setdefault(name, StatementStats()).record(time.perf_counter() - start)
+        columns = cursor.column_names
+        return [dict(zip(columns, row)) for row in rows]
+
+    def query_rows(self, name: str, params: tuple = ()) -> tuple[tuple, list[tuple]]:
+        """Run a named SELECT and return (column names, tuple rows) without building dicts"""
+        start = time.perf_counter()
+        cursor = self._run(name, params)
+        rows = cursor.fetchall()
+        self.stats.setdefault(name, StatementStats()).record(time.perf_counter() - start)
+        return tuple(cursor.column_names), rows
+
+    def update(self, name: str, params: tuple = ()):
+        """Run a named write and return its cursor for rowcount and lastrowid"""
+        start = time.perf_counter()
+        cursor = self._run(name, params)
+        self.stats.setdefault(name, StatementStats()).record(time.perf_counter() - start)
+        return cursor
+
+    def close(self):
+        for cursor in self._cursors.values():
+            cursor.close()
+        self._cursors.clear()
+
+    def report(self) -> str:
+        lines = [f"{'statement':<36} {'calls':>7} {'mean ms':>9} {'max ms':>9}"]
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].total_seconds):
+            lines.append(f"{name:<36} {stats.calls:>7} {stats.mean_ms:>9.3f} {stats.max_seconds * 1000:>9.3f}")
+        return "\n".join(lines)
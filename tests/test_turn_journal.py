@@ -0,0 +1,121 @@
+"""Replay and drain behaviour of the turn journal, without a database.
+
+Run from the repository root: python -m unittest discover tests
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from models import mysql_connector
+from turn_journal import JournalDrainer, TurnJournal
+
+
+def record(seq: int, kind: str, **fields) -> bytes:
+    return json.dumps({'seq': seq, 'kind': kind, **fields}).encode('utf-8') + b'\n'
+
+
+def write(seq: int, statement: str, params: list) -> bytes:
+    return record(seq, 'write', player_id=1, session_id=7, statement=statement, params=params)
+
+
+class FakeCursor:
+    rowcount = 1
+
+
+class FakeStatements:
+    def __init__(self, errors: dict):
+        self.errors = errors
+        self.applied = []
+
+    def update(self, name: str, params: tuple):
+        error = self.errors.pop(params, None)
+        if error:
+            raise error
+        self.applied.append((name, params))
+        return FakeCursor()
+
+
+class FakeConnection:
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeDatabase:
+    def __init__(self, errors: dict):
+        self.statements = FakeStatements(errors)
+        self.connection = FakeConnection()
+
+    def is_healthy(self) -> bool:
+        return True
+
+
+def mysql_error(errno: int):
+    return mysql_connector.Error(msg=f"error {errno}", errno=errno)
+
+
+class TurnJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'turns.journal')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def open_journal(self, *lines: bytes) -> TurnJournal:
+        with open(self.path, 'wb') as f:
+            f.writelines(lines)
+        journal = TurnJournal(self.path, sync_interval=60, drain_interval=60)
+        self.addCleanup(journal._file.close)
+        return journal
+
+    def test_replay_cuts_torn_line_and_keeps_unacked_writes(self):
+        state = {'session_id': 7, 'status': 'active', 'battery_level': 100, 'current_airport_id': 1}
+        intact = [
+            record(1, 'state', player_id=1, session_id=7, state=state),
+            write(2, 'session.set_battery', [90, 7]),
+            write(3, 'session.set_current_airport', [5, 7]),
+            record(4, 'ack', acked=2),
+            write(5, 'session.set_battery', [80, 7]),
+        ]
+        torn = write(6, 'session.set_current_airport', [9, 7])[:-10]
+        journal = self.open_journal(*intact, torn)
+
+        self.assertEqual([r['seq'] for r in journal.pending()], [3, 5])
+        self.assertEqual(journal.acked, 2)
+        self.assertEqual(journal.seq, 5)
+        # The torn write never happened as far as the state is concerned
+        self.assertEqual(journal.latest_state(1),
+                         {'session_id': 7, 'status': 'active', 'battery_level': 80, 'current_airport_id': 5})
+        self.assertEqual(os.path.getsize(self.path), sum(len(line) for line in intact))
+
+    def test_drain_retries_transient_errors_and_skips_permanent_ones(self):
+        journal = self.open_journal(
+            write(1, 'session.set_battery', [90, 7]),
+            write(2, 'session.set_battery', [80, 7]),
+            write(3, 'session.set_battery', [70, 7]),
+        )
+        drainer = JournalDrainer(journal)
+        drainer._connect = lambda: True
+        # Deadlock on the second write, then a foreign key failure on the third
+        drainer.db = FakeDatabase({(80, 7): mysql_error(1213), (70, 7): mysql_error(1452)})
+
+        self.assertFalse(drainer.drain())
+        self.assertEqual(journal.acked, 1)
+        self.assertEqual([r['seq'] for r in journal.pending()], [2, 3])
+
+        self.assertTrue(drainer.drain())
+        self.assertEqual(journal.pending(), [])
+        self.assertEqual(drainer.db.statements.applied,
+                         [('session.set_battery', (90, 7)), ('session.set_battery', (80, 7))])
+        self.assertEqual(drainer.skipped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+import unicodedata
+
+# Letters that carry no combining mark in NFKD but still read as their base letter
+_EXTRA_FOLDS = str.maketrans({
+    'ø': 'o', 'Ø': 'o',
+    'ł': 'l', 'Ł': 'l',
+    'đ': 'd', 'Đ': 'd',
+    'ð': 'd', 'Ð': 'd',
+    'þ': 'th', 'Þ': 'th',
+    'æ': 'ae', 'Æ': 'ae',
+    'œ': 'oe', 'Œ': 'oe',
+    'ı': 'i',
+})
+
+
+def fold_name(name: str) -> str:
+    """Case- and diacritic-insensitive form of a name, used for indexed lookups ("Curaçao" -> "curacao")"""
+    decomposed = unicodedata.normalize('NFKD', name.translate(_EXTRA_FOLDS))
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
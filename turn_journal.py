@@ -0,0 +1,399 @@
+"""Local write-ahead journal of game session changes, so a turn survives a crash or a database outage.
+
+Every GameSession write is appended to a JSONL file before it reaches MySQL, together with a full
+session state record when a game starts and after every flight. Appends are fsynced in groups: the
+first unsynced record schedules one fsync sync_interval seconds later and everything appended
+meanwhile shares it, so a crash loses at most that window.
+
+A drainer thread with its own connection applies the journaled writes to MySQL in order whenever the
+database is reachable and appends an ack record with the last applied seq. The session statements
+set absolute values, so applying one twice after a crash between the write and its ack is harmless.
+Only a write that can never succeed (PERMANENT_ERRORS) is skipped; any other failure, such as a
+deadlock or a server that is read-only during a failover, stops the drain there and is retried with
+backoff, so nothing after it is acked. Skipped writes, and waits in wait_drained that run out, are
+kept as WriteErrors per player until take_errors collects them, like DbWriter's.
+
+On open the file is replayed: writes after the last ack are queued for the drainer again, and the
+latest state of each player's active session is rebuilt for BossFlightGameDriver.resume_from_journal.
+
+A journal file belongs to one process at a time, held by an exclusive lock on path + '.lock'. A second
+game started alongside gets the first free of path.1, path.2, ..., so the two never write into each
+other's file, and a later game that takes that slot replays whatever the crashed one left behind.
+"""
+import json
+import os
+import threading
+from collections import deque
+from datetime import date, datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from db_writer import WriteError
+from models import DatabaseConnection, mysql_connector
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Journaled statements that change a field of the saved session state, and how to read the new value
+STATE_FIELDS = {
+    'session.set_current_airport': ('current_airport_id', lambda params: params[0]),
+    'session.set_battery': ('battery_level', lambda params: params[0]),
+    'session.set_puzzles_solved': ('puzzles_solved', lambda params: params[0]),
+    'session.set_countries_guessed': ('countries_guessed', lambda params: json.loads(params[0])),
+    'session.set_status': ('status', lambda params: params[0]),
+    'session.complete': ('status', lambda params: params[0]),
+}
+
+# Rewrite the file once everything is drained and it has grown past this
+COMPACT_BYTES = 1024 * 1024
+
+# MySQL errors a retry cannot fix: bad SQL, unknown table or column, constraint and value errors
+PERMANENT_ERRORS = {1048, 1054, 1062, 1064, 1146, 1264, 1366, 1406, 1451, 1452}
+
+
+def _try_lock(path: str):
+    """An open lock file for path held exclusively by this process, or None if another process holds it"""
+    lock_file = open(path + '.lock', 'a+b')
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot journal {type(value).__name__}")
+
+
+class TurnJournal:
+    _open: Dict[str, 'TurnJournal'] = {}
+    _open_lock = threading.Lock()
+
+    def __init__(self, path: str, sync_interval: float, drain_interval: float, lock_file=None, key: str = None):
+        self.path = path
+        self._lock_file = lock_file
+        self._key = key or path
+        self.sync_interval = sync_interval
+        self.seq = 0
+        self.acked = 0
+        self.synced = 0
+        self.fsyncs = 0
+        self._users = 0
+        self._lock = threading.RLock()
+        self._sync_timer: threading.Timer | None = None
+        self._pending: Deque[dict] = deque()
+        self._states: Dict[int, dict] = {}
+        self._write_listeners: List[Callable[[], None]] = []
+        self._errors: Dict[int, Deque[WriteError]] = {}
+        # Signalled on every ack, for wait_drained
+        self._drained = threading.Condition(self._lock)
+        self._replay()
+        self._file = open(path, 'ab')
+        self.drainer = JournalDrainer(self, drain_interval)
+
+    @classmethod
+    def open(cls, path: str, sync_interval: float = 0.05, drain_interval: float = 1.0) -> 'TurnJournal':
+        """The process-wide journal for path; every open needs a matching close"""
+        key = os.path.abspath(path)
+        with cls._open_lock:
+            journal = cls._open.get(key)
+            if journal is None:
+                path, lock_file = cls._claim(key)
+                journal = cls._open[key] = cls(path, sync_interval, drain_interval, lock_file, key)
+                journal.drainer.start()
+            journal._users += 1
+            return journal
+
+    @staticmethod
+    def _claim(path: str):
+        """The first of path, path.1, path.2, ... that no other process has open, and its held lock"""
+        candidate, number = path, 0
+        while True:
+            lock_file = _try_lock(candidate)
+            if lock_file:
+                return candidate, lock_file
+            number += 1
+            candidate = f"{path}.{number}"
+
+    def close(self):
+        with self._open_lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+            self._open.pop(self._key, None)
+        self.drainer.stop()
+        with self._lock:
+            if self._sync_timer:
+                self._sync_timer.cancel()
+            self.sync()
+            self._file.close()
+        if self._lock_file:
+            # Closing the file releases the lock
+            self._lock_file.close()
+
+    def _replay(self):
+        """Rebuild pending writes and session states; a torn last line from a crash is cut off"""
+        if not os.path.exists(self.path):
+            return
+        good_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    break
+                good_bytes += len(line)
+                self._apply(record)
+        if good_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_bytes)
+        self.synced = self.seq
+
+    def _apply(self, record: dict):
+        self.seq = max(self.seq, record['seq'])
+        kind = record['kind']
+        if kind == 'ack':
+            self.acked = max(self.acked, record['acked'])
+            while self._pending and self._pending[0]['seq'] <= self.acked:
+                self._pending.popleft()
+            return
+        state = self._states.get(record['player_id'])
+        if kind == 'state':
+            state = self._states[record['player_id']] = dict(record['state'])
+        elif kind == 'write':
+            self._pending.append(record)
+            field = STATE_FIELDS.get(record['statement'])
+            if field and state and state.get('session_id') == record['session_id']:
+                state[field[0]] = field[1](record['params'])
+        if state and state.get('status') != 'active':
+            self._states.pop(record['player_id'], None)
+
+    def _append(self, record: dict) -> int:
+        with self._lock:
+            self.seq += 1
+            record = {'seq': self.seq, **record}
+            self._file.write(json.dumps(record, separators=(',', ':'), default=_json_default).encode('utf-8') + b'\n')
+            if record['kind'] == 'write':
+                # Keep what the drainer will send, not the values before their JSON round trip
+                record['params'] = json.loads(json.dumps(record['params'], default=_json_default))
+            self._apply(record)
+            if self._sync_timer is None:
+                self._sync_timer = threading.Timer(self.sync_interval, self._timed_sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+            return record['seq']
+
+    def _timed_sync(self):
+        with self._lock:
+            self._sync_timer = None
+            self.sync()
+
+    def sync(self):
+        """Flush and fsync everything appended so far"""
+        with self._lock:
+            if self.synced == self.seq or self._file.closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.synced = self.seq
+            self.fsyncs += 1
+
+    def add_write_listener(self, listener: Callable[[], None]):
+        """listener() runs when a write is journaled and when the drainer has applied writes"""
+        with self._lock:
+            self._write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: Callable[[], None]):
+        with self._lock:
+            if listener in self._write_listeners:
+                self._write_listeners.remove(listener)
+
+    def notify_write(self):
+        with self._lock:
+            listeners = list(self._write_listeners)
+        for listener in listeners:
+            listener()
+
+    def append_write(self, player_id: int, session_id: int, statement: str, params: tuple) -> int:
+        seq = self._append({'kind': 'write', 'player_id': player_id, 'session_id': session_id,
+                            'statement': statement, 'params': list(params)})
+        self.notify_write()
+        return seq
+
+    def append_state(self, player_id: int, state: Dict) -> int:
+        return self._append({'kind': 'state', 'player_id': player_id, 'session_id': state.get('session_id'),
+                             'state': state})
+
+    def ack(self, seq: int):
+        with self._lock:
+            if seq > self.acked:
+                self._append({'kind': 'ack', 'acked': seq})
+                self._drained.notify_all()
+
+    def wait_drained(self, timeout: float, player_id: int | None = None) -> bool:
+        """Wake the drainer and wait until every write journaled so far is in the database;
+        False if time ran out, which is also recorded as an error for player_id"""
+        with self._lock:
+            if not self._pending:
+                return True
+            target = self._pending[-1]['seq']
+        self.drainer.wake()
+        with self._lock:
+            if self._drained.wait_for(lambda: self.acked >= target, timeout):
+                return True
+        reason = f": {self.drainer.last_error}" if self.drainer.last_error else ""
+        self.record_error(player_id, WriteError('journal', f"writes still pending after {timeout:g}s{reason}"))
+        return False
+
+    def record_error(self, player_id: int | None, error: WriteError):
+        with self._lock:
+            self._errors.setdefault(player_id, deque(maxlen=100)).append(error)
+
+    def take_errors(self, player_id: int | None) -> List[WriteError]:
+        with self._lock:
+            return list(self._errors.pop(player_id, ()))
+
+    def pending(self) -> List[dict]:
+        """Journaled writes not yet acknowledged as applied to the database, oldest first"""
+        with self._lock:
+            return list(self._pending)
+
+    def latest_state(self, player_id: int) -> Optional[Dict]:
+        """Save data of the player's active session as of the last journaled change"""
+        with self._lock:
+            state = self._states.get(player_id)
+            return dict(state) if state else None
+
+    def compact(self) -> bool:
+        """Rewrite the file with only the active session states, once every write has been drained"""
+        with self._lock:
+            if self._pending or self._file.tell() < COMPACT_BYTES:
+                return False
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                for player_id, state in self._states.items():
+                    self.seq += 1
+                    record = {'seq': self.seq, 'kind': 'state', 'player_id': player_id,
+                              'session_id': state.get('session_id'), 'state': state}
+                    f.write(json.dumps(record, separators=(',', ':'), default=_json_default).encode('utf-8') + b'\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, 'ab')
+            self.synced = self.seq
+            return True
+
+
+class JournalDrainer:
+    """Applies journaled writes to MySQL on its own thread and connection, retrying while it is down"""
+
+    def __init__(self, journal: TurnJournal, interval: float = 1.0, max_backoff: float = 30.0):
+        self.journal = journal
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.db: DatabaseConnection | None = None
+        self.applied = 0
+        self.skipped = 0
+        self.last_error = ""
+        self._backoff = interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="turn-journal-drain", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Stop the thread after one last drain attempt"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self.db:
+            self.db.disconnect()
+            self.db = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self._backoff)
+            self._wake.clear()
+            drained = self.drain()
+            if self._stop.is_set():
+                return
+            self._backoff = self.interval if drained else min(self._backoff * 2, self.max_backoff)
+
+    def _connect(self) -> bool:
+        if self.db and self.db.is_healthy():
+            return True
+        if self.db:
+            self.db.disconnect()
+        self.db = DatabaseConnection()
+        if self.db.connect():
+            return True
+        self.db = None
+        return False
+
+    def _apply(self, record: dict) -> bool:
+        """Apply one write; True once it is applied or can never be, False to retry it later"""
+        try:
+            self.db.statements.update(record['statement'], tuple(record['params']))
+            self.db.connection.commit()
+            self.applied += 1
+            return True
+        except mysql_connector.Error as e:
+            try:
+                self.db.connection.rollback()
+            except mysql_connector.Error:
+                pass
+            if e.errno not in PERMANENT_ERRORS:
+                print(f"Journal drain will retry seq {record['seq']} ({record['statement']}): {e}")
+                self.last_error = str(e)
+                return False
+            message = str(e)
+        except (KeyError, TypeError, ValueError) as e:
+            # An unknown statement or params that do not fit it; retrying cannot help
+            message = f"{type(e).__name__}: {e}"
+        print(f"Journal drain skipped seq {record['seq']} ({record['statement']}): {message}")
+        self.skipped += 1
+        self.journal.record_error(record.get('player_id'), WriteError(record['statement'], message))
+        return True
+
+    def drain(self) -> bool:
+        """Apply pending writes in order; False if one has to be retried, e.g. the database is unreachable"""
+        pending = self.journal.pending()
+        if not pending:
+            self.journal.compact()
+            return True
+        if not self._connect():
+            self.last_error = "database unreachable"
+            return False
+        self.last_error = ""
+        last_applied = 0
+        healthy = True
+        for record in pending:
+            if not self._apply(record):
+                healthy = False
+                break
+            last_applied = record['seq']
+        if last_applied:
+            self.journal.ack(last_applied)
+            self.journal.notify_write()
+        return healthy